@@ -0,0 +1,4 @@
+-- Counters behind booking references (app/services/booking_reference.py).
+-- Each nextval reserves a block of 1000 counters for one API process.
+
+CREATE SEQUENCE IF NOT EXISTS booking_reference_seq START WITH 1 INCREMENT BY 1000;
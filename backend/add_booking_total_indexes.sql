@@ -0,0 +1,10 @@
+-- Indexes backing set-based booking totals (BookingService.calculate_and_update_total
+-- and POST /bookings/recalculate-totals). passengers(booking_id) is already
+-- covered by the uq_booking_flight_seat constraint.
+
+CREATE INDEX IF NOT EXISTS idx_booking_services_booking
+ON booking_services(booking_id);
+
+-- Bookings with passengers on a given flight
+CREATE INDEX IF NOT EXISTS idx_passengers_flight_seat
+ON passengers(flight_seat_id);
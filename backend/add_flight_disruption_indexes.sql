@@ -0,0 +1,9 @@
+-- Indexes backing flight cancellation jobs (app/services/flight_disruption.py)
+
+-- Successful payments of a batch of cancelled bookings
+CREATE INDEX IF NOT EXISTS idx_payments_booking
+ON payments(booking_id);
+
+-- Payments that already have a refund
+CREATE INDEX IF NOT EXISTS idx_refunds_payment
+ON refunds(payment_id);
@@ -0,0 +1,10 @@
+-- Indexes backing GET /flights/search
+
+-- Route equality + departure range: one index range scan per search
+CREATE INDEX IF NOT EXISTS idx_flights_route_departure
+ON flights(origin_airport_id, destination_airport_id, departure_time);
+
+-- Counting a flight's available seats (the unique (flight_id, seat_id)
+-- constraint covers flight_id lookups but not the status filter)
+CREATE INDEX IF NOT EXISTS idx_flight_seats_flight_status
+ON flight_seats(flight_id, status);
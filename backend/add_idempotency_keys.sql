@@ -0,0 +1,12 @@
+-- Idempotency keys for POST /checkout: a retried request with the same key
+-- returns the booking created by the first one instead of booking twice
+
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+    idempotency_key_id SERIAL PRIMARY KEY,
+    user_id VARCHAR(255) NOT NULL,
+    key VARCHAR(255) NOT NULL,
+    request_hash VARCHAR(64) NOT NULL,
+    booking_id INT REFERENCES bookings(booking_id) ON DELETE CASCADE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT uq_idempotency_user_key UNIQUE (user_id, key)
+);
@@ -0,0 +1,23 @@
+-- Indexes backing keyset (cursor) pagination of list endpoints.
+-- Each matches the ORDER BY of its listing, so a page is one index range scan.
+
+-- GET /flights/all: ORDER BY departure_time, flight_id
+CREATE INDEX IF NOT EXISTS idx_flights_departure_time_id
+ON flights(departure_time, flight_id);
+
+-- GET /revenue/metrics: ORDER BY date DESC, metric_id DESC (scanned backwards)
+CREATE INDEX IF NOT EXISTS idx_revenue_metrics_date_id
+ON revenue_metrics(date, metric_id);
+
+-- GET /admin/role-requests: ORDER BY created_at DESC, id DESC
+-- Keyset columns must be NOT NULL (a NULL row would never be paged to), and
+-- created_at used to be set only by the application.
+UPDATE role_requests SET created_at = NOW() WHERE created_at IS NULL;
+ALTER TABLE role_requests ALTER COLUMN created_at SET DEFAULT NOW();
+ALTER TABLE role_requests ALTER COLUMN created_at SET NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_role_requests_created_at_id
+ON role_requests(created_at, id);
+
+-- Listings ordered by primary key alone (bookings, explores, places,
+-- flight_seats, car_rentals, services) use the primary key index.
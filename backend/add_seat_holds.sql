@@ -0,0 +1,8 @@
+-- Timed seat holds: a 'reserved' flight seat is held until hold_expires_at
+
+ALTER TABLE flight_seats ADD COLUMN IF NOT EXISTS hold_expires_at TIMESTAMP;
+ALTER TABLE flight_seats ADD COLUMN IF NOT EXISTS held_by VARCHAR(255);
+
+-- The expiry sweeper only scans reserved seats
+CREATE INDEX IF NOT EXISTS idx_flight_seats_hold_expiry
+ON flight_seats(hold_expires_at) WHERE status = 'reserved';
@@ -0,0 +1,7 @@
+-- Version counters for optimistic concurrency (SQLAlchemy version_id_col,
+-- see app/core/concurrency.py). Every UPDATE checks and increments them.
+
+ALTER TABLE bookings ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1;
+ALTER TABLE flight_seats ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1;
+ALTER TABLE payments ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1;
+ALTER TABLE refunds ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1;
@@ -0,0 +1,50 @@
+"""
+In-process map of IATA code -> airport_id.
+
+Airports change a few times a year but every flight search resolves two codes,
+so the whole (small) table is cached. The map is reloaded after
+AIRPORT_CACHE_TTL seconds, when AirportService writes an airport, or when an
+unknown code is looked up (at most once per AIRPORT_CACHE_MIN_REFRESH_INTERVAL
+so that typos can't hammer the database).
+"""
+
+import threading
+import time
+from typing import Dict, Optional
+
+from app.core.config import AIRPORT_CACHE_TTL, AIRPORT_CACHE_MIN_REFRESH_INTERVAL
+
+
+class AirportCodeCache:
+    def __init__(self, ttl: int, min_refresh_interval: int):
+        self.ttl = ttl
+        self.min_refresh_interval = min_refresh_interval
+        self._codes: Dict[str, int] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def needs_refresh(self, *iata_codes: str) -> bool:
+        """True when the map is expired, or misses one of `iata_codes` and may be reloaded"""
+        if self._loaded_at is None:
+            return True
+        age = time.monotonic() - self._loaded_at
+        if age >= self.ttl:
+            return True
+        missing = any(code.upper() not in self._codes for code in iata_codes)
+        return missing and age >= self.min_refresh_interval
+
+    def replace(self, codes: Dict[str, int]) -> None:
+        with self._lock:
+            self._codes = {code.upper(): airport_id for code, airport_id in codes.items()}
+            self._loaded_at = time.monotonic()
+
+    def get(self, iata_code: str) -> Optional[int]:
+        return self._codes.get(iata_code.upper())
+
+    def invalidate(self) -> None:
+        """Force a reload on the next lookup"""
+        with self._lock:
+            self._loaded_at = None
+
+
+airport_codes = AirportCodeCache(AIRPORT_CACHE_TTL, AIRPORT_CACHE_MIN_REFRESH_INTERVAL)
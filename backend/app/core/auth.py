@@ -2,7 +2,8 @@ from app.core.config import API_AUDIENCE, AUTH0_DOMAIN, ALGORITHMS
 from fastapi_auth0 import Auth0
 from fastapi import HTTPException, status
 from jose import jwt, JWTError
-import requests
+from app.core.jwks import jwks_store
+from app.core.token_cache import token_cache
 
 # Create Auth0 instance that can handle ID tokens  
 auth0 = Auth0(
@@ -17,11 +18,11 @@ def verify_jwt_token(token: str) -> dict:
     Returns the decoded payload (claims) if valid.
     Raises HTTPException if invalid.
     """
+    cached_payload = token_cache.get(token)
+    if cached_payload is not None:
+        return cached_payload
+
     try:
-        # Get the signing key from Auth0
-        jwks_url = f"https://{AUTH0_DOMAIN}/.well-known/jwks.json"
-        jwks = requests.get(jwks_url, timeout=10).json()
-        
         # Decode the token header to get the key ID
         unverified_header = jwt.get_unverified_header(token)
         
@@ -33,20 +34,10 @@ def verify_jwt_token(token: str) -> dict:
                 headers={"WWW-Authenticate": "Bearer"},
             )
         
-        # Find the right key
-        rsa_key = {}
-        for key in jwks.get("keys", []):
-            if key.get("kid") == unverified_header["kid"]:
-                rsa_key = {
-                    "kty": key["kty"],
-                    "kid": key["kid"],
-                    "use": key["use"],
-                    "n": key["n"],
-                    "e": key["e"]
-                }
-                break
+        # Find the right key in the cached JWKS
+        rsa_key = jwks_store.get_key(unverified_header["kid"])
         
-        if not rsa_key:
+        if rsa_key is None:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail=f"Unable to find key with kid '{unverified_header['kid']}' in JWKS",
@@ -61,6 +52,7 @@ def verify_jwt_token(token: str) -> dict:
             audience=API_AUDIENCE,
             issuer=f"https://{AUTH0_DOMAIN}/"
         )
+        token_cache.put(token, payload)
         
         return payload
         
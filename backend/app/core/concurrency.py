@@ -0,0 +1,66 @@
+"""
+Optimistic concurrency for bookings, flight seats, payments and refunds.
+
+Those mappers declare a `version_id_col`: every ORM UPDATE runs as
+`... WHERE id = :id AND version = :version_read` and bumps the version, so a
+write based on a stale read matches no row and the flush raises StaleDataError
+instead of silently overwriting the other writer. The set-based UPDATEs in the
+repositories bump the column themselves. No row locks are taken.
+
+Two ways to use it:
+
+- clients send the ETag of the copy they edited (the version) as If-Match;
+  `check_version` answers 412 when the row has moved on since;
+- read-modify-write service methods are decorated with `retry_on_conflict`,
+  which re-runs them from a fresh read when they lost a race.
+"""
+
+import functools
+from typing import Callable, Optional, TypeVar
+
+from sqlalchemy.orm.exc import StaleDataError
+
+from app.core.config import CONCURRENCY_RETRIES
+from app.core.unit_of_work import in_unit_of_work
+
+T = TypeVar("T")
+
+
+class PreconditionFailed(Exception):
+    """If-Match named a version the row no longer has (HTTP 412)"""
+
+
+class VersionConflict(Exception):
+    """The row kept changing under a retried operation (HTTP 409)"""
+
+
+def check_version(entity, expected: Optional[int]) -> None:
+    """Raise PreconditionFailed unless `entity` is still at `expected` (None skips the check)"""
+    if expected is not None and entity.version != expected:
+        raise PreconditionFailed(
+            f"{type(entity).__name__} was modified (now version {entity.version}, If-Match was {expected})"
+        )
+
+
+def retry_on_conflict(method: Callable[..., T]) -> Callable[..., T]:
+    """
+    Decorate a service method (one using `self.db`) so it is re-run, up to
+    CONCURRENCY_RETRIES times, when a concurrent write made its flush stale.
+    The failed attempt is rolled back first, which expires what it had read,
+    so the next one starts from the current rows; with an If-Match version the
+    re-read then fails `check_version` instead of overwriting.
+
+    Inside an enclosing unit of work nothing can be retried on its own, so the
+    conflict is raised for the outermost caller to handle.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if in_unit_of_work(self.db):
+            return method(self, *args, **kwargs)
+        for _ in range(CONCURRENCY_RETRIES):
+            try:
+                return method(self, *args, **kwargs)
+            except StaleDataError:
+                self.db.rollback()
+        raise VersionConflict("The record was changed by another request, please retry")
+    return wrapper
@@ -4,6 +4,8 @@ from dotenv import load_dotenv
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
+# Optional override for the asyncpg engine; derived from DATABASE_URL when unset
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL")
 AUTH0_DOMAIN = os.getenv("AUTH0_DOMAIN")
 API_AUDIENCE = os.getenv("API_AUDIENCE") 
 MGMT_CLIENT_ID = os.getenv("MGMT_CLIENT_ID")
@@ -13,3 +15,72 @@ ROLE_ID_MAP = {
     "agent": os.getenv("AGENT_ROLE_ID"),
 }
 ALGORITHMS = ["RS256"]
+
+# Auth0 JWKS cache (seconds)
+JWKS_CACHE_TTL = int(os.getenv("JWKS_CACHE_TTL", "3600"))
+JWKS_MIN_REFRESH_INTERVAL = int(os.getenv("JWKS_MIN_REFRESH_INTERVAL", "30"))
+JWKS_FETCH_TIMEOUT = int(os.getenv("JWKS_FETCH_TIMEOUT", "10"))
+
+# Verified-token cache
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+TOKEN_CACHE_MAX_AGE = int(os.getenv("TOKEN_CACHE_MAX_AGE", "300"))
+
+# SQLAlchemy connection pool
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+DB_POOL_WARMUP = int(os.getenv("DB_POOL_WARMUP", "2"))
+
+# N+1 detection / per-request SQL budgets (development and CI only)
+SQL_QUERY_TRACKING = os.getenv("SQL_QUERY_TRACKING", "false").lower() == "true"
+SQL_QUERY_BUDGET = int(os.getenv("SQL_QUERY_BUDGET", "0"))  # 0 = only routes with @query_budget
+SQL_QUERY_BUDGET_STRICT = os.getenv("SQL_QUERY_BUDGET_STRICT", "false").lower() == "true"
+SQL_REPEATED_QUERY_THRESHOLD = int(os.getenv("SQL_REPEATED_QUERY_THRESHOLD", "3"))
+
+# Slow-query log
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "200"))  # 0 disables
+SLOW_QUERY_LOG_SIZE = int(os.getenv("SLOW_QUERY_LOG_SIZE", "200"))
+SLOW_QUERY_EXPLAIN = os.getenv("SLOW_QUERY_EXPLAIN", "false").lower() == "true"
+
+# Cursor pagination of list endpoints
+DEFAULT_PAGE_SIZE = int(os.getenv("DEFAULT_PAGE_SIZE", "100"))
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "1000"))
+
+# Streaming exports: rows fetched per server-side cursor round trip
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+# IATA code -> airport_id map used by flight search (seconds)
+AIRPORT_CACHE_TTL = int(os.getenv("AIRPORT_CACHE_TTL", "3600"))
+AIRPORT_CACHE_MIN_REFRESH_INTERVAL = int(os.getenv("AIRPORT_CACHE_MIN_REFRESH_INTERVAL", "30"))
+
+# Connection search over the in-memory flight graph
+FLIGHT_GRAPH_TTL = int(os.getenv("FLIGHT_GRAPH_TTL", "300"))  # seconds between full reloads
+CONNECTION_MIN_MINUTES = int(os.getenv("CONNECTION_MIN_MINUTES", "45"))
+CONNECTION_MAX_MINUTES = int(os.getenv("CONNECTION_MAX_MINUTES", "360"))
+
+# Lowest-fare calendar cache
+CALENDAR_CACHE_TTL = int(os.getenv("CALENDAR_CACHE_TTL", "300"))
+CALENDAR_CACHE_SIZE = int(os.getenv("CALENDAR_CACHE_SIZE", "5000"))
+
+# Compact seat maps
+SEAT_LAYOUT_CACHE_TTL = int(os.getenv("SEAT_LAYOUT_CACHE_TTL", "3600"))
+SEAT_MAP_HISTORY_SIZE = int(os.getenv("SEAT_MAP_HISTORY_SIZE", "8"))  # versions kept per flight for diffs
+
+# Timed seat holds during checkout
+SEAT_HOLD_MINUTES = int(os.getenv("SEAT_HOLD_MINUTES", "15"))
+SEAT_HOLD_MAX_MINUTES = int(os.getenv("SEAT_HOLD_MAX_MINUTES", "60"))
+SEAT_HOLD_SWEEP_INTERVAL = int(os.getenv("SEAT_HOLD_SWEEP_INTERVAL", "60"))  # seconds, 0 disables the sweeper
+SEAT_HOLD_SWEEP_BATCH = int(os.getenv("SEAT_HOLD_SWEEP_BATCH", "500"))
+
+# Secret key of the booking reference permutation; required, and must never change
+# once references exist (the app refuses to start without it, see app/services/booking_reference.py)
+BOOKING_REFERENCE_KEY = os.getenv("BOOKING_REFERENCE_KEY")
+
+# Attempts at a read-modify-write that keeps losing to concurrent updates
+CONCURRENCY_RETRIES = int(os.getenv("CONCURRENCY_RETRIES", "3"))
+
+# Flight cancellation jobs (bookings cancelled, seats released and refunds created per batch)
+FLIGHT_DISRUPTION_BATCH = int(os.getenv("FLIGHT_DISRUPTION_BATCH", "500"))
+FLIGHT_DISRUPTION_JOB_HISTORY = int(os.getenv("FLIGHT_DISRUPTION_JOB_HISTORY", "100"))
@@ -1,10 +1,65 @@
 from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.exc import OperationalError
-from ..core.config import DATABASE_URL
+from sqlalchemy.exc import OperationalError, TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+from ..core.config import (
+    DATABASE_URL, ASYNC_DATABASE_URL, DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE, DB_POOL_PRE_PING, DB_POOL_WARMUP
+)
+import threading
 import time
 
+
+class PoolWaitStats:
+    """Running totals of how long requests waited for a pooled connection"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, wait: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "total_wait_seconds": round(self.total_wait, 6),
+                "avg_wait_seconds": round(self.total_wait / attempts, 6) if attempts else 0.0,
+                "max_wait_seconds": round(self.max_wait, 6),
+            }
+
+
+pool_wait_stats = PoolWaitStats()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records the time spent waiting for a connection"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            pool_wait_stats.record(time.perf_counter() - start, timed_out=True)
+            raise
+        pool_wait_stats.record(time.perf_counter() - start)
+        return connection
+
+
 def get_engine():
     """Get database engine with retry logic"""
     max_retries = 10
@@ -13,7 +68,16 @@ def get_engine():
     for attempt in range(max_retries):
         try:
             # echo=False disables SQL query logging for better performance
-            engine = create_engine(DATABASE_URL, echo=False)
+            engine = create_engine(
+                DATABASE_URL,
+                echo=False,
+                poolclass=InstrumentedQueuePool,
+                pool_size=DB_POOL_SIZE,
+                max_overflow=DB_MAX_OVERFLOW,
+                pool_timeout=DB_POOL_TIMEOUT,
+                pool_recycle=DB_POOL_RECYCLE,
+                pool_pre_ping=DB_POOL_PRE_PING,
+            )
             # Test the connection
             with engine.connect() as conn:
                 conn.execute(text("SELECT 1"))
@@ -26,9 +90,34 @@ def get_engine():
             else:
                 raise e
 
+def get_async_database_url() -> str:
+    """Use ASYNC_DATABASE_URL, or DATABASE_URL with its driver swapped for asyncpg"""
+    if ASYNC_DATABASE_URL:
+        return ASYNC_DATABASE_URL
+    scheme, _, rest = DATABASE_URL.partition("://")
+    if not scheme.startswith("postgresql"):
+        raise ValueError(f"Cannot derive an asyncpg URL from scheme '{scheme}'")
+    return f"postgresql+asyncpg://{rest}"
+
+def get_async_engine():
+    """Get the asyncpg engine; shares the pool settings of the sync engine"""
+    return create_async_engine(
+        get_async_database_url(),
+        echo=False,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+    )
+
 engine = get_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Connections are opened lazily, so creating the async engine never blocks startup
+async_engine = get_async_engine()
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 def get_db():
@@ -38,6 +127,10 @@ def get_db():
     finally:
         db.close()
 
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
 def create_tables():
     """Create all tables defined in the models"""
     try:
@@ -45,4 +138,42 @@ def create_tables():
         print("Tables created successfully")
     except Exception as e:
         print(f"Error creating tables: {e}")
-        raise
\ No newline at end of file
+        raise
+
+def warm_up_pool(connections: int = DB_POOL_WARMUP):
+    """Open `connections` pooled connections up front so the first requests don't pay for them"""
+    connections = min(connections, DB_POOL_SIZE)
+    opened = []
+    try:
+        for _ in range(connections):
+            conn = engine.connect()
+            conn.execute(text("SELECT 1"))
+            opened.append(conn)
+    except OperationalError as e:
+        print(f"Connection pool warm-up stopped after {len(opened)} connection(s): {e}")
+    finally:
+        # Closing returns the connections to the pool as idle
+        for conn in opened:
+            conn.close()
+    print(f"Connection pool warmed up with {len(opened)} connection(s)")
+
+def get_pool_status() -> dict:
+    """Report checked-out, idle and overflow connections plus checkout wait times"""
+    pool = engine.pool
+    return {
+        "pool_size": pool.size(),
+        "max_overflow": DB_MAX_OVERFLOW,
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "timeout_seconds": DB_POOL_TIMEOUT,
+        "recycle_seconds": DB_POOL_RECYCLE,
+        "pre_ping": DB_POOL_PRE_PING,
+        "wait": pool_wait_stats.snapshot(),
+        "async": {
+            "pool_size": async_engine.pool.size(),
+            "checked_out": async_engine.pool.checkedout(),
+            "idle": async_engine.pool.checkedin(),
+            "overflow": max(async_engine.pool.overflow(), 0),
+        },
+    }
@@ -0,0 +1,66 @@
+"""
+Strong entity tags for conditional requests.
+
+Routes compute an ETag from the representation they are about to send, set it
+with `set_etag`, and answer `304 Not Modified` when `if_none_match` matches the
+client's copy, skipping serialization entirely.
+
+Versioned rows (see app/core/concurrency.py) use their version as the ETag;
+writes read it back from If-Match with `if_match_version`.
+"""
+
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response
+
+from app.core.concurrency import PreconditionFailed
+
+
+def compute_etag(*parts: bytes) -> str:
+    """Short content hash of `parts`, unquoted"""
+    digest = hashlib.blake2b(digest_size=8)
+    for part in parts:
+        digest.update(part)
+    return digest.hexdigest()
+
+
+def _tags(header: Optional[str]):
+    if not header:
+        return set()
+    return {tag.strip().removeprefix("W/").strip('"') for tag in header.split(",")}
+
+
+def if_none_match(request: Request, etag: str) -> bool:
+    """True when the client already holds the representation tagged `etag`"""
+    tags = _tags(request.headers.get("if-none-match"))
+    return etag in tags or "*" in tags
+
+
+def if_match_version(request: Request) -> Optional[int]:
+    """The version the client's If-Match requires, None when any version will do"""
+    tags = _tags(request.headers.get("if-match"))
+    if not tags or "*" in tags:
+        return None
+    if len(tags) > 1:
+        raise PreconditionFailed("If-Match must name a single version")
+    tag = tags.pop()
+    if not tag.isdigit():
+        raise PreconditionFailed(f"If-Match {tag!r} is not a version of this resource")
+    return int(tag)
+
+
+def set_version_etag(response: Response, entity) -> None:
+    """Tag a versioned row's representation with its version"""
+    set_etag(response, str(entity.version))
+
+
+def set_etag(response: Response, etag: str, cache_control: str = "no-cache") -> None:
+    response.headers["ETag"] = f'"{etag}"'
+    response.headers["Cache-Control"] = cache_control
+
+
+def not_modified(etag: str, cache_control: str = "no-cache") -> Response:
+    response = Response(status_code=304)
+    set_etag(response, etag, cache_control)
+    return response
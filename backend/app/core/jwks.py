@@ -0,0 +1,136 @@
+"""
+In-process cache for the Auth0 JSON Web Key Set (JWKS).
+
+Keys are parsed once and kept by `kid`. The set is refreshed in the background
+once the TTL expires, refetched on an unknown `kid` (rate limited), and the last
+good keys keep being served when Auth0 cannot be reached.
+"""
+
+import threading
+import time
+from typing import Dict, Optional
+
+import requests
+from jose import jwk
+from jose.backends.base import Key
+
+from app.core.config import (
+    ALGORITHMS,
+    AUTH0_DOMAIN,
+    JWKS_CACHE_TTL,
+    JWKS_FETCH_TIMEOUT,
+    JWKS_MIN_REFRESH_INTERVAL,
+)
+
+
+class JWKSKeyStore:
+    """Thread-safe store of RSA signing keys fetched from a JWKS endpoint."""
+
+    def __init__(self, jwks_url: str, ttl: int, min_refresh_interval: int, timeout: int):
+        self.jwks_url = jwks_url
+        self.ttl = ttl
+        self.min_refresh_interval = min_refresh_interval
+        self.timeout = timeout
+
+        self._keys: Dict[str, Key] = {}
+        self._fetched_at: Optional[float] = None
+        self._last_attempt: Optional[float] = None
+        self._refreshing = False
+        self._lock = threading.Lock()
+
+    def get_key(self, kid: Optional[str]) -> Optional[Key]:
+        """
+        Return the signing key for `kid`, or None if it is unknown.
+
+        Only the very first lookup (or a lookup for an unknown `kid`) blocks on
+        the network; an expired cache is refreshed in a background thread while
+        the current keys keep being served.
+        """
+        if not kid:
+            return None
+
+        if self._fetched_at is None:
+            if self._can_attempt():
+                self.refresh()
+        elif time.monotonic() - self._fetched_at >= self.ttl:
+            self._refresh_in_background()
+
+        key = self._keys.get(kid)
+        if key is None and self._can_attempt():
+            # Auth0 may have rotated its signing key
+            self.refresh()
+            key = self._keys.get(kid)
+        return key
+
+    def refresh(self) -> bool:
+        """Fetch the key set now. Returns False and keeps the old keys on failure."""
+        with self._lock:
+            self._last_attempt = time.monotonic()
+
+        try:
+            response = requests.get(self.jwks_url, timeout=self.timeout)
+            response.raise_for_status()
+            keys = self._parse_keys(response.json())
+        except (requests.RequestException, ValueError, KeyError) as e:
+            print(f"JWKS refresh failed, serving {len(self._keys)} cached key(s): {e}")
+            return False
+
+        with self._lock:
+            self._keys = keys
+            self._fetched_at = time.monotonic()
+        return True
+
+    def clear(self) -> None:
+        """Drop all cached keys (useful for testing)."""
+        with self._lock:
+            self._keys = {}
+            self._fetched_at = None
+            self._last_attempt = None
+
+    def _can_attempt(self) -> bool:
+        """Rate limit fetches triggered by request traffic."""
+        with self._lock:
+            if self._last_attempt is None:
+                return True
+            return time.monotonic() - self._last_attempt >= self.min_refresh_interval
+
+    def _refresh_in_background(self) -> None:
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._background_refresh, daemon=True).start()
+
+    def _background_refresh(self) -> None:
+        try:
+            if not self.refresh():
+                # Retry after the minimum interval instead of on every request
+                with self._lock:
+                    self._fetched_at = time.monotonic() - self.ttl + self.min_refresh_interval
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    @staticmethod
+    def _parse_keys(jwks: dict) -> Dict[str, Key]:
+        keys = {}
+        for key in jwks["keys"]:
+            if key.get("kty") != "RSA" or "kid" not in key:
+                continue
+            rsa_key = {
+                "kty": key["kty"],
+                "kid": key["kid"],
+                "use": key.get("use", "sig"),
+                "n": key["n"],
+                "e": key["e"],
+            }
+            keys[key["kid"]] = jwk.construct(rsa_key, ALGORITHMS[0])
+        return keys
+
+
+jwks_store = JWKSKeyStore(
+    jwks_url=f"https://{AUTH0_DOMAIN}/.well-known/jwks.json",
+    ttl=JWKS_CACHE_TTL,
+    min_refresh_interval=JWKS_MIN_REFRESH_INTERVAL,
+    timeout=JWKS_FETCH_TIMEOUT,
+)
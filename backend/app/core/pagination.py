@@ -0,0 +1,134 @@
+"""
+Keyset (cursor) pagination.
+
+A page is fetched with `WHERE (sort_key, pk) > (:last_sort_key, :last_pk)
+ORDER BY sort_key, pk LIMIT :limit + 1` instead of OFFSET, so every page costs
+one index range scan no matter how deep the client is. The cursor handed to the
+client is the key of the last row, JSON-encoded and base64url'd; it is opaque
+to clients and only meaningful for the listing that produced it.
+
+Repositories describe their ordering with a Keyset and call `paginate` (Query)
+or `paginate_async` (select); routers return `page.items` and expose the next
+cursor with `set_next_cursor`.
+
+`skip` is only kept for listings that used to page with skip/limit: it offsets
+the first page (no cursor) and is ignored once the client follows cursors.
+"""
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, List, Optional
+
+from fastapi import Response
+from sqlalchemy import tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import DEFAULT_PAGE_SIZE
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class InvalidCursor(ValueError):
+    """The cursor was not produced by this API"""
+
+
+@dataclass
+class Page:
+    items: List[Any]
+    next_cursor: Optional[str] = None
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"dec": str(value)}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+        if "dec" in value:
+            return Decimal(value["dec"])
+    return value
+
+
+def encode_cursor(values: tuple) -> str:
+    raw = json.dumps([_encode_value(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> tuple:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = tuple(_decode_value(value) for value in json.loads(raw))
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError, KeyError):
+        raise InvalidCursor("Invalid pagination cursor")
+    if len(values) != size:
+        raise InvalidCursor("Invalid pagination cursor")
+    return values
+
+
+class Keyset:
+    """
+    Ordering of a paginated listing: one or more sort columns ending with the
+    primary key as tie-breaker, all ascending or all descending. Sort columns
+    must be NOT NULL, and an index on them keeps each page a range scan.
+    """
+
+    def __init__(self, *columns, descending: bool = False):
+        self.columns = columns
+        self.descending = descending
+
+    def apply(self, statement, cursor: Optional[str], limit: int, skip: int = 0):
+        """Add the seek condition (or the legacy OFFSET), ORDER BY and LIMIT (one extra row to detect a next page)"""
+        if cursor:
+            after = decode_cursor(cursor, len(self.columns))
+            if len(self.columns) == 1:
+                key, bound = self.columns[0], after[0]
+            else:
+                key, bound = tuple_(*self.columns), tuple_(*after)
+            statement = statement.filter(key < bound if self.descending else key > bound)
+        elif skip:
+            statement = statement.offset(skip)
+
+        order = [column.desc() if self.descending else column.asc() for column in self.columns]
+        return statement.order_by(*order).limit(limit + 1)
+
+    def page(self, rows, limit: int) -> Page:
+        rows = list(rows)
+        if len(rows) <= limit:
+            return Page(items=rows)
+        rows = rows[:limit]
+        last = rows[-1]
+        return Page(items=rows, next_cursor=encode_cursor(tuple(getattr(last, column.key) for column in self.columns)))
+
+
+def paginate(query, keyset: Keyset, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE,
+             skip: int = 0) -> Page:
+    """Fetch one page of a legacy Query"""
+    return keyset.page(keyset.apply(query, cursor, limit, skip).all(), limit)
+
+
+async def paginate_async(db: AsyncSession, statement, keyset: Keyset, cursor: Optional[str] = None,
+                         limit: int = DEFAULT_PAGE_SIZE, skip: int = 0) -> Page:
+    """Fetch one page of a select() on an AsyncSession"""
+    result = await db.execute(keyset.apply(statement, cursor, limit, skip))
+    return keyset.page(result.scalars().all(), limit)
+
+
+def set_next_cursor(response: Response, page: Page) -> List[Any]:
+    """Expose the next cursor as a header (absent on the last page) and return the items"""
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return page.items
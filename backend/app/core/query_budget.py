@@ -0,0 +1,149 @@
+"""
+N+1 detection and per-request SQL budgets for development and CI.
+
+Off by default. With SQL_QUERY_TRACKING=true every HTTP request is tracked: the
+statements it runs are grouped by shape (SQL text with bind values, IN-list
+lengths and whitespace normalised), shapes executed SQL_REPEATED_QUERY_THRESHOLD
+or more times are reported as likely N+1 loops, and the total is checked against
+the route's budget (`@query_budget(n)` on the endpoint, else SQL_QUERY_BUDGET).
+With SQL_QUERY_BUDGET_STRICT=true violations raise QueryBudgetExceeded, which
+TestClient re-raises so the test fails.
+
+Tests and scripts can track any block directly, without the env var:
+
+    with track_queries("confirm booking", budget=12):
+        BookingService(db).confirm_booking(booking_id)
+"""
+
+import re
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import (
+    SQL_QUERY_TRACKING, SQL_QUERY_BUDGET, SQL_QUERY_BUDGET_STRICT, SQL_REPEATED_QUERY_THRESHOLD
+)
+
+QUERY_BUDGET_ATTR = "__query_budget__"
+
+_WHITESPACE = re.compile(r"\s+")
+_BIND_PARAM = re.compile(r"%\(\w+\)s|\$\d+")
+_PARAM_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A tracked block ran more statements than its budget, or repeated one"""
+
+
+def statement_shape(statement: str) -> str:
+    """Normalise a statement so executions differing only in values compare equal"""
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    shape = _BIND_PARAM.sub("?", shape)
+    return _PARAM_LIST.sub("(?, ...)", shape)
+
+
+@dataclass
+class QueryTracker:
+    label: str
+    budget: Optional[int] = None
+    repeat_threshold: int = SQL_REPEATED_QUERY_THRESHOLD
+    shapes: Counter = field(default_factory=Counter)
+
+    @property
+    def count(self) -> int:
+        return sum(self.shapes.values())
+
+    def record(self, statement: str) -> None:
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated(self) -> List[Tuple[str, int]]:
+        """Shapes executed at least `repeat_threshold` times, most frequent first"""
+        if self.repeat_threshold <= 0:
+            return []
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= self.repeat_threshold]
+
+    def problems(self) -> List[str]:
+        problems = []
+        if self.budget is not None and self.count > self.budget:
+            problems.append(f"{self.count} statements, budget is {self.budget}")
+        for shape, n in self.repeated():
+            problems.append(f"possible N+1, ran {n}x: {shape[:200]}")
+        return problems
+
+    def check(self, strict: bool = True) -> None:
+        """Raise (strict) or print a report when the block misbehaved"""
+        problems = self.problems()
+        if not problems:
+            return
+        message = f"SQL budget check failed for {self.label}:\n  " + "\n  ".join(problems)
+        if strict:
+            raise QueryBudgetExceeded(message)
+        print(message)
+
+
+# Active trackers, innermost last; every statement counts toward all of them
+_trackers: ContextVar[Tuple[QueryTracker, ...]] = ContextVar("query_trackers", default=())
+
+
+@contextmanager
+def track_queries(label: str, budget: Optional[int] = None, strict: bool = True,
+                  repeat_threshold: int = SQL_REPEATED_QUERY_THRESHOLD) -> Iterator[QueryTracker]:
+    """Track the statements run inside the block and check them on exit"""
+    tracker = QueryTracker(label=label, budget=budget, repeat_threshold=repeat_threshold)
+    token = _trackers.set(_trackers.get() + (tracker,))
+    try:
+        yield tracker
+    finally:
+        _trackers.reset(token)
+    tracker.check(strict=strict)
+
+
+def query_budget(max_queries: int):
+    """Declare the SQL budget of a route endpoint (checked when tracking is on)"""
+    def decorator(func):
+        setattr(func, QUERY_BUDGET_ATTR, max_queries)
+        return func
+    return decorator
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    for tracker in _trackers.get():
+        tracker.record(statement)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Feed executed statements to active trackers (use AsyncEngine.sync_engine for async)"""
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class QueryBudgetMiddleware:
+    """Pure ASGI middleware tracking every request when SQL_QUERY_TRACKING is on"""
+
+    def __init__(self, app, strict: bool = SQL_QUERY_BUDGET_STRICT):
+        self.app = app
+        self.strict = strict
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not SQL_QUERY_TRACKING:
+            await self.app(scope, receive, send)
+            return
+
+        tracker = QueryTracker(label=f"{scope['method']} {scope['path']}")
+        token = _trackers.set(_trackers.get() + (tracker,))
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _trackers.reset(token)
+
+        # The endpoint is only known once routing has run
+        route = scope.get("route")
+        endpoint = getattr(route, "endpoint", None)
+        tracker.budget = getattr(endpoint, QUERY_BUDGET_ATTR, SQL_QUERY_BUDGET or None)
+        if route is not None:
+            tracker.label = f"{scope['method']} {route.path}"
+        tracker.check(strict=self.strict)
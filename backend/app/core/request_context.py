@@ -0,0 +1,29 @@
+"""
+Per-request context shared by the instrumentation hooks.
+
+The HTTP middleware stores a RequestContext in a ContextVar; SQLAlchemy cursor
+events (which run in the same context, also for sync routes executed on the
+thread pool) add their statement counts and timings to it.
+"""
+
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Optional
+
+
+@dataclass
+class RequestContext:
+    method: str
+    path: str
+    scope: dict = field(repr=False, default_factory=dict)
+    query_count: int = 0
+    db_time: float = 0.0
+
+    @property
+    def route(self) -> str:
+        """Route template (e.g. /bookings/{booking_id}) once routing has matched"""
+        route = self.scope.get("route")
+        return getattr(route, "path", None) or "unmatched"
+
+
+current_request: ContextVar[Optional[RequestContext]] = ContextVar("current_request", default=None)
@@ -0,0 +1,148 @@
+"""
+Slow-query log.
+
+Statements slower than SLOW_QUERY_THRESHOLD_MS are kept in a fixed-size ring
+buffer with their bind parameter shapes (names and types, never values), the
+route that issued them and the duration. With SLOW_QUERY_EXPLAIN=true the plan
+of slow SELECTs is captured with `EXPLAIN (ANALYZE off)` on the same connection,
+which plans the query without running it again. GET /monitoring/slow-queries
+exposes the buffer to admins.
+"""
+
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import SLOW_QUERY_THRESHOLD_MS, SLOW_QUERY_LOG_SIZE, SLOW_QUERY_EXPLAIN
+from app.core.request_context import current_request
+
+_START_ATTR = "slow_query_start_time"
+_EXPLAINABLE = ("select", "with")
+
+
+@dataclass
+class SlowQuery:
+    statement: str
+    parameters: object
+    route: str
+    duration_ms: float
+    executemany: bool
+    recorded_at: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    plan: Optional[List[str]] = None
+
+
+def parameter_shape(parameters):
+    """Replace bind values with their type names so no data ends up in the log"""
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            # executemany: the shape of the first row plus the row count
+            return {"rows": len(parameters), "row": parameter_shape(parameters[0])}
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__ if parameters is not None else None
+
+
+class SlowQueryLog:
+    """Thread-safe ring buffer of the most recent slow statements"""
+
+    def __init__(self, threshold_ms: float, size: int, explain: bool):
+        self.threshold_ms = threshold_ms
+        self.explain = explain
+        self.total = 0
+        self._entries: "deque[SlowQuery]" = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold_ms > 0 and self._entries.maxlen > 0
+
+    def record(self, entry: SlowQuery) -> None:
+        with self._lock:
+            self._entries.append(entry)
+            self.total += 1
+
+    def entries(self) -> List[dict]:
+        """Newest first"""
+        with self._lock:
+            entries = list(self._entries)
+        return [asdict(entry) for entry in reversed(entries)]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.total = 0
+
+    def stats(self) -> dict:
+        return {
+            "threshold_ms": self.threshold_ms,
+            "size": self._entries.maxlen,
+            "explain": self.explain,
+            "recorded_total": self.total,
+        }
+
+    # ============ ENGINE HOOKS ============
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        # On the statement's execution context, so a failed statement leaves nothing on the pooled connection
+        if context is not None:
+            setattr(context, _START_ATTR, time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        start = getattr(context, _START_ATTR, None)
+        if start is None:
+            return
+        duration_ms = (time.perf_counter() - start) * 1000
+        if duration_ms < self.threshold_ms:
+            return
+
+        request = current_request.get()
+        entry = SlowQuery(
+            statement=statement,
+            parameters=parameter_shape(parameters),
+            route=f"{request.method} {request.route}" if request else "background",
+            duration_ms=round(duration_ms, 3),
+            executemany=executemany,
+        )
+        if self.explain and not executemany and statement.lstrip().lower().startswith(_EXPLAINABLE):
+            entry.plan = self._explain(conn, statement, parameters)
+        self.record(entry)
+
+    @staticmethod
+    def _explain(conn, statement, parameters) -> Optional[List[str]]:
+        # A fresh DBAPI cursor, so the result of the original statement is untouched,
+        # inside a savepoint, so a failing EXPLAIN can't abort the caller's transaction
+        try:
+            explain_cursor = conn.connection.cursor()
+        except Exception as e:
+            return [f"EXPLAIN failed: {e}"]
+        try:
+            explain_cursor.execute("SAVEPOINT slow_query_explain")
+            try:
+                explain_cursor.execute(f"EXPLAIN (ANALYZE off) {statement}", parameters)
+                plan = [row[0] for row in explain_cursor.fetchall()]
+            except Exception as e:
+                explain_cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+                return [f"EXPLAIN failed: {e}"]
+            explain_cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+            return plan
+        except Exception as e:
+            return [f"EXPLAIN failed: {e}"]
+        finally:
+            explain_cursor.close()
+
+    def instrument_engine(self, engine: Engine) -> None:
+        """Time statements on a sync Engine (use AsyncEngine.sync_engine for async)"""
+        if not self.enabled:
+            return
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+
+
+slow_query_log = SlowQueryLog(SLOW_QUERY_THRESHOLD_MS, SLOW_QUERY_LOG_SIZE, SLOW_QUERY_EXPLAIN)
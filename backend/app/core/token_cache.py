@@ -0,0 +1,97 @@
+"""
+Bounded LRU cache of verified JWT payloads.
+
+A browser session sends the same bearer token on every request, so the decoded
+claims are kept (keyed by a SHA-256 of the token) until the token's `exp`, or at
+most TOKEN_CACHE_MAX_AGE seconds so that revoked tokens stop working quickly.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from app.core.config import TOKEN_CACHE_MAX_AGE, TOKEN_CACHE_SIZE
+
+
+class VerifiedTokenCache:
+    """Thread-safe LRU of token hash -> (expires_at, payload)."""
+
+    def __init__(self, max_size: int, max_age: int):
+        self.max_size = max_size
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, tuple[float, dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.max_age > 0
+
+    @staticmethod
+    def _hash(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token: str) -> Optional[dict]:
+        """Return the cached payload for `token`, or None on a miss."""
+        if not self.enabled:
+            return None
+
+        key = self._hash(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, payload = entry
+            if time.time() >= expires_at:
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return payload
+
+    def put(self, token: str, payload: dict) -> None:
+        """Cache a payload that has just passed signature verification."""
+        if not self.enabled:
+            return
+
+        expires_at = time.time() + self.max_age
+        if "exp" in payload:
+            expires_at = min(expires_at, float(payload["exp"]))
+
+        key = self._hash(token)
+        with self._lock:
+            self._entries[key] = (expires_at, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached tokens (useful for testing)."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """Hit/miss counters for monitoring."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "max_age": self.max_age,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+token_cache = VerifiedTokenCache(max_size=TOKEN_CACHE_SIZE, max_age=TOKEN_CACHE_MAX_AGE)
@@ -0,0 +1,64 @@
+"""
+Unit of work support for repositories and services.
+
+Repositories persist through `commit_changes`. Outside a unit of work it commits
+(and refreshes the given instances) exactly like before. Inside `unit_of_work`
+it only flushes: generated keys and server defaults come back through INSERT ...
+RETURNING (SQLAlchemy's eager defaults), and a single COMMIT is issued when the
+outermost block exits, so a multi-step service operation is atomic and costs one
+WAL flush instead of one per repository call.
+"""
+
+from contextlib import contextmanager
+from typing import Iterator
+
+from sqlalchemy.orm import Session
+
+UNIT_OF_WORK_KEY = "unit_of_work"
+
+
+def in_unit_of_work(db: Session) -> bool:
+    """True while `db` is inside a `unit_of_work` block"""
+    return bool(db.info.get(UNIT_OF_WORK_KEY))
+
+
+def commit_changes(db: Session, *instances) -> None:
+    """Flush inside a unit of work, otherwise commit and refresh `instances`"""
+    if in_unit_of_work(db):
+        db.flush()
+        return
+
+    db.commit()
+    for instance in instances:
+        db.refresh(instance)
+
+
+@contextmanager
+def unit_of_work(db: Session) -> Iterator[Session]:
+    """
+    Run the block as one transaction.
+
+    Nested blocks join the outer one, so services can call each other freely;
+    only the outermost block commits. Any exception rolls everything back.
+    """
+    if in_unit_of_work(db):
+        yield db
+        return
+
+    db.info[UNIT_OF_WORK_KEY] = True
+    try:
+        yield db
+        db.flush()
+        # Flushed state already holds RETURNING values, so don't expire it
+        # and re-SELECT every instance after the commit.
+        expire_on_commit = db.expire_on_commit
+        db.expire_on_commit = False
+        try:
+            db.commit()
+        finally:
+            db.expire_on_commit = expire_on_commit
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.info.pop(UNIT_OF_WORK_KEY, None)
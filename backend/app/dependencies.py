@@ -4,8 +4,8 @@ from app.core.config import AUTH0_DOMAIN, API_AUDIENCE, MGMT_CLIENT_ID, MGMT_CLI
 from fastapi.security import OAuth2AuthorizationCodeBearer
 from jose import jwt
 from jose.exceptions import JWTError, ExpiredSignatureError
-from urllib.request import urlopen
-import json
+from app.core.jwks import jwks_store
+from app.core.token_cache import token_cache
 import requests
 
 oauth2_scheme = OAuth2AuthorizationCodeBearer(
@@ -15,24 +15,17 @@ oauth2_scheme = OAuth2AuthorizationCodeBearer(
     scopes={"openid": "description", "profile": "description", "email": "description"}
 )
 def verify_jwt(token: str = Depends(oauth2_scheme)):
+    # Skip the RSA signature check for tokens verified recently
+    cached_payload = token_cache.get(token)
+    if cached_payload is not None:
+        return cached_payload
+
     try:
-        # Get JWKS
-        jsonurl = urlopen(f"https://{AUTH0_DOMAIN}/.well-known/jwks.json")
-        jwks = json.loads(jsonurl.read())
         unverified_header = jwt.get_unverified_header(token)
+        # Signing keys come from the in-process JWKS cache
+        rsa_key = jwks_store.get_key(unverified_header.get("kid"))
 
-        rsa_key = {}
-        for key in jwks["keys"]:
-            if key["kid"] == unverified_header["kid"]:
-                rsa_key = {
-                    "kty": key["kty"],
-                    "kid": key["kid"],
-                    "use": key["use"],
-                    "n": key["n"],
-                    "e": key["e"],
-                }
-
-        if rsa_key:
+        if rsa_key is not None:
             payload = jwt.decode(
                 token,
                 rsa_key,
@@ -40,6 +33,7 @@ def verify_jwt(token: str = Depends(oauth2_scheme)):
                 audience=API_AUDIENCE,
                 issuer=f"https://{AUTH0_DOMAIN}/",
             )
+            token_cache.put(token, payload)
             return payload
     except ExpiredSignatureError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token expired")
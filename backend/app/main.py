@@ -1,33 +1,76 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
 from app.routers import (
     auth_router, booking_router, flight_router, payment_router, pet, revenue_router, seat_router, airplane_router,
     hotel_router, car_rental_router, package_router, explore_router, service_router, booking_service_router, trip_router,
-    airport_router, flight_seat_router, passenger_router, emergency_contact_router, refund_router
+    airport_router, flight_seat_router, passenger_router, emergency_contact_router, refund_router,
+    monitoring_router, export_router, checkout_router
 )
-from app.core.database import create_tables
+from app.core.database import create_tables, warm_up_pool, engine, async_engine
+from app.core.metrics import MetricsMiddleware, instrument_engine
+from app.core import query_budget
+from app.core.slow_query_log import slow_query_log
+from app.core.jwks import jwks_store
+from app.core.concurrency import PreconditionFailed, VersionConflict
+from app.core.pagination import InvalidCursor, NEXT_CURSOR_HEADER
+from app.services.seat_hold_sweeper import seat_hold_sweeper
+from app.services.booking_reference import booking_references
 from app.factories import initialize_factories
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     create_tables()
+    warm_up_pool()  # Open the minimum number of pooled connections
     initialize_factories()  # Initialize Factory Pattern
+    jwks_store.refresh()  # Warm the Auth0 signing key cache
+    booking_references.generator()  # Fail now if BOOKING_REFERENCE_KEY is unset
+    seat_hold_sweeper.start()  # Release expired checkout seat holds
     yield
     # Shutdown
-    pass
+    seat_hold_sweeper.stop()
 
 app = FastAPI(lifespan=lifespan)
+
+# Count SQL statements and DB time per request for /metrics
+instrument_engine(engine)
+instrument_engine(async_engine.sync_engine)
+# N+1 / SQL budget checks, inactive unless SQL_QUERY_TRACKING is set
+query_budget.instrument_engine(engine)
+query_budget.instrument_engine(async_engine.sync_engine)
+# Keep statements slower than SLOW_QUERY_THRESHOLD_MS for /monitoring/slow-queries
+slow_query_log.instrument_engine(engine)
+slow_query_log.instrument_engine(async_engine.sync_engine)
+
 # Middleware
+app.add_middleware(query_budget.QueryBudgetMiddleware)
+app.add_middleware(MetricsMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:5173"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag", "Idempotent-Replayed"],
 )
 
+
+@app.exception_handler(InvalidCursor)
+async def invalid_cursor_handler(request: Request, exc: InvalidCursor):
+    return JSONResponse(status_code=400, content={"detail": str(exc)})
+
+
+@app.exception_handler(PreconditionFailed)
+async def precondition_failed_handler(request: Request, exc: PreconditionFailed):
+    return JSONResponse(status_code=412, content={"detail": str(exc)})
+
+
+@app.exception_handler(VersionConflict)
+async def version_conflict_handler(request: Request, exc: VersionConflict):
+    return JSONResponse(status_code=409, content={"detail": str(exc)})
+
  
 app.include_router(auth_router.router)
 app.include_router(airport_router.router)
@@ -38,6 +81,7 @@ app.include_router(flight_router.router)
 app.include_router(flight_seat_router.router)
 
 app.include_router(booking_router.router)
+app.include_router(checkout_router.router)
 app.include_router(passenger_router.router)
 app.include_router(emergency_contact_router.router)
 app.include_router(booking_service_router.router)
@@ -55,3 +99,6 @@ app.include_router(package_router.router)
 app.include_router(revenue_router.router)
 app.include_router(pet.router)
 
+app.include_router(export_router.router)
+app.include_router(monitoring_router.router)
+
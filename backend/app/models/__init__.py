@@ -1,7 +1,7 @@
 from .airplane import Airplane, Seat
 from .airport import Airport
 from .flight import Flight, FlightSeat
-from .booking import Booking, Payment, BookingService, Service
+from .booking import Booking, IdempotencyKey, Payment, BookingService, Service
 from .passenger import Passenger, EmergencyContact
 from .place import Place, Explore
 from .trip import TripPlan, TripPlanItem
@@ -16,7 +16,7 @@ __all__ = [
     "Airplane", "Seat",
     "Airport",
     "Flight", "FlightSeat",
-    "Booking", "Payment", "BookingService", "Service",
+    "Booking", "IdempotencyKey", "Payment", "BookingService", "Service",
     "Passenger", "EmergencyContact",
     "Place", "Explore",
     "TripPlan", "TripPlanItem",
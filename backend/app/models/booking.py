@@ -1,7 +1,12 @@
-from sqlalchemy import DECIMAL, TIMESTAMP, CheckConstraint, Column, ForeignKey, Integer, String, Text, func
+from sqlalchemy import DECIMAL, TIMESTAMP, CheckConstraint, Column, ForeignKey, Index, Integer, Sequence, String, Text, UniqueConstraint, func
 from app.core.database import Base
 from sqlalchemy.orm import relationship
 
+# Counters behind booking references, handed out in blocks of `increment`
+# (see app/services/booking_reference.py)
+BOOKING_REFERENCE_SEQUENCE = Sequence("booking_reference_seq", start=1, increment=1000, metadata=Base.metadata)
+
+
 class Booking(Base):
     __tablename__ = "bookings"
 
@@ -12,17 +17,37 @@ class Booking(Base):
     status = Column(String(20), default="pending")
     total_amount = Column(DECIMAL(10, 2))
     notes = Column(Text)
+    # Optimistic concurrency: every ORM UPDATE checks and bumps it (see app/core/concurrency.py)
+    version = Column(Integer, nullable=False, server_default="1")
 
     __table_args__ = (
         CheckConstraint("status IN ('pending','confirmed','cancelled')"),
     )
 
+    __mapper_args__ = {"version_id_col": version}
+
     # Relationships
     passengers = relationship("Passenger", back_populates="booking", cascade="all, delete-orphan")
     payments = relationship("Payment", back_populates="booking", cascade="all, delete-orphan")
     booking_services = relationship("BookingService", back_populates="booking", cascade="all, delete-orphan")
 
 
+class IdempotencyKey(Base):
+    """A client-supplied Idempotency-Key and the booking its checkout produced"""
+    __tablename__ = "idempotency_keys"
+
+    idempotency_key_id = Column(Integer, primary_key=True)
+    user_id = Column(String(255), nullable=False)
+    key = Column(String(255), nullable=False)
+    request_hash = Column(String(64), nullable=False)
+    booking_id = Column(Integer, ForeignKey("bookings.booking_id", ondelete="CASCADE"))
+    created_at = Column(TIMESTAMP, server_default=func.current_timestamp())
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "key", name="uq_idempotency_user_key"),
+    )
+
+
 class Payment(Base):
     __tablename__ = "payments"
     
@@ -33,11 +58,16 @@ class Payment(Base):
     payment_date = Column(TIMESTAMP, server_default="NOW()")
     method = Column(String(50))
     status = Column(String(20), default="pending")
+    version = Column(Integer, nullable=False, server_default="1")
 
     __table_args__ = (
         CheckConstraint("status IN ('success','failed','pending')"),
+        # Payments of a batch of bookings (refunds on flight cancellation)
+        Index("idx_payments_booking", "booking_id"),
     )
     
+    __mapper_args__ = {"version_id_col": version}
+
     booking = relationship("Booking", back_populates="payments")
 
 class Service(Base):
@@ -66,5 +96,10 @@ class BookingService(Base):
     service_id = Column(ForeignKey("services.service_id", ondelete="CASCADE"), nullable=False)
     quantity = Column(Integer, nullable=False, default=1)
 
+    __table_args__ = (
+        # Per-booking service totals
+        Index("idx_booking_services_booking", "booking_id"),
+    )
+
     booking = relationship("Booking", back_populates="booking_services")
     service = relationship("Service", back_populates="booking_services")
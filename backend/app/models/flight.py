@@ -1,4 +1,4 @@
-from sqlalchemy import DECIMAL, TIMESTAMP, CheckConstraint, Column, ForeignKey, Integer, String, DateTime, Numeric, UniqueConstraint
+from sqlalchemy import DECIMAL, TIMESTAMP, CheckConstraint, Column, ForeignKey, Index, Integer, String, DateTime, Numeric, UniqueConstraint, text
 from app.core.database import Base
 from sqlalchemy.orm import relationship
 
@@ -11,12 +11,22 @@ class FlightSeat(Base):
     seat_id = Column(Integer, ForeignKey("seats.seat_id", ondelete="CASCADE"), nullable=False)
     status = Column(String(20), default="available")
     price_multiplier = Column(DECIMAL(5, 2), default=1.0)
+    # Set while status is 'reserved' by a checkout hold; an expired hold counts as available
+    hold_expires_at = Column(TIMESTAMP)
+    held_by = Column(String(255))
+    version = Column(Integer, nullable=False, server_default="1")
 
     __table_args__ = (
         CheckConstraint("status IN ('available', 'reserved', 'booked')"),
         UniqueConstraint('flight_id', 'seat_id', name='uq_flight_seat'),
+        # Available-seat counts per flight (search, availability)
+        Index("idx_flight_seats_flight_status", "flight_id", "status"),
+        # Expired-hold sweeps
+        Index("idx_flight_seats_hold_expiry", "hold_expires_at", postgresql_where=text("status = 'reserved'")),
     )
 
+    __mapper_args__ = {"version_id_col": version}
+
     flight = relationship("Flight", back_populates="flight_seats")
     seat = relationship("Seat", back_populates="flight_seats")
     passengers = relationship("Passenger", back_populates="flight_seat")
@@ -39,6 +49,10 @@ class Flight(Base):
 
     __table_args__ = (
         CheckConstraint("status IN ('scheduled','delayed','cancelled','completed')"),
+        # Keyset pagination of /flights/all
+        Index("idx_flights_departure_time_id", "departure_time", "flight_id"),
+        # /flights/search: equality on the route, range on the departure time
+        Index("idx_flights_route_departure", "origin_airport_id", "destination_airport_id", "departure_time"),
     )
 
     airplane = relationship("Airplane", back_populates="flights")
@@ -1,4 +1,4 @@
-from sqlalchemy import DECIMAL, TIMESTAMP, Column, Date, Integer, String, Text, Float, CheckConstraint
+from sqlalchemy import DECIMAL, TIMESTAMP, Column, Date, Index, Integer, String, Text, Float, CheckConstraint
 from app.core.database import Base
 
 
@@ -36,4 +36,9 @@ class RevenueMetrics(Base):
     cancellation_count = Column(Integer, default=0)
     refund_amount = Column(DECIMAL(12, 2), default=0)
     notes = Column(Text)
-    created_at = Column(TIMESTAMP, server_default="NOW()")
\ No newline at end of file
+    created_at = Column(TIMESTAMP, server_default="NOW()")
+
+    __table_args__ = (
+        # Keyset pagination of /revenue/metrics
+        Index("idx_revenue_metrics_date_id", "date", "metric_id"),
+    )
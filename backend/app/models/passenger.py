@@ -1,4 +1,4 @@
-from sqlalchemy import TIMESTAMP, CheckConstraint, Column, Date, ForeignKey, Integer, String, Text, UniqueConstraint, func
+from sqlalchemy import TIMESTAMP, CheckConstraint, Column, Date, ForeignKey, Index, Integer, String, Text, UniqueConstraint, func
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 
@@ -35,6 +35,8 @@ class Passenger(Base):
     __table_args__ = (
         CheckConstraint("passenger_type IN ('adult','child','infant')"),
         UniqueConstraint('booking_id', 'flight_seat_id', name='uq_booking_flight_seat'),
+        # Bookings with passengers on a flight (repricing)
+        Index("idx_passengers_flight_seat", "flight_seat_id"),
     )
     
     # Relationships
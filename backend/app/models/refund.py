@@ -1,4 +1,4 @@
-from sqlalchemy import DECIMAL, TIMESTAMP, CheckConstraint, Column, ForeignKey, Integer, String, Text, func
+from sqlalchemy import DECIMAL, TIMESTAMP, CheckConstraint, Column, ForeignKey, Index, Integer, String, Text, func
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 
@@ -19,12 +19,17 @@ class Refund(Base):
     requested_at = Column(TIMESTAMP, server_default=func.current_timestamp())
     processed_at = Column(TIMESTAMP)
     notes = Column(Text)
+    version = Column(Integer, nullable=False, server_default="1")
 
     __table_args__ = (
         CheckConstraint("status IN ('pending','approved','rejected','completed')"),
         CheckConstraint("refund_percentage >= 0 AND refund_percentage <= 100"),
+        # Existing refunds of a payment
+        Index("idx_refunds_payment", "payment_id"),
     )
 
+    __mapper_args__ = {"version_id_col": version}
+
     # Relationships
     booking = relationship("Booking", backref="refunds")
     payment = relationship("Payment", backref="refunds")
@@ -1,5 +1,5 @@
 # models.py
-from sqlalchemy import Column, String, Boolean, DateTime
+from sqlalchemy import Column, String, Boolean, DateTime, Index, func
 import datetime
 
 from app.core.database import Base
@@ -11,4 +11,10 @@ class RoleRequest(Base):
     user_id = Column(String, nullable=False)
     requested_role = Column(String, nullable=False)
     approved = Column(Boolean, default=False)
-    created_at = Column(DateTime, default=datetime.datetime.now)
+    # NOT NULL: it is the leading keyset pagination column
+    created_at = Column(DateTime, nullable=False, default=datetime.datetime.now, server_default=func.now())
+
+    __table_args__ = (
+        # Keyset pagination of /admin/role-requests
+        Index("idx_role_requests_created_at_id", "created_at", "id"),
+    )
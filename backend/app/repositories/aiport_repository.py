@@ -1,5 +1,8 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.models.airport import Airport
+from app.core.unit_of_work import commit_changes
 
 
 def get_airport_by_id(db: Session, airport_id: int):
@@ -30,8 +33,7 @@ def get_airports_by_country(db: Session, country: str):
 def create_airport(db: Session, airport: Airport):
     """Create a new airport"""
     db.add(airport)
-    db.commit()
-    db.refresh(airport)
+    commit_changes(db, airport)
     return airport
 
 
@@ -43,8 +45,7 @@ def update_airport(db: Session, airport_id: int, airport_data: dict):
     for key, value in airport_data.items():
         if value is not None:
             setattr(airport, key, value)
-    db.commit()
-    db.refresh(airport)
+    commit_changes(db, airport)
     return airport
 
 
@@ -54,5 +55,42 @@ def delete_airport(db: Session, airport_id: int):
     if not airport:
         return False
     db.delete(airport)
-    db.commit()
-    return True
\ No newline at end of file
+    commit_changes(db)
+    return True
+
+
+# === async reads
+async def get_airport_by_id_async(db: AsyncSession, airport_id: int):
+    """Get an airport by ID"""
+    result = await db.execute(select(Airport).where(Airport.airport_id == airport_id))
+    return result.scalars().first()
+
+
+async def get_airport_by_iata_code_async(db: AsyncSession, iata_code: str):
+    """Get an airport by IATA code"""
+    result = await db.execute(select(Airport).where(Airport.iata_code == iata_code.upper()))
+    return result.scalars().first()
+
+
+async def get_airport_codes_async(db: AsyncSession):
+    """Map every IATA code to its airport_id"""
+    result = await db.execute(select(Airport.iata_code, Airport.airport_id))
+    return dict(result.all())
+
+
+async def get_all_airports_async(db: AsyncSession, skip: int = 0, limit: int = 100):
+    """Get all airports with pagination"""
+    result = await db.execute(select(Airport).offset(skip).limit(limit))
+    return result.scalars().all()
+
+
+async def get_airports_by_city_async(db: AsyncSession, city: str):
+    """Get airports filtered by city"""
+    result = await db.execute(select(Airport).where(Airport.city.ilike(f"%{city}%")))
+    return result.scalars().all()
+
+
+async def get_airports_by_country_async(db: AsyncSession, country: str):
+    """Get airports filtered by country"""
+    result = await db.execute(select(Airport).where(Airport.country.ilike(f"%{country}%")))
+    return result.scalars().all()
@@ -1,5 +1,6 @@
 from app.models.airplane import Airplane
 from sqlalchemy.orm import Session
+from app.core.unit_of_work import commit_changes
 
 def get_airplane_by_id(db: Session, airplane_id: int):
     return db.query(Airplane).filter(Airplane.airplane_id == airplane_id).first()
@@ -9,8 +10,7 @@ def get_all_airplanes(db: Session):
     
 def create_airplane(db: Session, airplane_data: Airplane):
     db.add(airplane_data)
-    db.commit()
-    db.refresh(airplane_data)
+    commit_changes(db, airplane_data)
     return airplane_data
 
 def update_airplane(db: Session, airplane_id: int, airplane_data: dict):
@@ -19,8 +19,7 @@ def update_airplane(db: Session, airplane_id: int, airplane_data: dict):
         return None
     for key, value in airplane_data.items():
         setattr(airplane, key, value)
-    db.commit()
-    db.refresh(airplane)
+    commit_changes(db, airplane)
     return airplane
     
 def delete_airplane(db: Session, airplane_id: int):
@@ -28,5 +27,5 @@ def delete_airplane(db: Session, airplane_id: int):
     if not airplane:
         return False
     db.delete(airplane)
-    db.commit()
+    commit_changes(db)
     return True
\ No newline at end of file
@@ -1,18 +1,59 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session, selectinload
 
-from app.models.booking import Booking
+from app.models.booking import BOOKING_REFERENCE_SEQUENCE, Booking, BookingService, IdempotencyKey, Service
+from app.models.flight import Flight, FlightSeat
+from app.models.passenger import Passenger
+from app.core.unit_of_work import commit_changes
+from app.core.config import DEFAULT_PAGE_SIZE
+from app.core.pagination import Keyset, paginate
+
+BOOKING_KEYSET = Keyset(Booking.booking_id)
 
 def get_booking_by_id(db: Session, booking_id: int):
     return db.query(Booking).filter(Booking.booking_id == booking_id).first()
     
-def get_all_bookings(db: Session):
-    return db.query(Booking).all()
+def _booking_graph():
+    """
+    Loader options for the whole booking graph, one SELECT ... WHERE IN per
+    relationship (12 statements whatever the number of passengers)
+    """
+    flight_seat = selectinload(Booking.passengers).selectinload(Passenger.flight_seat)
+    flight = flight_seat.selectinload(FlightSeat.flight)
+    return (
+        flight_seat.selectinload(FlightSeat.seat),
+        flight.selectinload(Flight.origin_airport),
+        flight.selectinload(Flight.destination_airport),
+        selectinload(Booking.passengers).selectinload(Passenger.emergency_contacts),
+        selectinload(Booking.booking_services).selectinload(BookingService.service),
+        selectinload(Booking.payments),
+        selectinload(Booking.refunds),
+    )
+
+def get_booking_detail(db: Session, booking_id: int = None, booking_reference: str = None):
+    """A booking by id or reference with its passengers, seats, flights, contacts, services, payments and refunds"""
+    statement = select(Booking).options(*_booking_graph())
+    if booking_id is not None:
+        statement = statement.where(Booking.booking_id == booking_id)
+    else:
+        statement = statement.where(Booking.booking_reference == booking_reference)
+    return db.scalars(statement).first()
+    
+def get_existing_booking_ids(db: Session, booking_ids: list[int]) -> set[int]:
+    return set(db.scalars(select(Booking.booking_id).where(Booking.booking_id.in_(booking_ids))))
     
+def get_all_bookings(db: Session, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE):
+    return paginate(db.query(Booking), BOOKING_KEYSET, cursor, limit)
+    
+def next_booking_reference_block(db: Session) -> int:
+    """First counter of a fresh block of booking reference counters"""
+    return db.execute(select(BOOKING_REFERENCE_SEQUENCE.next_value())).scalar_one()
+
 def create_booking(db: Session, booking_data):
     booking = Booking(**booking_data)
     db.add(booking)
-    db.commit()
-    db.refresh(booking)
+    commit_changes(db, booking)
     return booking
     
 def update_booking_status(db: Session, booking_id: int, status: str):
@@ -20,10 +61,88 @@ def update_booking_status(db: Session, booking_id: int, status: str):
     if not booking:
         return None
     booking.status = status
-    db.commit()
-    db.refresh(booking)
+    commit_changes(db, booking)
     return booking
     
+def _flight_bookings(flight_id: int):
+    """Ids of bookings with a passenger on the flight"""
+    return (
+        select(Passenger.booking_id)
+        .join(FlightSeat, FlightSeat.flight_seat_id == Passenger.flight_seat_id)
+        .where(FlightSeat.flight_id == flight_id)
+    )
+
+def _booking_total():
+    """
+    total_amount of the booking being updated, in exact numeric arithmetic:
+    each seated passenger's base_price * price_multiplier * (1 + tax_rate),
+    plus each booked service's price * quantity, rounded to cents
+    """
+    seats = (
+        select(func.sum(Flight.base_price * FlightSeat.price_multiplier * (1 + func.coalesce(Flight.tax_rate, 0))))
+        .select_from(Passenger)
+        .join(FlightSeat, FlightSeat.flight_seat_id == Passenger.flight_seat_id)
+        .join(Flight, Flight.flight_id == FlightSeat.flight_id)
+        .where(Passenger.booking_id == Booking.booking_id)
+        .scalar_subquery()
+    )
+    services = (
+        select(func.sum(Service.price * BookingService.quantity))
+        .select_from(BookingService)
+        .join(Service, Service.service_id == BookingService.service_id)
+        .where(BookingService.booking_id == Booking.booking_id)
+        .scalar_subquery()
+    )
+    return func.round(func.coalesce(seats, 0) + func.coalesce(services, 0), 2)
+
+
+def recalculate_booking_totals(db: Session, booking_ids: list[int] = None, flight_id: int = None,
+                               statuses: list[str] = None):
+    """
+    Recompute total_amount in one UPDATE ... RETURNING for the given bookings,
+    and/or every booking with a passenger on `flight_id`, optionally limited to
+    some statuses. Returns the updated Booking objects.
+    """
+    statement = update(Booking).values(total_amount=_booking_total(), version=Booking.version + 1)
+    if booking_ids is not None:
+        statement = statement.where(Booking.booking_id.in_(booking_ids))
+    if flight_id is not None:
+        statement = statement.where(Booking.booking_id.in_(_flight_bookings(flight_id)))
+    if statuses:
+        statement = statement.where(Booking.status.in_(statuses))
+    bookings = db.scalars(statement.returning(Booking)).all()
+    commit_changes(db)
+    return bookings
+
+def count_open_flight_bookings(db: Session, flight_id: int) -> int:
+    """Bookings on the flight that are not cancelled yet"""
+    return db.execute(
+        select(func.count())
+        .select_from(Booking)
+        .where(Booking.booking_id.in_(_flight_bookings(flight_id)), Booking.status != "cancelled")
+    ).scalar_one()
+
+def cancel_flight_bookings(db: Session, flight_id: int, batch_size: int) -> list[int]:
+    """
+    Cancel up to `batch_size` open bookings on the flight in one UPDATE,
+    lowest ids first; returns the ids cancelled (empty when none are left).
+    Bookings another transaction is writing are waited for, not skipped.
+    """
+    batch = (
+        select(Booking.booking_id)
+        .where(Booking.booking_id.in_(_flight_bookings(flight_id)), Booking.status != "cancelled")
+        .order_by(Booking.booking_id)
+        .limit(batch_size)
+        .with_for_update()
+    )
+    return db.scalars(
+        update(Booking)
+        .where(Booking.booking_id.in_(batch.scalar_subquery()))
+        .values(status="cancelled", version=Booking.version + 1)
+        .returning(Booking.booking_id)
+        .execution_options(synchronize_session=False)
+    ).all()
+
 def get_user_bookings(db: Session, user_id: str):
     return db.query(Booking).filter(Booking.user_id == user_id).all()
 
@@ -32,5 +151,41 @@ def delete_booking(db: Session, booking_id: int):
     if not booking:
         return None
     db.delete(booking)
-    db.commit()
-    return booking
\ No newline at end of file
+    commit_changes(db)
+    return booking
+
+def stream_bookings(db: Session, batch_size: int):
+    """Yield batches of raw booking rows through a server-side cursor"""
+    statement = select(Booking.__table__).order_by(Booking.booking_id).execution_options(yield_per=batch_size)
+    return db.execute(statement).partitions()
+
+
+# == idempotency keys
+def reserve_idempotency_key(db: Session, user_id: str, key: str, request_hash: str):
+    """
+    Take `key` for this request, or return the row of the request that already
+    holds it. INSERT ... ON CONFLICT waits while another transaction holds the
+    key uncommitted, so a concurrent retry sees the finished first request (or
+    takes over the key if that one rolled back). Returns None when the key is ours.
+    """
+    inserted = db.execute(
+        pg_insert(IdempotencyKey)
+        .values(user_id=user_id, key=key, request_hash=request_hash)
+        .on_conflict_do_nothing(constraint="uq_idempotency_user_key")
+        .returning(IdempotencyKey.idempotency_key_id)
+    ).first()
+    if inserted is not None:
+        return None
+    return db.query(IdempotencyKey)\
+        .filter(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key)\
+        .one()
+
+
+def complete_idempotency_key(db: Session, user_id: str, key: str, booking_id: int):
+    """Record the booking produced under `key`"""
+    db.execute(
+        update(IdempotencyKey)
+        .where(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key)
+        .values(booking_id=booking_id)
+        .execution_options(synchronize_session=False)
+    )
@@ -1,5 +1,6 @@
 from sqlalchemy.orm import Session
 from app.models.booking import BookingService
+from app.core.unit_of_work import commit_changes
 
 
 def get_booking_service_by_id(db: Session, booking_service_id: int):
@@ -18,8 +19,7 @@ def get_all_booking_services(db: Session):
 def create_booking_service(db: Session, booking_service_data: BookingService):
     """Add a service to a booking"""
     db.add(booking_service_data)
-    db.commit()
-    db.refresh(booking_service_data)
+    commit_changes(db, booking_service_data)
     return booking_service_data
 
 
@@ -31,8 +31,7 @@ def update_booking_service(db: Session, booking_service_id: int, booking_service
     for key, value in booking_service_data.items():
         if value is not None:
             setattr(booking_service, key, value)
-    db.commit()
-    db.refresh(booking_service)
+    commit_changes(db, booking_service)
     return booking_service
 
 
@@ -42,5 +41,5 @@ def delete_booking_service(db: Session, booking_service_id: int):
     if not booking_service:
         return False
     db.delete(booking_service)
-    db.commit()
+    commit_changes(db)
     return True
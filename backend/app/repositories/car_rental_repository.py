@@ -1,5 +1,12 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, joinedload
 from app.models.car_rental import CarRental
+from app.core.unit_of_work import commit_changes
+from app.core.config import DEFAULT_PAGE_SIZE
+from app.core.pagination import Keyset, paginate, paginate_async
+
+CAR_RENTAL_KEYSET = Keyset(CarRental.car_rental_id)
 
 
 def get_car_rental_by_id(db: Session, car_rental_id: int):
@@ -7,9 +14,15 @@ def get_car_rental_by_id(db: Session, car_rental_id: int):
     return db.query(CarRental).filter(CarRental.car_rental_id == car_rental_id).first()
 
 
-def get_all_car_rentals(db: Session, skip: int = 0, limit: int = 100):
-    """Get all car rentals with pagination - no eager loading to avoid unnecessary joins"""
-    return db.query(CarRental).offset(skip).limit(limit).all()
+def get_all_car_rentals(db: Session, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE, skip: int = 0):
+    """Get all car rentals, one keyset page at a time - no eager loading to avoid unnecessary joins"""
+    return paginate(db.query(CarRental), CAR_RENTAL_KEYSET, cursor, limit, skip)
+
+
+async def get_all_car_rentals_async(db: AsyncSession, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE,
+                                    skip: int = 0):
+    """Get all car rentals, one keyset page at a time"""
+    return await paginate_async(db, select(CarRental), CAR_RENTAL_KEYSET, cursor, limit, skip)
 
 
 def get_available_car_rentals(db: Session):
@@ -25,8 +38,7 @@ def get_car_rentals_by_brand(db: Session, brand: str):
 def create_car_rental(db: Session, car_rental_data: CarRental):
     """Create a new car rental"""
     db.add(car_rental_data)
-    db.commit()
-    db.refresh(car_rental_data)
+    commit_changes(db, car_rental_data)
     return car_rental_data
 
 
@@ -38,8 +50,7 @@ def update_car_rental(db: Session, car_rental_id: int, car_rental_data: dict):
     for key, value in car_rental_data.items():
         if value is not None:
             setattr(car_rental, key, value)
-    db.commit()
-    db.refresh(car_rental)
+    commit_changes(db, car_rental)
     return car_rental
 
 
@@ -49,5 +60,5 @@ def delete_car_rental(db: Session, car_rental_id: int):
     if not car_rental:
         return False
     db.delete(car_rental)
-    db.commit()
+    commit_changes(db)
     return True
@@ -1,5 +1,6 @@
 from sqlalchemy.orm import Session, joinedload
 from app.models.passenger import EmergencyContact
+from app.core.unit_of_work import commit_changes
 
 
 def get_emergency_contact_by_id(db: Session, contact_id: int):
@@ -29,8 +30,7 @@ def create_emergency_contact(db: Session, contact_data: dict):
     """Create a new emergency contact"""
     contact = EmergencyContact(**contact_data)
     db.add(contact)
-    db.commit()
-    db.refresh(contact)
+    commit_changes(db, contact)
     return contact
 
 
@@ -38,9 +38,7 @@ def create_emergency_contacts_bulk(db: Session, contacts_data: list[dict]):
     """Create multiple emergency contacts at once"""
     contacts = [EmergencyContact(**data) for data in contacts_data]
     db.add_all(contacts)
-    db.commit()
-    for contact in contacts:
-        db.refresh(contact)
+    commit_changes(db, *contacts)
     return contacts
 
 
@@ -54,8 +52,7 @@ def update_emergency_contact(db: Session, contact_id: int, contact_data: dict):
         if value is not None and hasattr(contact, key):
             setattr(contact, key, value)
     
-    db.commit()
-    db.refresh(contact)
+    commit_changes(db, contact)
     return contact
 
 
@@ -65,7 +62,7 @@ def delete_emergency_contact(db: Session, contact_id: int):
     if not contact:
         return False
     db.delete(contact)
-    db.commit()
+    commit_changes(db)
     return True
 
 
@@ -74,5 +71,5 @@ def delete_emergency_contacts_by_passenger(db: Session, passenger_id: int):
     count = db.query(EmergencyContact)\
         .filter(EmergencyContact.passenger_id == passenger_id)\
         .delete()
-    db.commit()
+    commit_changes(db)
     return count
@@ -1,33 +1,45 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.place import Explore
+from app.core.unit_of_work import commit_changes
+from app.core.config import DEFAULT_PAGE_SIZE
+from app.core.pagination import Keyset, paginate, paginate_async
+
+EXPLORE_KEYSET = Keyset(Explore.explore_id)
 
 def get_explores_by_place(db: Session, place_id: int):
     return db.query(Explore).filter(Explore.place_id == place_id).first()
 
-def get_explores(db: Session):
-    return db.query(Explore).all()
+def get_explores(db: Session, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE):
+    return paginate(db.query(Explore), EXPLORE_KEYSET, cursor, limit)
+
+async def get_explores_async(db: AsyncSession, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE):
+    return await paginate_async(db, select(Explore), EXPLORE_KEYSET, cursor, limit)
 
 def get_random_explores(db: Session, limit: int = 10):
     """Get random explore entries from the database"""
     return db.query(Explore).order_by(func.random()).limit(limit).all()
+
+async def get_random_explores_async(db: AsyncSession, limit: int = 10):
+    """Get random explore entries from the database"""
+    result = await db.execute(select(Explore).order_by(func.random()).limit(limit))
+    return result.scalars().all()
     
 def create_explore(db: Session, data: Explore):
     db.add(data)
-    db.commit()
-    db.refresh(data)
+    commit_changes(db, data)
     return data
 
 def update_explore(db: Session, explore_id: int, data: dict):
     explore = db.query(Explore).filter(Explore.explore_id == explore_id).first()
     for key, value in data.items():
         setattr(explore, key, value)
-    db.commit()
-    db.refresh(explore)
+    commit_changes(db, explore)
     return explore
 
 def delete_explore(db: Session, explore_id: int):
     explore = db.query(Explore).filter(Explore.explore_id == explore_id).first()
     db.delete(explore)
-    db.commit()
+    commit_changes(db)
     return explore
\ No newline at end of file
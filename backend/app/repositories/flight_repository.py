@@ -1,16 +1,28 @@
-from app.models.flight import Flight
+from datetime import datetime
+from app.models.flight import Flight, FlightSeat
+from sqlalchemy import Date, and_, cast, distinct, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from app.core.unit_of_work import commit_changes
+from app.core.config import DEFAULT_PAGE_SIZE
+from app.core.pagination import Keyset, paginate, paginate_async
+from app.repositories.flight_seat_repository import SEAT_IS_FREE
+
+# Flights a traveler can still book
+BOOKABLE_STATUSES = ("scheduled", "delayed")
+
+# Listings run in departure order; flight_id breaks ties
+FLIGHT_KEYSET = Keyset(Flight.departure_time, Flight.flight_id)
 
 def get_flight_by_id(db: Session, flight_id: int):
     return db.query(Flight).filter(Flight.flight_id == flight_id).first()
 
-def get_all_flights(db: Session):
-    return db.query(Flight).all()
+def get_all_flights(db: Session, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE):
+    return paginate(db.query(Flight), FLIGHT_KEYSET, cursor, limit)
     
 def create_flight(db: Session, flight_data: Flight):
     db.add(flight_data)
-    db.commit()
-    db.refresh(flight_data)
+    commit_changes(db, flight_data)
     return flight_data
 
 def update_flight(db: Session, flight_id: int, flight_data: dict):
@@ -19,8 +31,7 @@ def update_flight(db: Session, flight_id: int, flight_data: dict):
         return None
     for key, value in flight_data.items():
         setattr(flight, key, value)
-    db.commit()
-    db.refresh(flight)
+    commit_changes(db, flight)
     return flight
     
 def delete_flight(db: Session, flight_id: int):
@@ -28,7 +39,7 @@ def delete_flight(db: Session, flight_id: int):
     if not flight:
         return False
     db.delete(flight)
-    db.commit()
+    commit_changes(db)
     return True
 
 def get_flights_by_airport(db: Session, origin_id: int, destination_id: int):
@@ -39,3 +50,90 @@ def get_flights_by_airport(db: Session, origin_id: int, destination_id: int):
     
 def get_flights_by_status(db: Session, status: str):
     return db.query(Flight).filter(Flight.status == status).all()
+
+
+# === async reads
+async def get_flight_by_id_async(db: AsyncSession, flight_id: int):
+    result = await db.execute(select(Flight).where(Flight.flight_id == flight_id))
+    return result.scalars().first()
+
+async def get_all_flights_async(db: AsyncSession, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE):
+    return await paginate_async(db, select(Flight), FLIGHT_KEYSET, cursor, limit)
+
+async def get_bookable_flights_async(db: AsyncSession, departing_after: datetime):
+    """Scheduled or delayed flights that have not departed yet"""
+    result = await db.execute(
+        select(Flight).where(
+            Flight.departure_time >= departing_after,
+            Flight.status.in_(BOOKABLE_STATUSES),
+        )
+    )
+    return result.scalars().all()
+
+async def search_flights_async(db: AsyncSession, origin_id: int, destination_id: int,
+                               departure_from: datetime, departure_to: datetime, passengers: int):
+    """
+    Bookable flights on a route departing in [departure_from, departure_to) with at
+    least `passengers` available seats, as (Flight, available_seats) rows.
+
+    One statement: a range scan on idx_flights_route_departure joined to the
+    flight's available seats and counted in the same GROUP BY.
+    """
+    available_seats = func.count(FlightSeat.flight_seat_id)
+    statement = (
+        select(Flight, available_seats.label("available_seats"))
+        .join(FlightSeat, and_(FlightSeat.flight_id == Flight.flight_id, SEAT_IS_FREE))
+        .where(
+            Flight.origin_airport_id == origin_id,
+            Flight.destination_airport_id == destination_id,
+            Flight.departure_time >= departure_from,
+            Flight.departure_time < departure_to,
+            Flight.status.in_(BOOKABLE_STATUSES),
+        )
+        .group_by(Flight.flight_id)
+        .having(available_seats >= passengers)
+        .order_by(Flight.departure_time, Flight.flight_id)
+    )
+    result = await db.execute(statement)
+    return result.all()
+
+async def get_fare_calendar_async(db: AsyncSession, origin_id: int, destination_id: int,
+                                  departure_from: datetime, departure_to: datetime):
+    """
+    Lowest available fare per departure day on a route, as
+    (day, lowest_fare, flight_count, flight_ids) rows, in one GROUP BY.
+
+    fare = base_price * price_multiplier * (1 + tax_rate); the minimum over a day's
+    available seats equals base_price * min(price_multiplier) * (1 + tax_rate) of
+    its cheapest flight. Sold-out flights still show up in flight_ids (LEFT JOIN)
+    so that the cache can invalidate on them, but neither in flight_count nor in
+    the fare: a day where every flight is sold out has a NULL fare.
+    """
+    has_free_seat = FlightSeat.flight_seat_id.isnot(None)
+    day = cast(Flight.departure_time, Date)
+    fare = (
+        Flight.base_price
+        * func.coalesce(FlightSeat.price_multiplier, 1)
+        * (1 + func.coalesce(Flight.tax_rate, 0))
+    )
+    statement = (
+        select(
+            day.label("day"),
+            func.min(fare).filter(has_free_seat).label("lowest_fare"),
+            func.count(distinct(Flight.flight_id)).filter(has_free_seat).label("flight_count"),
+            func.array_agg(distinct(Flight.flight_id)).label("flight_ids"),
+        )
+        .select_from(Flight)
+        .outerjoin(FlightSeat, and_(FlightSeat.flight_id == Flight.flight_id, SEAT_IS_FREE))
+        .where(
+            Flight.origin_airport_id == origin_id,
+            Flight.destination_airport_id == destination_id,
+            Flight.departure_time >= departure_from,
+            Flight.departure_time < departure_to,
+            Flight.status.in_(BOOKABLE_STATUSES),
+        )
+        .group_by(day)
+        .order_by(day)
+    )
+    result = await db.execute(statement)
+    return result.all()
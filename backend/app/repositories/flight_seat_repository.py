@@ -1,6 +1,26 @@
+from datetime import timedelta
+from sqlalchemy import and_, case, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, joinedload
-from app.models.flight import FlightSeat
+from app.models.airplane import Seat
+from app.models.flight import Flight, FlightSeat
+from app.models.passenger import Passenger
 from app.schemas.flight_seat_schema import FlightSeatCreate
+from app.core.unit_of_work import commit_changes
+from app.core.config import DEFAULT_PAGE_SIZE
+from app.core.pagination import Keyset, paginate
+from app.services.fare_calendar import invalidate_flights_on_commit
+
+FLIGHT_SEAT_KEYSET = Keyset(FlightSeat.flight_seat_id)
+
+# A seat can be taken when it is available or its checkout hold has lapsed;
+# expired holds stay 'reserved' until the sweeper gets to them
+SEAT_IS_FREE = or_(
+    FlightSeat.status == "available",
+    and_(FlightSeat.status == "reserved", FlightSeat.hold_expires_at <= func.now()),
+)
+# Status as clients should see it
+EFFECTIVE_STATUS = case((SEAT_IS_FREE, "available"), else_=FlightSeat.status)
 
 # == seats
 def get_flight_seat_by_id(db: Session, flight_seat_id: int):
@@ -11,13 +31,11 @@ def get_flight_seat_by_id(db: Session, flight_seat_id: int):
         .first()
 
 
-def get_all_flight_seats(db: Session, skip: int = 0, limit: int = 100):
-    """Get all flight seats with pagination"""
-    return db.query(FlightSeat)\
-        .options(joinedload(FlightSeat.flight), joinedload(FlightSeat.seat))\
-        .offset(skip)\
-        .limit(limit)\
-        .all()
+def get_all_flight_seats(db: Session, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE, skip: int = 0):
+    """Get all flight seats, one keyset page at a time"""
+    query = db.query(FlightSeat)\
+        .options(joinedload(FlightSeat.flight), joinedload(FlightSeat.seat))
+    return paginate(query, FLIGHT_SEAT_KEYSET, cursor, limit, skip)
 
 
 def get_flight_seats_by_flight(db: Session, flight_id: int):
@@ -32,10 +50,59 @@ def get_available_flight_seats(db: Session, flight_id: int):
     """Get all available seats for a specific flight"""
     return db.query(FlightSeat)\
         .options(joinedload(FlightSeat.seat))\
-        .filter(FlightSeat.flight_id == flight_id, FlightSeat.status == "available")\
+        .filter(FlightSeat.flight_id == flight_id, SEAT_IS_FREE)\
         .all()
 
 
+async def get_available_flight_seats_async(db: AsyncSession, flight_id: int):
+    """Get all available seats for a specific flight"""
+    result = await db.execute(
+        select(FlightSeat)
+        .where(FlightSeat.flight_id == flight_id, SEAT_IS_FREE)
+    )
+    return result.scalars().all()
+
+
+async def get_availability_summary_async(db: AsyncSession, flight_ids: list[int]):
+    """
+    Seat counts per (flight_id, seat_class) split by status, with the price
+    multiplier range of the available seats, as one aggregate row per group.
+    """
+    available = SEAT_IS_FREE
+    result = await db.execute(
+        select(
+            FlightSeat.flight_id,
+            Seat.seat_class,
+            func.count().label("total"),
+            func.count().filter(available).label("available"),
+            func.count().filter(EFFECTIVE_STATUS == "reserved").label("reserved"),
+            func.count().filter(FlightSeat.status == "booked").label("booked"),
+            func.min(FlightSeat.price_multiplier).filter(available).label("min_price_multiplier"),
+            func.max(FlightSeat.price_multiplier).filter(available).label("max_price_multiplier"),
+        )
+        .join(Seat, Seat.seat_id == FlightSeat.seat_id)
+        .where(FlightSeat.flight_id.in_(flight_ids))
+        .group_by(FlightSeat.flight_id, Seat.seat_class)
+        .order_by(FlightSeat.flight_id, Seat.seat_class)
+    )
+    return result.all()
+
+
+async def get_seat_statuses_async(db: AsyncSession, flight_id: int):
+    """
+    (airplane_id, seat_id, status) rows for a flight, without loading FlightSeat
+    objects. A flight without seats yields one row with seat_id None; an unknown
+    flight yields none.
+    """
+    result = await db.execute(
+        select(Flight.airplane_id, FlightSeat.seat_id, EFFECTIVE_STATUS.label("status"))
+        .select_from(Flight)
+        .outerjoin(FlightSeat, FlightSeat.flight_id == Flight.flight_id)
+        .where(Flight.flight_id == flight_id)
+    )
+    return result.all()
+
+
 def get_flight_seats_by_status(db: Session, flight_id: int, status: str):
     """Get flight seats filtered by status"""
     return db.query(FlightSeat)\
@@ -52,14 +119,208 @@ def get_flight_seats_by_class(db: Session, flight_id: int, seat_class: str):
         .filter(FlightSeat.seat.has(seat_class=seat_class))\
         .all()
 
+# === seat claims and holds
+# Set-based UPDATEs bypass the ORM's version counter, so they bump it themselves
+# and ORM read-modify-writes of the same seats fail instead of overwriting them
+_NEXT_VERSION = {"version": FlightSeat.version + 1}
+_RELEASE_VALUES = {"status": "available", "hold_expires_at": None, "held_by": None, **_NEXT_VERSION}
+
+def _claimable(user_id: str = None):
+    """Free seats, plus the seats `user_id` currently holds"""
+    if user_id is None:
+        return SEAT_IS_FREE
+    return or_(SEAT_IS_FREE, and_(FlightSeat.status == "reserved", FlightSeat.held_by == user_id))
+
+
+def _claim_values(user_id: str = None, hold_for: timedelta = None) -> dict:
+    """Book the seat, or hold it for `user_id` until now() + `hold_for`"""
+    if hold_for is None:
+        return {"status": "booked", "hold_expires_at": None, "held_by": None, **_NEXT_VERSION}
+    return {"status": "reserved", "hold_expires_at": func.now() + hold_for, "held_by": user_id, **_NEXT_VERSION}
+
+
+def claim_flight_seat(db: Session, flight_seat_id: int, user_id: str = None):
+    """
+    Atomically book one free seat (or one held by `user_id`).
+
+    A single conditional UPDATE ... RETURNING: of two concurrent claims the
+    second one blocks on the row lock, re-checks the WHERE clause once the first
+    commits and matches nothing. Returns the claimed flight_seat_id, or None
+    when the seat does not exist or was not free.
+    """
+    flight_seat = db.execute(
+        update(FlightSeat)
+        .where(FlightSeat.flight_seat_id == flight_seat_id, _claimable(user_id))
+        .values(**_claim_values())
+        .returning(FlightSeat.flight_seat_id, FlightSeat.flight_id)
+    ).first()
+    if flight_seat is None:
+        return None
+    invalidate_flights_on_commit(db, [flight_seat.flight_id])
+    return flight_seat.flight_seat_id
+
+
+def claim_any_flight_seats(db: Session, flight_id: int, seat_class: str = None, count: int = 1,
+                           user_id: str = None, hold_for: timedelta = None):
+    """
+    Atomically book (or hold, see `_claim_values`) `count` free seats of a
+    flight, optionally of one class, lowest seat_id first. Candidates are picked
+    with FOR UPDATE SKIP LOCKED, so concurrent callers take different seats
+    instead of queueing on the same rows. Returns (flight_seat_id,
+    hold_expires_at) rows; fewer than `count` (possibly none) when the flight
+    runs out.
+    """
+    candidates = (
+        select(FlightSeat.flight_seat_id)
+        .join(Seat, Seat.seat_id == FlightSeat.seat_id)
+        .where(FlightSeat.flight_id == flight_id, SEAT_IS_FREE)
+        .order_by(FlightSeat.seat_id)
+        .limit(count)
+        .with_for_update(of=FlightSeat, skip_locked=True)
+    )
+    if seat_class is not None:
+        candidates = candidates.where(Seat.seat_class == seat_class)
+    claimed = db.execute(
+        update(FlightSeat)
+        .where(FlightSeat.flight_seat_id.in_(candidates.scalar_subquery()), SEAT_IS_FREE)
+        .values(**_claim_values(user_id, hold_for))
+        .returning(FlightSeat.flight_seat_id, FlightSeat.hold_expires_at)
+    ).all()
+    if claimed:
+        invalidate_flights_on_commit(db, [flight_id])
+    return sorted(claimed)
+
+
+def claim_flight_seats(db: Session, flight_id: int, flight_seat_ids: list[int], user_id: str = None,
+                       hold_for: timedelta = None):
+    """
+    Book (or hold, see `_claim_values`) the given seats of a flight in one
+    UPDATE, including seats `user_id` already holds. Returns (flight_seat_id,
+    hold_expires_at, price_multiplier) rows for the seats that could be claimed;
+    the caller decides whether a partial claim is acceptable.
+    """
+    claimed = db.execute(
+        update(FlightSeat)
+        .where(
+            FlightSeat.flight_id == flight_id,
+            FlightSeat.flight_seat_id.in_(flight_seat_ids),
+            _claimable(user_id),
+        )
+        .values(**_claim_values(user_id, hold_for))
+        .returning(FlightSeat.flight_seat_id, FlightSeat.hold_expires_at, FlightSeat.price_multiplier)
+    ).all()
+    if claimed:
+        invalidate_flights_on_commit(db, [flight_id])
+    return sorted(claimed)
+
+
+def book_flight_seats(db: Session, flight_seat_ids: list[int], user_id: str = None):
+    """
+    Book the given seats, on any flights, in one UPDATE (seats `user_id` holds
+    included). Returns the ids that could be booked; fewer ids than asked for
+    means some seat was missing or taken.
+    """
+    claimed = db.execute(
+        update(FlightSeat)
+        .where(FlightSeat.flight_seat_id.in_(flight_seat_ids), _claimable(user_id))
+        .values(**_claim_values(user_id))
+        .returning(FlightSeat.flight_seat_id, FlightSeat.flight_id)
+    ).all()
+    invalidate_flights_on_commit(db, {row.flight_id for row in claimed})
+    return sorted(row.flight_seat_id for row in claimed)
+
+
+def hold_flight_seats(db: Session, flight_id: int, flight_seat_ids: list[int], user_id: str, hold_for: timedelta):
+    """Hold the given seats for `user_id`, extending holds the user already has"""
+    return claim_flight_seats(db, flight_id, flight_seat_ids, user_id, hold_for)
+
+
+def get_free_seat_numbers(db: Session, flight_id: int, seat_class: str = None):
+    """(flight_seat_id, seat_number) of a flight's free seats, optionally of one class"""
+    statement = (
+        select(FlightSeat.flight_seat_id, Seat.seat_number)
+        .join(Seat, Seat.seat_id == FlightSeat.seat_id)
+        .where(FlightSeat.flight_id == flight_id, SEAT_IS_FREE)
+    )
+    if seat_class is not None:
+        statement = statement.where(Seat.seat_class == seat_class)
+    return db.execute(statement).all()
+
+
+def release_held_flight_seats(db: Session, flight_seat_ids: list[int], user_id: str):
+    """Give back seats held by `user_id`; returns the released flight_seat_ids"""
+    released = db.execute(
+        update(FlightSeat)
+        .where(
+            FlightSeat.flight_seat_id.in_(flight_seat_ids),
+            FlightSeat.status == "reserved",
+            FlightSeat.held_by == user_id,
+        )
+        .values(**_RELEASE_VALUES)
+        .returning(FlightSeat.flight_seat_id, FlightSeat.flight_id)
+    ).all()
+    if released:
+        invalidate_flights_on_commit(db, {row.flight_id for row in released})
+    return [row.flight_seat_id for row in released]
+
+
+def release_expired_holds(db: Session, batch_size: int):
+    """
+    Flip up to `batch_size` expired holds back to 'available' in one UPDATE.
+    SKIP LOCKED keeps the sweep from waiting on seats a checkout is claiming.
+    Returns the number of seats released.
+    """
+    expired = (
+        select(FlightSeat.flight_seat_id)
+        .where(FlightSeat.status == "reserved", FlightSeat.hold_expires_at <= func.now())
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    released = db.execute(
+        update(FlightSeat)
+        .where(FlightSeat.flight_seat_id.in_(expired.scalar_subquery()))
+        .values(**_RELEASE_VALUES)
+        .returning(FlightSeat.flight_id)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+    invalidate_flights_on_commit(db, set(released))
+    return len(released)
+
+
+def release_booking_seats(db: Session, booking_ids: list[int]) -> int:
+    """Free every seat held by the bookings' passengers, on any flight, in one UPDATE"""
+    released = db.execute(
+        update(FlightSeat)
+        .where(FlightSeat.flight_seat_id.in_(
+            select(Passenger.flight_seat_id).where(Passenger.booking_id.in_(booking_ids))
+        ))
+        .values(**_RELEASE_VALUES)
+        .returning(FlightSeat.flight_id)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+    invalidate_flights_on_commit(db, set(released))
+    return len(released)
+
+
+def release_flight_seats(db: Session, flight_id: int) -> int:
+    """Free every seat of the flight still booked or held (after its bookings are cancelled)"""
+    released = db.execute(
+        update(FlightSeat)
+        .where(FlightSeat.flight_id == flight_id, FlightSeat.status != "available")
+        .values(**_RELEASE_VALUES)
+        .returning(FlightSeat.flight_seat_id)
+        .execution_options(synchronize_session=False)
+    ).all()
+    return len(released)
+
+
 # === flight seat
 def create_flight_seat(db: Session, flight_seat: FlightSeatCreate):
     """Create a new flight seat"""
     # Convert Pydantic schema to ORM model instance
     db_flight_seat = FlightSeat(**flight_seat.model_dump() if hasattr(flight_seat, 'model_dump') else flight_seat)
     db.add(db_flight_seat)
-    db.commit()
-    db.refresh(db_flight_seat)
+    commit_changes(db, db_flight_seat)
     return db_flight_seat
 
 
@@ -68,9 +329,7 @@ def create_flight_seats_bulk(db: Session, flight_seats: list[FlightSeatCreate]):
     # Convert Pydantic schemas to ORM model instances
     db_flight_seats = [FlightSeat(**fs.model_dump() if hasattr(fs, 'model_dump') else fs) for fs in flight_seats]
     db.add_all(db_flight_seats)
-    db.commit()
-    for flight_seat in db_flight_seats:
-        db.refresh(flight_seat)
+    commit_changes(db, *db_flight_seats)
     return db_flight_seats
 
 
@@ -82,8 +341,7 @@ def update_flight_seat(db: Session, flight_seat_id: int, flight_seat_data: dict)
     for key, value in flight_seat_data.items():
         if value is not None:
             setattr(flight_seat, key, value)
-    db.commit()
-    db.refresh(flight_seat)
+    commit_changes(db, flight_seat)
     return flight_seat
 
 
@@ -98,12 +356,12 @@ def delete_flight_seat(db: Session, flight_seat_id: int):
     if not flight_seat:
         return False
     db.delete(flight_seat)
-    db.commit()
+    commit_changes(db)
     return True
 
 
 def delete_flight_seats_by_flight(db: Session, flight_id: int):
     """Delete all flight seats for a specific flight"""
     db.query(FlightSeat).filter(FlightSeat.flight_id == flight_id).delete()
-    db.commit()
+    commit_changes(db)
     return True
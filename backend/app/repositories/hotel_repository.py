@@ -1,5 +1,8 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.models.hotel import Hotel
+from app.core.unit_of_work import commit_changes
 
 
 def get_hotel_by_id(db: Session, hotel_id: int):
@@ -12,6 +15,12 @@ def get_all_hotels(db: Session, skip: int = 0, limit: int = 100):
     return db.query(Hotel).offset(skip).limit(limit).all()
 
 
+async def get_all_hotels_async(db: AsyncSession, skip: int = 0, limit: int = 100):
+    """Get all hotels with pagination"""
+    result = await db.execute(select(Hotel).offset(skip).limit(limit))
+    return result.scalars().all()
+
+
 def get_hotels_by_stars(db: Session, stars: int):
     """Get hotels filtered by star rating"""
     return db.query(Hotel).filter(Hotel.stars == stars).all()
@@ -20,8 +29,7 @@ def get_hotels_by_stars(db: Session, stars: int):
 def create_hotel(db: Session, hotel_data: Hotel):
     """Create a new hotel"""
     db.add(hotel_data)
-    db.commit()
-    db.refresh(hotel_data)
+    commit_changes(db, hotel_data)
     return hotel_data
 
 
@@ -33,8 +41,7 @@ def update_hotel(db: Session, hotel_id: int, hotel_data: dict):
     for key, value in hotel_data.items():
         if value is not None:
             setattr(hotel, key, value)
-    db.commit()
-    db.refresh(hotel)
+    commit_changes(db, hotel)
     return hotel
 
 
@@ -44,5 +51,5 @@ def delete_hotel(db: Session, hotel_id: int):
     if not hotel:
         return False
     db.delete(hotel)
-    db.commit()
+    commit_changes(db)
     return True
@@ -1,5 +1,8 @@
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload, selectinload
 from app.models.package import BookingPackage, PackagePlace
+from app.core.unit_of_work import commit_changes
 
 
 def get_package_by_id(db: Session, package_id: int):
@@ -27,11 +30,21 @@ def get_all_packages(db: Session, skip: int = 0, limit: int = 100):
         .all()
 
 
+async def get_all_packages_async(db: AsyncSession, skip: int = 0, limit: int = 100):
+    """Get all packages with pagination; places are loaded eagerly since async sessions can't lazy load"""
+    result = await db.execute(
+        select(BookingPackage)
+        .options(selectinload(BookingPackage.package_places))
+        .offset(skip)
+        .limit(limit)
+    )
+    return result.scalars().all()
+
+
 def create_package(db: Session, package_data: BookingPackage):
     """Create a new package"""
     db.add(package_data)
-    db.commit()
-    db.refresh(package_data)
+    commit_changes(db, package_data)
     return package_data
 
 
@@ -43,8 +56,7 @@ def update_package(db: Session, package_id: int, package_data: dict):
     for key, value in package_data.items():
         if value is not None:
             setattr(package, key, value)
-    db.commit()
-    db.refresh(package)
+    commit_changes(db, package)
     return package
 
 
@@ -54,7 +66,7 @@ def delete_package(db: Session, package_id: int):
     if not package:
         return False
     db.delete(package)
-    db.commit()
+    commit_changes(db)
     return True
 
 
@@ -69,8 +81,7 @@ def get_package_places_by_package_id(db: Session, package_id: int):
 def add_place_to_package(db: Session, package_place_data: PackagePlace):
     """Add a place to a package"""
     db.add(package_place_data)
-    db.commit()
-    db.refresh(package_place_data)
+    commit_changes(db, package_place_data)
     return package_place_data
 
 
@@ -82,5 +93,5 @@ def remove_place_from_package(db: Session, package_place_id: int):
     if not package_place:
         return False
     db.delete(package_place)
-    db.commit()
+    commit_changes(db)
     return True
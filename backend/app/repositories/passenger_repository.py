@@ -1,5 +1,7 @@
+from sqlalchemy import select
 from sqlalchemy.orm import Session, joinedload
-from app.models.passenger import Passenger
+from app.models.passenger import EmergencyContact, Passenger
+from app.core.unit_of_work import commit_changes
 
 
 def get_passenger_by_id(db: Session, passenger_id: int):
@@ -56,18 +58,24 @@ def create_passenger(db: Session, passenger_data: dict):
     """Create a new passenger"""
     passenger = Passenger(**passenger_data)
     db.add(passenger)
-    db.commit()
-    db.refresh(passenger)
+    commit_changes(db, passenger)
     return passenger
 
 
 def create_passengers_bulk(db: Session, passengers_data: list[dict]):
-    """Create multiple passengers at once"""
-    passengers = [Passenger(**data) for data in passengers_data]
+    """
+    Create multiple passengers at once; an "emergency_contacts" list of dicts
+    in a passenger's data creates their contacts too. One flush inserts all
+    passengers, then all contacts, as multi-row INSERT ... RETURNING statements.
+    """
+    passengers = []
+    for data in passengers_data:
+        contacts = data.pop("emergency_contacts", None) or []
+        passenger = Passenger(**data)
+        passenger.emergency_contacts = [EmergencyContact(**contact) for contact in contacts]
+        passengers.append(passenger)
     db.add_all(passengers)
-    db.commit()
-    for passenger in passengers:
-        db.refresh(passenger)
+    commit_changes(db, *passengers)
     return passengers
 
 
@@ -81,11 +89,26 @@ def update_passenger(db: Session, passenger_id: int, passenger_data: dict):
         if value is not None and hasattr(passenger, key):
             setattr(passenger, key, value)
     
-    db.commit()
-    db.refresh(passenger)
+    commit_changes(db, passenger)
     return passenger
 
 
+def get_unseated_passengers(db: Session, booking_id: int):
+    """Passengers of a booking without a seat, in creation order"""
+    return db.query(Passenger)\
+        .filter(Passenger.booking_id == booking_id, Passenger.flight_seat_id.is_(None))\
+        .order_by(Passenger.passenger_id)\
+        .all()
+
+
+def assign_seats(db: Session, assignments: list[tuple[Passenger, int]]):
+    """Point each passenger at a flight seat; the flush batches the UPDATEs"""
+    for passenger, flight_seat_id in assignments:
+        passenger.flight_seat_id = flight_seat_id
+    commit_changes(db, *(passenger for passenger, _ in assignments))
+    return [passenger for passenger, _ in assignments]
+
+
 def assign_seat_to_passenger(db: Session, passenger_id: int, flight_seat_id: int):
     """Assign a flight seat to a passenger"""
     return update_passenger(db, passenger_id, {"flight_seat_id": flight_seat_id})
@@ -97,12 +120,18 @@ def delete_passenger(db: Session, passenger_id: int):
     if not passenger:
         return False
     db.delete(passenger)
-    db.commit()
+    commit_changes(db)
     return True
 
 
 def delete_passengers_by_booking(db: Session, booking_id: int):
     """Delete all passengers for a specific booking"""
     count = db.query(Passenger).filter(Passenger.booking_id == booking_id).delete()
-    db.commit()
+    commit_changes(db)
     return count
+
+
+def stream_passengers(db: Session, batch_size: int):
+    """Yield batches of raw passenger rows through a server-side cursor"""
+    statement = select(Passenger.__table__).order_by(Passenger.passenger_id).execution_options(yield_per=batch_size)
+    return db.execute(statement).partitions()
@@ -1,7 +1,12 @@
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.models.booking import Payment
+from app.core.unit_of_work import commit_changes
 
+def get_payment_by_id(db: Session, payment_id: int):
+    return db.query(Payment).filter(Payment.payment_id == payment_id).first()
+    
 def get_payment_by_booking(db: Session, booking_id: int):
     return db.query(Payment).filter(Payment.booking_id == booking_id).first()
     
@@ -12,21 +17,24 @@ def create_payment(db: Session, payment_data: dict):
     """Create a new payment from dictionary data"""
     payment = Payment(**payment_data)
     db.add(payment)
-    db.commit()
-    db.refresh(payment)
+    commit_changes(db, payment)
     return payment
 
 def update_payment_status(db: Session, payment_id: int, status: str):
-    payment = db.query(Payment).filter(Payment.payment_id == payment_id).first()
+    payment = get_payment_by_id(db, payment_id)
     if payment:
         payment.status = status
-        db.commit()
-        db.refresh(payment)
+        commit_changes(db, payment)
     return payment
 
 def delete_payment(db: Session, payment_id: int):
     payment = db.query(Payment).filter(Payment.payment_id == payment_id).first()
     if payment:
         db.delete(payment)
-        db.commit()
+        commit_changes(db)
     return payment
+
+def stream_payments(db: Session, batch_size: int):
+    """Yield batches of raw payment rows through a server-side cursor"""
+    statement = select(Payment.__table__).order_by(Payment.payment_id).execution_options(yield_per=batch_size)
+    return db.execute(statement).partitions()
@@ -1,13 +1,22 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.models.place import Place
+from app.core.unit_of_work import commit_changes
+from app.core.config import DEFAULT_PAGE_SIZE
+from app.core.pagination import Keyset, paginate, paginate_async
 
-def get_places(db: Session):
-    return db.query(Place).all()
+PLACE_KEYSET = Keyset(Place.place_id)
+
+def get_places(db: Session, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE):
+    return paginate(db.query(Place), PLACE_KEYSET, cursor, limit)
+
+async def get_places_async(db: AsyncSession, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE):
+    return await paginate_async(db, select(Place), PLACE_KEYSET, cursor, limit)
 
 def create_place(db: Session, data: Place):
     db.add(data)
-    db.commit()
-    db.refresh(data)
+    commit_changes(db, data)
     return data
 
 def get_place_by_id(db: Session, place_id: int):
@@ -17,6 +26,5 @@ def update_place(db: Session, place_id: int, data: dict):
     place = db.query(Place).filter(Place.place_id == place_id).first()
     for key, value in data.items():
         setattr(place, key, value)
-    db.commit()
-    db.refresh(place)
+    commit_changes(db, place)
     return place
\ No newline at end of file
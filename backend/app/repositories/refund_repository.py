@@ -1,18 +1,88 @@
+from sqlalchemy import func, insert, literal, select, update
 from sqlalchemy.orm import Session
+from app.models.booking import Payment
 from app.models.refund import Refund, CancellationPolicy
 from typing import Optional
 from datetime import datetime
+from app.core.unit_of_work import commit_changes
 
 
 def create_refund(db: Session, refund_data: dict) -> Refund:
     """Create a new refund request"""
     refund = Refund(**refund_data)
     db.add(refund)
-    db.commit()
-    db.refresh(refund)
+    commit_changes(db, refund)
     return refund
 
 
+# Refunds that count towards what a payment has already been given back
+SETTLED_REFUND_STATUSES = ("approved", "completed")
+
+
+def supersede_pending_refunds(db: Session, booking_ids: list[int], processed_by: str, note: str) -> int:
+    """
+    Reject the pending refund requests of the bookings in one UPDATE, so they
+    can't be approved on top of a full refund. Returns the number rejected.
+    """
+    superseded = db.execute(
+        update(Refund)
+        .where(Refund.booking_id.in_(booking_ids), Refund.status == "pending")
+        .values(
+            status="rejected",
+            processed_by=processed_by,
+            processed_at=func.now(),
+            notes=func.concat_ws("\n", Refund.notes, note),
+            version=Refund.version + 1,
+        )
+        .returning(Refund.refund_id)
+        .execution_options(synchronize_session=False)
+    ).all()
+    return len(superseded)
+
+
+def create_full_refunds(db: Session, booking_ids: list[int], reason: str, processed_by: str) -> int:
+    """
+    Bring every successful payment of the bookings up to a 100% refund, in a
+    single INSERT ... SELECT: each gets an approved refund of whatever its
+    approved/completed refunds don't cover yet (the whole amount when there are
+    none; refund_percentage is that share of the payment). Fully refunded
+    payments are skipped, so re-running for the same bookings is harmless.
+    Returns the number of refunds created.
+    """
+    already_refunded = (
+        select(func.coalesce(func.sum(Refund.refund_amount), 0))
+        .where(Refund.payment_id == Payment.payment_id, Refund.status.in_(SETTLED_REFUND_STATUSES))
+        .correlate(Payment)
+        .scalar_subquery()
+    )
+    outstanding = Payment.amount - already_refunded
+    payments = select(
+        Payment.booking_id,
+        Payment.payment_id,
+        outstanding,
+        func.round(outstanding * 100 / Payment.amount, 2),
+        literal(0),
+        literal(reason),
+        literal("approved"),
+        literal(processed_by),
+        literal(processed_by),
+        func.now(),
+    ).where(Payment.booking_id.in_(booking_ids), Payment.status == "success", outstanding > 0)
+    created = db.execute(
+        insert(Refund)
+        .from_select(
+            [
+                Refund.booking_id, Refund.payment_id, Refund.refund_amount, Refund.refund_percentage,
+                Refund.cancellation_fee, Refund.refund_reason, Refund.status, Refund.requested_by,
+                Refund.processed_by, Refund.processed_at,
+            ],
+            payments,
+        )
+        .returning(Refund.refund_id)
+    ).all()
+    return len(created)
+
+
 def get_refund_by_id(db: Session, refund_id: int) -> Optional[Refund]:
     """Get refund by ID"""
     return db.query(Refund).filter(Refund.refund_id == refund_id).first()
@@ -43,8 +113,7 @@ def update_refund_status(db: Session, refund_id: int, status: str, processed_by:
     if status in ["approved", "rejected", "completed"]:
         refund.processed_at = datetime.now()
     
-    db.commit()
-    db.refresh(refund)
+    commit_changes(db, refund)
     return refund
 
 
@@ -58,8 +127,7 @@ def create_cancellation_policy(db: Session, policy_data: dict) -> CancellationPo
     """Create a new cancellation policy"""
     policy = CancellationPolicy(**policy_data)
     db.add(policy)
-    db.commit()
-    db.refresh(policy)
+    commit_changes(db, policy)
     return policy
 
 
@@ -97,6 +165,5 @@ def update_cancellation_policy(db: Session, policy_id: int, policy_data: dict) -
         if hasattr(policy, key):
             setattr(policy, key, value)
     
-    db.commit()
-    db.refresh(policy)
+    commit_changes(db, policy)
     return policy
@@ -3,6 +3,13 @@ from sqlalchemy import func, and_
 from app.models.forecast import RevenueForecast, RevenueMetrics
 from datetime import date
 from typing import Optional
+from app.core.unit_of_work import commit_changes
+from app.core.config import DEFAULT_PAGE_SIZE
+from app.core.pagination import Keyset, paginate
+
+# Newest day first for the full listing, oldest first within a date range
+METRICS_KEYSET_DESC = Keyset(RevenueMetrics.date, RevenueMetrics.metric_id, descending=True)
+METRICS_KEYSET_ASC = Keyset(RevenueMetrics.date, RevenueMetrics.metric_id)
 
 
 # Revenue Forecast Repository
@@ -27,8 +34,7 @@ def get_forecast_by_date(db: Session, forecast_date: date):
     
 def create_forecast(db: Session, data: RevenueForecast):
     db.add(data)
-    db.commit()
-    db.refresh(data)
+    commit_changes(db, data)
     return data
 
 def update_forecast_actual(db: Session, forecast_id: int, actual_revenue: float):
@@ -38,14 +44,13 @@ def update_forecast_actual(db: Session, forecast_id: int, actual_revenue: float)
     ).first()
     if forecast:
         forecast.actual_revenue = actual_revenue
-        db.commit()
-        db.refresh(forecast)
+        commit_changes(db, forecast)
     return forecast
 
 
 # Revenue Metrics Repository
-def get_all_metrics(db: Session):
-    return db.query(RevenueMetrics).order_by(RevenueMetrics.date.desc()).all()
+def get_all_metrics(db: Session, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE):
+    return paginate(db.query(RevenueMetrics), METRICS_KEYSET_DESC, cursor, limit)
 
 def get_metrics_by_date_range(db: Session, start_date: date, end_date: date):
     return db.query(RevenueMetrics).filter(
@@ -55,6 +60,16 @@ def get_metrics_by_date_range(db: Session, start_date: date, end_date: date):
         )
     ).order_by(RevenueMetrics.date).all()
 
+def get_metrics_page_by_date_range(db: Session, start_date: date, end_date: date,
+                                   cursor: str = None, limit: int = DEFAULT_PAGE_SIZE):
+    query = db.query(RevenueMetrics).filter(
+        and_(
+            RevenueMetrics.date >= start_date,
+            RevenueMetrics.date <= end_date
+        )
+    )
+    return paginate(query, METRICS_KEYSET_ASC, cursor, limit)
+
 def get_metric_by_date(db: Session, metric_date: date):
     return db.query(RevenueMetrics).filter(
         RevenueMetrics.date == metric_date
@@ -62,8 +77,7 @@ def get_metric_by_date(db: Session, metric_date: date):
 
 def create_metric(db: Session, data: RevenueMetrics):
     db.add(data)
-    db.commit()
-    db.refresh(data)
+    commit_changes(db, data)
     return data
 
 def update_metric(db: Session, metric_id: int, data: dict):
@@ -74,8 +88,7 @@ def update_metric(db: Session, metric_id: int, data: dict):
         for key, value in data.items():
             if hasattr(metric, key):
                 setattr(metric, key, value)
-        db.commit()
-        db.refresh(metric)
+        commit_changes(db, metric)
     return metric
 
 def get_metrics_summary(db: Session, start_date: Optional[date] = None, end_date: Optional[date] = None):
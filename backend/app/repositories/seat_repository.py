@@ -1,6 +1,9 @@
 from app.models.airplane import Seat
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List
+from app.core.unit_of_work import commit_changes
 
 def get_seat_by_id(db: Session, seat_id: int):
     return db.query(Seat).filter(Seat.seat_id == seat_id).first()
@@ -11,6 +14,15 @@ def get_all_seats(db: Session):
 def get_seats_by_airplane(db: Session, airplane_id: int):
     return db.query(Seat).filter(Seat.airplane_id == airplane_id).all()
 
+async def get_seat_layout_async(db: AsyncSession, airplane_id: int):
+    """(seat_id, seat_number, seat_class) rows of an airplane, ordered by seat_id"""
+    result = await db.execute(
+        select(Seat.seat_id, Seat.seat_number, Seat.seat_class)
+        .where(Seat.airplane_id == airplane_id)
+        .order_by(Seat.seat_id)
+    )
+    return result.all()
+
 def get_seats_by_class(db: Session, airplane_id: int, seat_class: str):
     return db.query(Seat).filter(
         Seat.airplane_id == airplane_id,
@@ -19,8 +31,7 @@ def get_seats_by_class(db: Session, airplane_id: int, seat_class: str):
     
 def create_seat(db: Session, seat_data: Seat):
     db.add(seat_data)
-    db.commit()
-    db.refresh(seat_data)
+    commit_changes(db, seat_data)
     return seat_data
 
 def update_seat(db: Session, seat_id: int, seat_data: dict):
@@ -29,8 +40,7 @@ def update_seat(db: Session, seat_id: int, seat_data: dict):
         return None
     for key, value in seat_data.items():
         setattr(seat, key, value)
-    db.commit()
-    db.refresh(seat)
+    commit_changes(db, seat)
     return seat
     
 def delete_seat(db: Session, seat_id: int):
@@ -38,5 +48,5 @@ def delete_seat(db: Session, seat_id: int):
     if not seat:
         return False
     db.delete(seat)
-    db.commit()
+    commit_changes(db)
     return True
\ No newline at end of file
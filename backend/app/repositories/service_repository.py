@@ -1,5 +1,12 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.models.booking import Service
+from app.core.unit_of_work import commit_changes
+from app.core.config import DEFAULT_PAGE_SIZE
+from app.core.pagination import Keyset, paginate, paginate_async
+
+SERVICE_KEYSET = Keyset(Service.service_id)
 
 
 def get_service_by_id(db: Session, service_id: int):
@@ -7,9 +14,15 @@ def get_service_by_id(db: Session, service_id: int):
     return db.query(Service).filter(Service.service_id == service_id).first()
 
 
-def get_all_services(db: Session, skip: int = 0, limit: int = 100):
-    """Get all services with pagination"""
-    return db.query(Service).offset(skip).limit(limit).all()
+def get_all_services(db: Session, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE, skip: int = 0):
+    """Get all services, one keyset page at a time"""
+    return paginate(db.query(Service), SERVICE_KEYSET, cursor, limit, skip)
+
+
+async def get_all_services_async(db: AsyncSession, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE,
+                                 skip: int = 0):
+    """Get all services, one keyset page at a time"""
+    return await paginate_async(db, select(Service), SERVICE_KEYSET, cursor, limit, skip)
 
 
 def get_services_by_type(db: Session, service_type: str):
@@ -20,8 +33,7 @@ def get_services_by_type(db: Session, service_type: str):
 def create_service(db: Session, service_data: Service):
     """Create a new service"""
     db.add(service_data)
-    db.commit()
-    db.refresh(service_data)
+    commit_changes(db, service_data)
     return service_data
 
 
@@ -33,8 +45,7 @@ def update_service(db: Session, service_id: int, service_data: dict):
     for key, value in service_data.items():
         if value is not None:
             setattr(service, key, value)
-    db.commit()
-    db.refresh(service)
+    commit_changes(db, service)
     return service
 
 
@@ -44,5 +55,5 @@ def delete_service(db: Session, service_id: int):
     if not service:
         return False
     db.delete(service)
-    db.commit()
+    commit_changes(db)
     return True
\ No newline at end of file
@@ -1,5 +1,6 @@
 from sqlalchemy.orm import Session, joinedload
 from app.models.trip import TripPlan, TripPlanItem
+from app.core.unit_of_work import commit_changes
 
 
 # TripPlan operations
@@ -31,8 +32,7 @@ def get_user_trip_plans(db: Session, user_id: str):
 def create_trip_plan(db: Session, trip_plan_data: TripPlan):
     """Create a new trip plan"""
     db.add(trip_plan_data)
-    db.commit()
-    db.refresh(trip_plan_data)
+    commit_changes(db, trip_plan_data)
     return trip_plan_data
 
 
@@ -44,8 +44,7 @@ def update_trip_plan(db: Session, plan_id: int, trip_plan_data: dict):
     for key, value in trip_plan_data.items():
         if value is not None:
             setattr(trip_plan, key, value)
-    db.commit()
-    db.refresh(trip_plan)
+    commit_changes(db, trip_plan)
     return trip_plan
 
 
@@ -55,7 +54,7 @@ def delete_trip_plan(db: Session, plan_id: int):
     if not trip_plan:
         return False
     db.delete(trip_plan)
-    db.commit()
+    commit_changes(db)
     return True
 
 
@@ -77,8 +76,7 @@ def get_trip_plan_items_by_plan(db: Session, plan_id: int):
 def create_trip_plan_item(db: Session, trip_plan_item_data: TripPlanItem):
     """Add an item to a trip plan"""
     db.add(trip_plan_item_data)
-    db.commit()
-    db.refresh(trip_plan_item_data)
+    commit_changes(db, trip_plan_item_data)
     return trip_plan_item_data
 
 
@@ -90,8 +88,7 @@ def update_trip_plan_item(db: Session, plan_item_id: int, trip_plan_item_data: d
     for key, value in trip_plan_item_data.items():
         if value is not None:
             setattr(trip_plan_item, key, value)
-    db.commit()
-    db.refresh(trip_plan_item)
+    commit_changes(db, trip_plan_item)
     return trip_plan_item
 
 
@@ -101,5 +98,5 @@ def delete_trip_plan_item(db: Session, plan_item_id: int):
     if not trip_plan_item:
         return False
     db.delete(trip_plan_item)
-    db.commit()
+    commit_changes(db)
     return True
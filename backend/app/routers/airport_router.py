@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.core.database import get_db
+from app.core.database import get_db, get_async_db
 from app.dependencies import verify_jwt
 from app.schemas.airport_schema import AirportCreate, AirportUpdate, AirportResponse
 from app.services.airport_service import AirportService
@@ -24,57 +25,57 @@ def create_airport(
 
 
 @router.get("/all", response_model=list[AirportResponse])
-def list_airports(
+async def list_airports(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Get all airports with pagination"""
-    return AirportService(db).get_all_airports(skip, limit)
+    return await AirportService(db).get_all_airports_async(skip, limit)
 
 
 @router.get("/iata/{iata_code}", response_model=AirportResponse)
-def get_airport_by_iata(
+async def get_airport_by_iata(
     iata_code: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     payload: dict = Depends(verify_jwt)
 ):
     """Get an airport by IATA code (e.g., JFK, LAX, LHR)"""
     try:
-        return AirportService(db).get_airport_by_iata(iata_code)
+        return await AirportService(db).get_airport_by_iata_async(iata_code)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
 
 @router.get("/city/{city}", response_model=list[AirportResponse])
-def get_airports_by_city(
+async def get_airports_by_city(
     city: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     payload: dict = Depends(verify_jwt)
 ):
     """Get airports filtered by city"""
-    return AirportService(db).get_airports_by_city(city)
+    return await AirportService(db).get_airports_by_city_async(city)
 
 
 @router.get("/country/{country}", response_model=list[AirportResponse])
-def get_airports_by_country(
+async def get_airports_by_country(
     country: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     payload: dict = Depends(verify_jwt)
 ):
     """Get airports filtered by country"""
-    return AirportService(db).get_airports_by_country(country)
+    return await AirportService(db).get_airports_by_country_async(country)
 
 
 @router.get("/{airport_id}", response_model=AirportResponse)
-def get_airport(
+async def get_airport(
     airport_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     payload: dict = Depends(verify_jwt)
 ):
     """Get a specific airport by ID"""
     try:
-        return AirportService(db).get_airport(airport_id)
+        return await AirportService(db).get_airport_async(airport_id)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
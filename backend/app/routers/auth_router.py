@@ -1,29 +1,45 @@
 import uuid
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 import requests
 
-from app.dependencies import verify_jwt, get_mgmt_token
+from app.dependencies import verify_jwt, verify_admin, get_mgmt_token
 from app.core.database import get_db
-from app.core.config import AUTH0_DOMAIN, ROLE_ID_MAP
+from app.core.config import AUTH0_DOMAIN, ROLE_ID_MAP, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.core.pagination import Keyset, paginate, set_next_cursor
+from app.core.token_cache import token_cache
 from app.models.role_request import RoleRequest
 from app.routers.role_request_router import RoleRequestSchema, get_current_user
 
 router = APIRouter(tags=["authentication"])
 
+# Newest requests first; id breaks ties between equal timestamps
+ROLE_REQUEST_KEYSET = Keyset(RoleRequest.created_at, RoleRequest.id, descending=True)
+
 @router.get("/auth")
 def auth_required(payload: dict = Depends(verify_jwt)):
     """Verify JWT token and return user information"""
     return {"user": payload}
 
+@router.get("/auth/token-cache")
+def token_cache_stats(payload: dict = Depends(verify_admin)):
+    """Hit/miss counters of the verified-token cache"""
+    return token_cache.stats()
+
 @router.get("/admin/role-requests")
 def get_role_requests(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     db: Session = Depends(get_db),
     payload: dict = Depends(verify_jwt)
 ):
-    """Get all role requests"""
-    requests_data = db.query(RoleRequest).order_by(RoleRequest.created_at.desc()).all()
+    """Get role requests, newest first, one page at a time"""
+    page = paginate(db.query(RoleRequest), ROLE_REQUEST_KEYSET, cursor, limit)
+    requests_data = set_next_cursor(response, page)
     return {
+        "next_cursor": page.next_cursor,
         "requests": [
             {
                 "id": req.id,
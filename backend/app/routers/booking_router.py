@@ -1,9 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
+from app.core.config import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from app.core.database import get_db
-from app.schemas.booking_schema import BookingCreate, BookingResponse, BookingUpdate, BookingDetailResponse
+from app.core.etag import if_match_version, if_none_match, not_modified, set_version_etag
+from app.core.query_budget import query_budget
+from app.core.pagination import set_next_cursor
+from app.schemas.booking_schema import (
+    BookingCreate, BookingResponse, BookingUpdate, BookingDetailResponse, BookingRecalculateRequest, BookingTotalResponse,
+)
 from app.services.booking_service import BookingService
-from app.dependencies import verify_jwt, get_user_roles
+from app.dependencies import verify_agent_or_admin, verify_jwt, get_user_roles
 
 router = APIRouter(prefix="/bookings", tags=["Bookings"])
 
@@ -41,25 +48,74 @@ def create_booking(
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.post("/recalculate-totals", response_model=list[BookingTotalResponse])
+def recalculate_booking_totals(
+    request: BookingRecalculateRequest,
+    db: Session = Depends(get_db),
+    payload: dict = Depends(verify_agent_or_admin)
+):
+    """Recompute total_amount for many bookings in one statement (e.g. after repricing a flight)"""
+    try:
+        return BookingService(db).recalculate_totals(request.booking_ids, request.flight_id, request.statuses)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.get("/all", response_model=list[BookingResponse])
 def get_all_bookings(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     db: Session = Depends(get_db),
     payload: dict = Depends(verify_jwt)
 ):
-    """Get all bookings"""
-    return BookingService(db).get_all_bookings()
+    """Get all bookings, one page at a time (next cursor in the X-Next-Cursor header)"""
+    return set_next_cursor(response, BookingService(db).get_all_bookings(cursor, limit))
 
 
 @router.get("/{booking_id}", response_model=BookingResponse)
 def get_booking(
     booking_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     payload: dict = Depends(verify_jwt)
 ):
-    """Get a specific booking by ID"""
+    """Get a specific booking by ID (ETag is its version; send it back as If-Match to update)"""
     try:
         booking = BookingService(db).get_booking(booking_id)
-        return booking
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    if if_none_match(request, str(booking.version)):
+        return not_modified(str(booking.version))
+    set_version_etag(response, booking)
+    return booking
+
+
+@router.get("/{booking_id}/detail", response_model=BookingDetailResponse)
+@query_budget(12)
+def get_booking_detail(
+    booking_id: int,
+    db: Session = Depends(get_db),
+    payload: dict = Depends(verify_jwt)
+):
+    """Get a booking with passengers (seat, flight, airports, emergency contacts), services, payments and refunds"""
+    try:
+        return BookingService(db).get_booking_detail(booking_id=booking_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.get("/reference/{booking_reference}/detail", response_model=BookingDetailResponse)
+@query_budget(12)
+def get_booking_detail_by_reference(
+    booking_reference: str,
+    db: Session = Depends(get_db),
+    payload: dict = Depends(verify_jwt)
+):
+    """Get a booking by reference number, with the same graph as /bookings/{booking_id}/detail"""
+    try:
+        return BookingService(db).get_booking_detail(booking_reference=booking_reference)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
@@ -91,28 +147,36 @@ def get_user_bookings(
 def update_booking(
     booking_id: int,
     booking: BookingUpdate,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     payload: dict = Depends(verify_jwt)
 ):
-    """Update booking details"""
+    """Update booking details; with If-Match, only if the booking is still at that version (else 412)"""
     try:
-        return BookingService(db).update_booking(booking_id, booking)
+        updated = BookingService(db).update_booking(booking_id, booking, if_match_version(request))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    set_version_etag(response, updated)
+    return updated
 
 
 @router.put("/{booking_id}/status/{status}", response_model=BookingResponse)
 def update_booking_status(
     booking_id: int,
     status: str,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     payload: dict = Depends(verify_jwt)
 ):
-    """Update booking status (pending, confirmed, cancelled)"""
+    """Update booking status (pending, confirmed, cancelled); honours If-Match like PUT /bookings/{booking_id}"""
     try:
-        return BookingService(db).update_booking_status(booking_id, status)
+        updated = BookingService(db).update_booking_status(booking_id, status, if_match_version(request))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    set_version_etag(response, updated)
+    return updated
 
 
 @router.post("/{booking_id}/confirm", response_model=BookingResponse)
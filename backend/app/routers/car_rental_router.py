@@ -1,6 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.core.database import get_db
+from app.core.config import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.core.database import get_db, get_async_db
+from app.core.pagination import set_next_cursor
 from app.dependencies import verify_jwt
 from app.schemas.car_rental_schema import CarRentalCreate, CarRentalUpdate, CarRentalResponse
 from app.services.car_rental_service import CarRentalService
@@ -22,14 +26,16 @@ def create_car_rental(
 
 
 @router.get("/", response_model=list[CarRentalResponse])
-def list_car_rentals(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=1000),
-    db: Session = Depends(get_db),
+async def list_car_rentals(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    skip: int = Query(0, ge=0, deprecated=True, description="Legacy offset of the first page; use cursor"),
+    db: AsyncSession = Depends(get_async_db),
     payload: dict = Depends(verify_jwt)
 ):
-    """Get all car rentals with pagination"""
-    return CarRentalService(db).get_all_car_rentals(skip, limit)
+    """Get all car rentals, one page at a time (next cursor in the X-Next-Cursor header)"""
+    return set_next_cursor(response, await CarRentalService(db).get_all_car_rentals_async(cursor, limit, skip))
 
 
 @router.get("/available", response_model=list[CarRentalResponse])
@@ -0,0 +1,43 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
+from sqlalchemy.orm import Session
+from app.core.database import get_db
+from app.dependencies import verify_jwt
+from app.schemas.booking_schema import CheckoutRequest, CheckoutResponse
+from app.services.checkout_service import CheckoutConflict, CheckoutService
+
+router = APIRouter(prefix="/checkout", tags=["Checkout"])
+
+
+@router.post("/", response_model=CheckoutResponse)
+def checkout(
+    request: CheckoutRequest,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255),
+    db: Session = Depends(get_db),
+    payload: dict = Depends(verify_jwt)
+):
+    """Create a confirmed, paid booking with its passengers, emergency contacts and seats in one transaction
+
+    - Regular users can only check out for themselves; agents and admins can book for any traveler
+    - Send an `Idempotency-Key` header to make retries safe: a repeated request returns the
+      booking created by the first one, with `Idempotent-Replayed: true`
+    """
+    authenticated_user_id = payload.get("sub")
+    roles = payload.get("http://localhost:8000/roles", [])
+    user_id = request.user_id or authenticated_user_id
+    if user_id != authenticated_user_id and not ("agent" in roles or "admin" in roles):
+        raise HTTPException(
+            status_code=403,
+            detail="You can only check out for yourself. Agents or admins can book for others."
+        )
+
+    try:
+        booking, replayed = CheckoutService(db).checkout(request, user_id, authenticated_user_id, idempotency_key)
+    except CheckoutConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if replayed:
+        response.headers["Idempotent-Replayed"] = "true"
+    return booking
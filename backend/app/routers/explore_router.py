@@ -1,6 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.core.database import get_db
+from app.core.config import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.core.database import get_db, get_async_db
+from app.core.pagination import set_next_cursor
 from app.dependencies import verify_jwt
 from app.schemas.explore_schema import (
     ExploreCreate, ExploreUpdate, ExploreResponse,
@@ -26,21 +30,24 @@ def create_explore(
 
 
 @router.get("/explores", response_model=list[ExploreResponse])
-def list_explores(
-    db: Session = Depends(get_db),
+async def list_explores(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    """Get all explores"""
-    return ExploreService(db).get_all_explores()
+    """Get all explores, one page at a time (next cursor in the X-Next-Cursor header)"""
+    return set_next_cursor(response, await ExploreService(db).get_all_explores_async(cursor, limit))
 
 
 @router.get("/explores/random", response_model=list[ExploreResponse])
-def get_random_explores(
+async def get_random_explores(
     limit: int = 10,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     payload: dict = Depends(verify_jwt)
 ):
     """Get random explores from the database"""
-    return ExploreService(db).get_random_explores(limit)
+    return await ExploreService(db).get_random_explores_async(limit)
 
 
 @router.get("/explores/place/{place_id}", response_model=ExploreResponse)
@@ -101,12 +108,15 @@ def create_place(
 
 
 @router.get("/places", response_model=list[PlaceResponse])
-def list_places(
-    db: Session = Depends(get_db),
+async def list_places(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
     payload: dict = Depends(verify_jwt)
 ):
-    """Get all places"""
-    return PlaceService(db).get_all_places()
+    """Get all places, one page at a time (next cursor in the X-Next-Cursor header)"""
+    return set_next_cursor(response, await PlaceService(db).get_all_places_async(cursor, limit))
 
 
 @router.get("/places/{place_id}", response_model=PlaceResponse)
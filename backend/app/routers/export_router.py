@@ -0,0 +1,33 @@
+from datetime import datetime
+from typing import Literal
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from app.core.database import SessionLocal
+from app.dependencies import verify_agent_or_admin
+from app.services.export_service import ExportService, EXPORT_FORMATS
+
+router = APIRouter(prefix="/exports", tags=["Exports"])
+
+
+def _stream_export(dataset: str, fmt: str):
+    # The response outlives request-scoped dependencies, so the export owns its session
+    db = SessionLocal()
+    try:
+        yield from ExportService(db).export(dataset, fmt)
+    finally:
+        db.close()
+
+
+@router.get("/{dataset}")
+def export_dataset(
+    dataset: Literal["bookings", "passengers", "payments"],
+    format: Literal["ndjson", "csv"] = Query("ndjson"),
+    payload: dict = Depends(verify_agent_or_admin)
+):
+    """Stream a full table as NDJSON or CSV through a server-side cursor"""
+    filename = f"{dataset}-{datetime.now():%Y%m%d-%H%M%S}.{format}"
+    return StreamingResponse(
+        _stream_export(dataset, format),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
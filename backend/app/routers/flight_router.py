@@ -1,10 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.core.database import get_db
-from app.schemas.flight_schema import FlightCreate, FlightResponse
+from app.core.config import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, CONNECTION_MIN_MINUTES, CONNECTION_MAX_MINUTES
+from app.core.database import get_db, get_async_db
+from app.core.pagination import set_next_cursor
+from app.schemas.flight_schema import (
+    FareCalendarDayResponse, FlightCancellationJobResponse, FlightCreate, FlightResponse, FlightSearchResponse,
+    ItineraryResponse,
+)
+from app.schemas.flight_seat_schema import FlightAvailabilityResponse
 from app.services.flight_service import FlightService
-from app.dependencies import verify_jwt
-from typing import List
+from app.services.flight_seat_service import FlightSeatService
+from app.core.query_budget import query_budget
+from app.dependencies import verify_agent_or_admin, verify_jwt
+from datetime import date
+from typing import List, Literal, Optional
 
 router = APIRouter(prefix="/flights", tags=["Flights"])
 
@@ -19,31 +29,163 @@ def create_flight(
 
 
 @router.get("/all", response_model=list[FlightResponse])
-def list_flights(db: Session = Depends(get_db)):
-    return FlightService(db).get_all_flights()
+@query_budget(1)
+async def list_flights(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Flights in departure order, one page at a time (next cursor in the X-Next-Cursor header)"""
+    return set_next_cursor(response, await FlightService(db).get_all_flights_async(cursor, limit))
 
 
-@router.get("/search", response_model=List[FlightResponse])
-def search_flights(
-    origin: str,
-    destination: str,
-    db: Session = Depends(get_db)
+@router.get("/search", response_model=List[FlightSearchResponse])
+@query_budget(2)
+async def search_flights(
+    origin: str = Query(..., min_length=3, max_length=3, description="Origin IATA code"),
+    destination: str = Query(..., min_length=3, max_length=3, description="Destination IATA code"),
+    departure_date: Optional[date] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    passengers: int = Query(1, ge=1, le=9),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
-    Search for flights between an origin and destination.
+    Search for bookable flights between two airports (IATA codes) on a departure
+    date or within a date range (default: the next 30 days) that have at least
+    `passengers` available seats.
     """
-    flights = FlightService(db).search_flights(origin=origin, destination=destination)
-    if not flights:
+    try:
+        results = await FlightService(db).search_flights_async(
+            origin=origin,
+            destination=destination,
+            departure_date=departure_date,
+            date_from=date_from,
+            date_to=date_to,
+            passengers=passengers,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not results:
         raise HTTPException(status_code=404, detail="No flights found for the given route.")
-    return flights
+    return [
+        FlightSearchResponse(**FlightResponse.model_validate(flight).model_dump(), available_seats=available_seats)
+        for flight, available_seats in results
+    ]
+
+
+@router.get("/connections", response_model=List[ItineraryResponse])
+@query_budget(2)
+async def search_connections(
+    origin: str = Query(..., min_length=3, max_length=3, description="Origin IATA code"),
+    destination: str = Query(..., min_length=3, max_length=3, description="Destination IATA code"),
+    departure_date: Optional[date] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    max_stops: int = Query(2, ge=0, le=2),
+    min_connection_minutes: int = Query(CONNECTION_MIN_MINUTES, ge=0),
+    max_connection_minutes: int = Query(CONNECTION_MAX_MINUTES, ge=0),
+    sort_by: Literal["duration", "fare"] = "duration",
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Direct and connecting itineraries (up to two stops) between two airports,
+    ranked by total duration or total fare.
+    """
+    try:
+        return await FlightService(db).search_connections_async(
+            origin=origin,
+            destination=destination,
+            departure_date=departure_date,
+            date_from=date_from,
+            date_to=date_to,
+            max_stops=max_stops,
+            min_connection_minutes=min_connection_minutes,
+            max_connection_minutes=max_connection_minutes,
+            sort_by=sort_by,
+            limit=limit,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/calendar", response_model=List[FareCalendarDayResponse])
+@query_budget(2)
+async def get_fare_calendar(
+    origin: str = Query(..., min_length=3, max_length=3, description="Origin IATA code"),
+    destination: str = Query(..., min_length=3, max_length=3, description="Destination IATA code"),
+    month: str = Query(..., pattern=r"^\d{4}-\d{2}$", description="YYYY-MM"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Lowest available fare for each day of `month` that has a bookable flight on the route"""
+    year, month_number = (int(part) for part in month.split("-"))
+    try:
+        return await FlightService(db).get_fare_calendar_async(origin, destination, year, month_number)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/availability", response_model=List[FlightAvailabilityResponse])
+@query_budget(1)
+async def get_availability_batch(
+    flight_id: List[int] = Query(..., description="Repeat for each flight: ?flight_id=1&flight_id=2"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Seat availability by class and status for up to 100 flights, in request order"""
+    try:
+        return await FlightSeatService(db).get_availability_batch_async(flight_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/disruptions/{job_id}", response_model=FlightCancellationJobResponse)
+def get_cancellation_job(
+    job_id: str,
+    db: Session = Depends(get_db),
+    payload: dict = Depends(verify_agent_or_admin)
+):
+    """Progress of a flight cancellation job"""
+    try:
+        return FlightService(db).get_cancellation_job(job_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
 
 
 @router.get("/{flight_id}", response_model=FlightResponse)
-def get_flight(flight_id: int, db: Session = Depends(get_db)):
-    flight = FlightService(db).get_flight(flight_id)
-    if not flight:
-        raise HTTPException(status_code=404, detail="Flight not found")
-    return flight
+@query_budget(1)
+async def get_flight(flight_id: int, db: AsyncSession = Depends(get_async_db)):
+    try:
+        return await FlightService(db).get_flight_async(flight_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.get("/{flight_id}/availability", response_model=FlightAvailabilityResponse)
+@query_budget(2)
+async def get_availability(flight_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Seat availability by class and status, without loading seat rows"""
+    try:
+        return await FlightSeatService(db).get_availability_async(flight_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.post("/{flight_id}/cancel", response_model=FlightCancellationJobResponse, status_code=202)
+def cancel_flight(
+    flight_id: int,
+    db: Session = Depends(get_db),
+    payload: dict = Depends(verify_agent_or_admin)
+):
+    """
+    Cancel a flight. Its bookings are cancelled, seats freed and payments
+    refunded in full by a background job; poll GET /flights/disruptions/{job_id}.
+    """
+    try:
+        return FlightService(db).cancel_flight(flight_id, payload.get("sub"))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.delete("/{flight_id}")
@@ -1,10 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.core.database import get_db
+from app.core.config import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.core.database import get_db, get_async_db
+from app.core.etag import if_match_version, if_none_match, not_modified, set_etag, set_version_etag
+from app.core.pagination import set_next_cursor
+from app.core.query_budget import query_budget
 from app.dependencies import verify_jwt
 from app.schemas.flight_seat_schema import (
     FlightSeatCreate, FlightSeatUpdate, FlightSeatResponse, 
-    FlightSeatBulkCreate, FlightSeatDetailResponse
+    FlightSeatBulkCreate, FlightSeatDetailResponse, SeatLayoutResponse, SeatMapResponse,
+    SeatHoldCreate, SeatHoldRelease, SeatHoldResponse
 )
 from app.services.flight_seat_service import FlightSeatService
 
@@ -41,15 +48,51 @@ def create_flight_seats_bulk(
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.post("/holds", response_model=SeatHoldResponse)
+def hold_seats(
+    hold: SeatHoldCreate,
+    db: Session = Depends(get_db),
+    payload: dict = Depends(verify_jwt)
+):
+    """
+    Reserve seats for the caller during checkout. Held seats can be booked by
+    the same user until the hold expires, after which they are free again.
+    """
+    try:
+        return FlightSeatService(db).hold_seats(
+            hold.flight_id,
+            payload.get("sub"),
+            flight_seat_ids=hold.flight_seat_ids,
+            seat_class=hold.seat_class,
+            count=hold.count,
+            minutes=hold.minutes,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@router.post("/holds/release")
+def release_seat_holds(
+    release: SeatHoldRelease,
+    db: Session = Depends(get_db),
+    payload: dict = Depends(verify_jwt)
+):
+    """Give back seats the caller holds (e.g. when checkout is abandoned)"""
+    released = FlightSeatService(db).release_holds(payload.get("sub"), release.flight_seat_ids)
+    return {"released": released}
+
+
 @router.get("/", response_model=list[FlightSeatResponse])
 def list_flight_seats(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=1000),
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    skip: int = Query(0, ge=0, deprecated=True, description="Legacy offset of the first page; use cursor"),
     db: Session = Depends(get_db),
     payload: dict = Depends(verify_jwt)
 ):
-    """Get all flight seats with pagination"""
-    return FlightSeatService(db).get_all_flight_seats(skip, limit)
+    """Get all flight seats, one page at a time (next cursor in the X-Next-Cursor header)"""
+    return set_next_cursor(response, FlightSeatService(db).get_all_flight_seats(cursor, limit, skip))
 
 
 @router.get("/flight/{flight_id}", response_model=list[FlightSeatResponse])
@@ -66,18 +109,62 @@ def get_flight_seats_by_flight(
 
 
 @router.get("/flight/{flight_id}/available", response_model=list[FlightSeatResponse])
-def get_available_seats(
+async def get_available_seats(
     flight_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     payload: dict = Depends(verify_jwt)
 ):
     """Get all available seats for a specific flight"""
     try:
-        return FlightSeatService(db).get_available_seats(flight_id)
+        return await FlightSeatService(db).get_available_seats_async(flight_id)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
 
+@router.get("/flight/{flight_id}/seat-map", response_model=SeatMapResponse)
+@query_budget(2)
+async def get_seat_map(
+    flight_id: int,
+    request: Request,
+    response: Response,
+    since: Optional[str] = Query(None, description="Version of the client's copy; only changed positions are returned"),
+    db: AsyncSession = Depends(get_async_db),
+    payload: dict = Depends(verify_jwt)
+):
+    """
+    Compact seat statuses of a flight, aligned with GET /flight-seats/layout/{airplane_id}.
+    The ETag is the status version, so If-None-Match revalidates with a 304.
+    """
+    try:
+        seat_map = await FlightSeatService(db).get_seat_map_async(flight_id, since)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    if if_none_match(request, seat_map["version"]):
+        return not_modified(seat_map["version"])
+    set_etag(response, seat_map["version"])
+    return seat_map
+
+
+@router.get("/layout/{airplane_id}", response_model=SeatLayoutResponse)
+@query_budget(1)
+async def get_seat_layout(
+    airplane_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    payload: dict = Depends(verify_jwt)
+):
+    """Seat numbers and classes of an airplane, in seat map position order"""
+    layout = await FlightSeatService(db).get_seat_layout_async(airplane_id)
+    if not layout.seat_ids:
+        raise HTTPException(status_code=404, detail="Airplane has no seats")
+    cache_control = "private, max-age=300"
+    if if_none_match(request, layout.etag):
+        return not_modified(layout.etag, cache_control)
+    set_etag(response, layout.etag, cache_control)
+    return layout
+
+
 @router.get("/flight/{flight_id}/status/{status}", response_model=list[FlightSeatResponse])
 def get_seats_by_status(
     flight_id: int,
@@ -123,14 +210,18 @@ def get_flight_seat(
 def update_flight_seat(
     flight_seat_id: int,
     flight_seat_data: FlightSeatUpdate,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     payload: dict = Depends(verify_jwt)
 ):
     """Update a flight seat"""
     try:
-        return FlightSeatService(db).update_flight_seat(flight_seat_id, flight_seat_data)
+        flight_seat = FlightSeatService(db).update_flight_seat(flight_seat_id, flight_seat_data, if_match_version(request))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    set_version_etag(response, flight_seat)
+    return flight_seat
 
 
 @router.patch("/{flight_seat_id}/status/{status}")
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.core.database import get_db
+from app.core.database import get_db, get_async_db
 from app.dependencies import verify_jwt
 from app.schemas.hotel_schema import HotelCreate, HotelUpdate, HotelResponse
 from app.services.hotel_service import HotelService
@@ -22,14 +23,14 @@ def create_hotel(
 
 
 @router.get("/", response_model=list[HotelResponse])
-def list_hotels(
+async def list_hotels(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     payload: dict = Depends(verify_jwt)
 ):
     """Get all hotels with pagination"""
-    return HotelService(db).get_all_hotels(skip, limit)
+    return await HotelService(db).get_all_hotels_async(skip, limit)
 
 
 @router.get("/stars/{stars}", response_model=list[HotelResponse])
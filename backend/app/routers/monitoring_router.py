@@ -0,0 +1,49 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+from app.core import metrics
+from app.core.database import get_pool_status
+from app.core.slow_query_log import slow_query_log
+from app.core.token_cache import token_cache
+from app.dependencies import verify_admin
+
+router = APIRouter(tags=["Monitoring"])
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _collect_runtime_metrics():
+    """Copy pool and cache state into the gauges right before a scrape"""
+    pool = get_pool_status()
+    for engine_name, stats in (("sync", pool), ("async", pool["async"])):
+        metrics.db_pool_connections.set(engine_name, "checked_out", value=stats["checked_out"])
+        metrics.db_pool_connections.set(engine_name, "idle", value=stats["idle"])
+        metrics.db_pool_connections.set(engine_name, "overflow", value=stats["overflow"])
+    metrics.db_pool_wait_seconds_total.set(value=pool["wait"]["total_wait_seconds"])
+    metrics.db_pool_timeouts_total.set(value=pool["wait"]["timeouts"])
+    metrics.token_cache_lookups_total.set("hit", value=token_cache.hits)
+    metrics.token_cache_lookups_total.set("miss", value=token_cache.misses)
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def prometheus_metrics():
+    """Request, SQL, pool and cache metrics in the Prometheus text format"""
+    _collect_runtime_metrics()
+    return PlainTextResponse(metrics.registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+@router.get("/monitoring/db-pool")
+def db_pool_status(payload: dict = Depends(verify_admin)):
+    """Live connection pool metrics (checked-out, idle, overflow, wait times)"""
+    return get_pool_status()
+
+
+@router.get("/monitoring/slow-queries")
+def slow_queries(payload: dict = Depends(verify_admin)):
+    """Most recent statements over the slow-query threshold, newest first"""
+    return {**slow_query_log.stats(), "queries": slow_query_log.entries()}
+
+
+@router.delete("/monitoring/slow-queries")
+def clear_slow_queries(payload: dict = Depends(verify_admin)):
+    slow_query_log.clear()
+    return {"message": "Slow-query log cleared"}
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.core.database import get_db
+from app.core.database import get_db, get_async_db
 from app.dependencies import verify_jwt
 from app.schemas.package_schema import (
     PackageCreate, PackageUpdate, PackageResponse, PackageDetailResponse,
@@ -25,14 +26,14 @@ def create_package(
 
 
 @router.get("/", response_model=list[PackageDetailResponse])
-def list_packages(
+async def list_packages(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     payload: dict = Depends(verify_jwt)
 ):
     """Get all packages with pagination"""
-    return PackageService(db).get_all_packages(skip, limit)
+    return await PackageService(db).get_all_packages_async(skip, limit)
 
 
 @router.get("/{package_id}", response_model=PackageDetailResponse)
@@ -1,10 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from app.core.database import get_db
-from app.schemas.passenger_schema import PassengerCreate, PassengerUpdate, PassengerResponse
-from app.services.passenger_service import PassengerService
-from app.dependencies import verify_jwt
-from typing import List
+from app.schemas.passenger_schema import PassengerBulkCreate, PassengerCreate, PassengerUpdate, PassengerResponse
+from app.services.passenger_service import PassengerService, SeatsUnavailable
+from app.dependencies import verify_agent_or_admin, verify_jwt
+from typing import List, Literal, Optional
 
 router = APIRouter(prefix="/passengers", tags=["Passengers"])
 
@@ -17,7 +17,26 @@ def create_passenger(
 ):
     """Create a new passenger for a booking"""
     try:
-        return PassengerService(db).create_passenger(passenger)
+        return PassengerService(db).create_passenger(passenger, payload.get("sub"))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/bulk", response_model=List[PassengerResponse])
+def create_passengers_bulk(
+    passengers: List[PassengerBulkCreate],
+    db: Session = Depends(get_db),
+    payload: dict = Depends(verify_agent_or_admin)
+):
+    """
+    Create a group manifest (up to 500 passengers, with emergency contacts) in
+    one transaction. Requested seats are booked together; if any is taken, or a
+    booking doesn't exist, nothing is created.
+    """
+    try:
+        return PassengerService(db).create_passengers_bulk(passengers, payload.get("sub"))
+    except SeatsUnavailable as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -56,6 +75,21 @@ def get_passengers_by_booking(
     return PassengerService(db).get_passengers_by_booking(booking_id)
 
 
+@router.post("/booking/{booking_id}/auto-assign-seats", response_model=List[PassengerResponse])
+def auto_assign_seats(
+    booking_id: int,
+    flight_id: int = Query(...),
+    seat_class: Optional[Literal["economy", "business", "first"]] = None,
+    db: Session = Depends(get_db),
+    payload: dict = Depends(verify_jwt)
+):
+    """Seat all unseated passengers of a booking together, in one transaction"""
+    try:
+        return PassengerService(db).auto_assign_seats(booking_id, flight_id, seat_class, payload.get("sub"))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.get("/booking/{booking_id}/type/{passenger_type}", response_model=List[PassengerResponse])
 def get_passengers_by_type(
     booking_id: int,
@@ -76,7 +110,7 @@ def update_passenger(
 ):
     """Update passenger details"""
     try:
-        return PassengerService(db).update_passenger(passenger_id, passenger)
+        return PassengerService(db).update_passenger(passenger_id, passenger, payload.get("sub"))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -90,7 +124,22 @@ def assign_seat_to_passenger(
 ):
     """Assign a flight seat to a passenger"""
     try:
-        return PassengerService(db).assign_seat(passenger_id, flight_seat_id)
+        return PassengerService(db).assign_seat(passenger_id, flight_seat_id, payload.get("sub"))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.put("/{passenger_id}/assign-seat", response_model=PassengerResponse)
+def assign_any_seat_to_passenger(
+    passenger_id: int,
+    flight_id: int = Query(...),
+    seat_class: Optional[Literal["economy", "business", "first"]] = None,
+    db: Session = Depends(get_db),
+    payload: dict = Depends(verify_jwt)
+):
+    """Assign the first free seat of a flight, optionally in a given class"""
+    try:
+        return PassengerService(db).assign_any_seat(passenger_id, flight_id, seat_class)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
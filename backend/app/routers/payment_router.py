@@ -1,6 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
+from app.core.concurrency import PreconditionFailed, VersionConflict
 from app.core.database import get_db
+from app.core.etag import if_match_version, set_version_etag
 from app.schemas.payment_schema import PaymentCreate, PaymentResponse
 from app.services.payment_service import PaymentService
 from app.dependencies import verify_jwt
@@ -38,12 +40,18 @@ def read_payment_by_booking(booking_id: int, db: Session = Depends(get_db), payl
 def update_payment_status(
     payment_id: int, 
     status: str, 
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     payload: dict = Depends(verify_jwt)
 ):
     try:
-        return PaymentService(db).update_payment_status(payment_id, status)
+        payment = PaymentService(db).update_payment_status(payment_id, status, if_match_version(request))
+        set_version_etag(response, payment)
+        return payment
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
+    except (PreconditionFailed, VersionConflict):
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error updating payment status: {str(e)}")
\ No newline at end of file
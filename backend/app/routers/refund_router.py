@@ -1,6 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 from app.core.database import get_db
+from app.core.etag import if_match_version, set_version_etag
 from app.schemas.refund_schema import (
     RefundCreate, 
     RefundResponse, 
@@ -123,10 +124,12 @@ def get_refund(
 def process_refund(
     refund_id: int,
     status_update: RefundStatusUpdate,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     payload: dict = Depends(verify_jwt)
 ):
-    """Process a refund request (approve/reject/complete) - Admin/Agent only"""
+    """Process a refund request (approve/reject/complete) - Admin/Agent only; honours If-Match"""
     roles = payload.get("http://localhost:8000/roles", [])
     is_admin_or_agent = "admin" in roles or "agent" in roles
     
@@ -138,14 +141,17 @@ def process_refund(
     
     try:
         processed_by = payload.get("sub")
-        return RefundService(db).process_refund(
+        refund = RefundService(db).process_refund(
             refund_id, 
             status_update.status, 
             processed_by,
-            status_update.notes
+            status_update.notes,
+            if_match_version(request)
         )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    set_version_etag(response, refund)
+    return refund
 
 
 # Cancellation Policy Endpoints
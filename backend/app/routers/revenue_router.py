@@ -1,6 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
+from app.core.config import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from app.core.database import get_db
+from app.core.pagination import set_next_cursor
 from app.dependencies import verify_jwt, verify_admin
 from app.schemas.revenue_schema import (
     RevenueForecastCreate, 
@@ -117,16 +119,21 @@ def create_metric(
 
 @router.get("/metrics", response_model=list[RevenueMetricsResponse])
 def get_metrics(
+    response: Response,
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     db: Session = Depends(get_db),
     payload: dict = Depends(verify_admin)
 ):
-    """Get revenue metrics, optionally filtered by date range"""
+    """Get revenue metrics, optionally filtered by date range, one page at a time"""
     service = RevenueService(db)
     if start_date and end_date:
-        return service.get_metrics_by_date_range(start_date, end_date)
-    return service.get_all_metrics()
+        page = service.get_metrics_page_by_date_range(start_date, end_date, cursor, limit)
+    else:
+        page = service.get_all_metrics(cursor, limit)
+    return set_next_cursor(response, page)
 
 
 @router.post("/metrics/collect/{target_date}", response_model=RevenueMetricsResponse)
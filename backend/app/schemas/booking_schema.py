@@ -1,7 +1,17 @@
-from pydantic import BaseModel
-from typing import Optional, List
-from datetime import datetime
+from pydantic import BaseModel, Field
+from typing import Literal, Optional, List
+from datetime import date, datetime
 from decimal import Decimal
+from app.schemas.airport_schema import AirportResponse
+from app.schemas.booking_service_schema import BookingServiceResponse
+from app.schemas.emergency_contact_schema import EmergencyContactResponse, NewPassengerEmergencyContact
+from app.schemas.flight_schema import FlightResponse
+from app.schemas.flight_seat_schema import FlightSeatResponse
+from app.schemas.passenger_schema import PassengerResponse, PassengerType
+from app.schemas.payment_schema import PaymentResponse
+from app.schemas.refund_schema import RefundResponse
+from app.schemas.seat_schema import SeatResponse
+from app.schemas.service_schema import ServiceResponse
 
 
 class BookingCreate(BaseModel):
@@ -24,16 +34,86 @@ class BookingResponse(BaseModel):
     status: str
     total_amount: Optional[Decimal] = None
     notes: Optional[str] = None
+    version: Optional[int] = None
 
     class Config:
         from_attributes = True
 
 
+class BookingRecalculateRequest(BaseModel):
+    """Bookings to reprice: the listed ones and/or every booking on a flight"""
+    booking_ids: Optional[List[int]] = Field(None, max_length=1000)
+    flight_id: Optional[int] = None
+    statuses: Optional[List[str]] = None
+
+
+class BookingTotalResponse(BaseModel):
+    booking_id: int
+    total_amount: Optional[Decimal] = None
+
+    class Config:
+        from_attributes = True
+
+
+class BookingFlightResponse(FlightResponse):
+    origin_airport: AirportResponse
+    destination_airport: AirportResponse
+
+
+class BookingFlightSeatResponse(FlightSeatResponse):
+    seat: SeatResponse
+    flight: BookingFlightResponse
+
+
+class BookingPassengerResponse(PassengerResponse):
+    flight_seat: Optional[BookingFlightSeatResponse] = None
+    emergency_contacts: List[EmergencyContactResponse] = []
+
+
+class BookingServiceDetailResponse(BookingServiceResponse):
+    service: ServiceResponse
+
+
 class BookingDetailResponse(BookingResponse):
-    """Extended booking response with passengers and payments"""
-    passengers: Optional[List] = []
-    payments: Optional[List] = []
-    booking_services: Optional[List] = []
+    """Extended booking response with the whole booking graph"""
+    passengers: List[BookingPassengerResponse] = []
+    payments: List[PaymentResponse] = []
+    refunds: List[RefundResponse] = []
+    booking_services: List[BookingServiceDetailResponse] = []
+
+    class Config:
+        from_attributes = True
+
+
+class CheckoutPassenger(BaseModel):
+    passenger_type: PassengerType
+    first_name: str
+    middle_name: Optional[str] = None
+    last_name: str
+    suffix: Optional[str] = None
+    date_of_birth: date
+    email: Optional[str] = None
+    phone_number: Optional[str] = None
+    redress_number: Optional[str] = None
+    known_traveler_number: Optional[str] = None
+    flight_seat_id: Optional[int] = None  # None: seated together with the other unseated passengers
+    special_requests: Optional[str] = None
+    emergency_contacts: List[NewPassengerEmergencyContact] = []
+
+
+class CheckoutRequest(BaseModel):
+    """Everything needed to book a flight in one call"""
+    user_id: Optional[str] = None  # Defaults to the caller; agents and admins may book for others
+    flight_id: int
+    seat_class: Optional[Literal["economy", "business", "first"]] = None
+    passengers: List[CheckoutPassenger] = Field(..., min_length=1, max_length=9)
+    payment_method: str = "credit_card"
+    notes: Optional[str] = None
+
+
+class CheckoutResponse(BookingResponse):
+    passengers: List[PassengerResponse] = []
+    payments: List[PaymentResponse] = []
 
     class Config:
         from_attributes = True
@@ -12,6 +12,15 @@ class EmergencyContactCreate(BaseModel):
     relationship_type: Optional[str] = None  # spouse, parent, sibling, friend, etc.
 
 
+class NewPassengerEmergencyContact(BaseModel):
+    """Emergency contact sent together with a passenger that doesn't exist yet"""
+    first_name: str
+    last_name: str
+    email: Optional[str] = None
+    phone_number: str
+    relationship_type: Optional[str] = None
+
+
 class EmergencyContactUpdate(BaseModel):
     first_name: Optional[str] = None
     last_name: Optional[str] = None
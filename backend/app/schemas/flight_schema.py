@@ -1,8 +1,8 @@
 # app/schemas/flight.py
 from pydantic import BaseModel
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
-from typing import Optional
+from typing import List, Optional
 
 class FlightCreate(BaseModel):
     flight_number: str
@@ -29,3 +29,50 @@ class FlightResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+class FlightSearchResponse(FlightResponse):
+    available_seats: int
+
+class ItineraryLegResponse(BaseModel):
+    flight_id: int
+    flight_number: str
+    origin_airport_id: int
+    destination_airport_id: int
+    departure_time: datetime
+    arrival_time: datetime
+    fare: Decimal
+
+    class Config:
+        from_attributes = True
+
+class ItineraryResponse(BaseModel):
+    legs: List[ItineraryLegResponse]
+    stops: int
+    departure_time: datetime
+    arrival_time: datetime
+    total_duration_minutes: int
+    total_fare: Decimal
+
+    class Config:
+        from_attributes = True
+
+class FareCalendarDayResponse(BaseModel):
+    date: date
+    lowest_fare: Optional[Decimal] = None  # None when every flight that day is sold out
+    flight_count: int  # flights with at least one free seat
+
+class FlightCancellationJobResponse(BaseModel):
+    job_id: str
+    flight_id: int
+    status: str
+    progress: float
+    total_bookings: Optional[int] = None
+    bookings_cancelled: int
+    seats_released: int
+    refunds_created: int
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+
+    class Config:
+        from_attributes = True
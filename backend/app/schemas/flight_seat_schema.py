@@ -1,5 +1,7 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from app.core.config import SEAT_HOLD_MINUTES, SEAT_HOLD_MAX_MINUTES
+from typing import List, Optional, Tuple
+from datetime import datetime
 from decimal import Decimal
 from enum import Enum
 
@@ -39,6 +41,8 @@ class FlightSeatResponse(BaseModel):
     seat_id: int
     status: str
     price_multiplier: Decimal
+    hold_expires_at: Optional[datetime] = None
+    version: Optional[int] = None
 
     class Config:
         from_attributes = True
@@ -56,3 +60,73 @@ class FlightSeatDetailResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class SeatHoldCreate(BaseModel):
+    """Schema for holding seats during checkout: explicit seats, or `count` seats of a class"""
+    flight_id: int
+    flight_seat_ids: Optional[list[int]] = Field(None, max_length=9)
+    seat_class: Optional[str] = Field(None, pattern="^(economy|business|first)$")
+    count: int = Field(default=1, ge=1, le=9)
+    minutes: int = Field(default=SEAT_HOLD_MINUTES, ge=1, le=SEAT_HOLD_MAX_MINUTES)
+
+
+class SeatHoldRelease(BaseModel):
+    """Schema for releasing held seats"""
+    flight_seat_ids: list[int] = Field(..., min_length=1)
+
+
+class SeatHoldResponse(BaseModel):
+    """Schema for a seat hold; the seats are free again after expires_at"""
+    flight_id: int
+    flight_seat_ids: list[int]
+    expires_at: datetime
+
+
+class SeatClassAvailability(BaseModel):
+    """Seat counts for one seat class of a flight"""
+    seat_class: Optional[str] = None
+    total: int
+    available: int
+    reserved: int
+    booked: int
+    min_price_multiplier: Optional[Decimal] = None  # over available seats only
+    max_price_multiplier: Optional[Decimal] = None
+
+
+class FlightAvailabilityResponse(BaseModel):
+    """Schema for a flight's seat availability summary"""
+    flight_id: int
+    total_seats: int
+    available_seats: int
+    classes: List[SeatClassAvailability]
+
+
+class SeatLayoutResponse(BaseModel):
+    """Seats of an airplane as parallel arrays, ordered by seat_id"""
+    airplane_id: int
+    etag: str
+    seat_ids: List[int]
+    seat_numbers: List[str]
+    seat_classes: List[Optional[str]]
+
+    class Config:
+        from_attributes = True
+
+
+class SeatMapResponse(BaseModel):
+    """
+    Seat statuses of a flight, by position in the airplane's layout:
+    0 = not sold on this flight, 1 = available, 2 = reserved, 3 = booked.
+
+    `statuses` packs 2 bits per seat (4 per byte, lowest bits first) in base64.
+    When the request's `since` version was known, `changes` lists
+    [position, status] pairs instead and `statuses` is omitted.
+    """
+    flight_id: int
+    airplane_id: int
+    layout_etag: str
+    version: str
+    statuses: Optional[str] = None
+    since: Optional[str] = None
+    changes: Optional[List[Tuple[int, int]]] = None
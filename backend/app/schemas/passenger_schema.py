@@ -1,7 +1,8 @@
 from pydantic import BaseModel, EmailStr
-from typing import Optional
+from typing import List, Optional
 from datetime import date, datetime
 from enum import Enum
+from app.schemas.emergency_contact_schema import NewPassengerEmergencyContact
 
 
 class PassengerType(str, Enum):
@@ -36,6 +37,11 @@ class PassengerCreate(BaseModel):
     special_requests: Optional[str] = None
 
 
+class PassengerBulkCreate(PassengerCreate):
+    """One manifest entry: a passenger and their emergency contacts"""
+    emergency_contacts: List[NewPassengerEmergencyContact] = []
+
+
 class PassengerUpdate(BaseModel):
     passenger_type: Optional[PassengerType] = None
     first_name: Optional[str] = None
@@ -16,6 +16,7 @@ class PaymentResponse(BaseModel):
     payment_date: Optional[datetime] = None
     method: Optional[str] = None
     status: str
+    version: Optional[int] = None
 
     class Config:
         from_attributes = True
@@ -26,6 +26,7 @@ class RefundResponse(BaseModel):
     requested_at: Optional[datetime] = None
     processed_at: Optional[datetime] = None
     notes: Optional[str] = None
+    version: Optional[int] = None
 
     class Config:
         from_attributes = True
@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 from app.models.airplane import Airplane
 from app.repositories import airplane_repository
 from app.schemas.airplane_schema import AirplaneCreate
+from app.services.seat_map import seat_layouts
 
 class AirplaneService:
     def __init__(self, db: Session):
@@ -43,4 +44,6 @@ class AirplaneService:
         if not existing_airplane:
             raise ValueError("Airplane not found")
         
-        return airplane_repository.delete_airplane(self.db, airplane_id)
+        deleted = airplane_repository.delete_airplane(self.db, airplane_id)
+        seat_layouts.invalidate(airplane_id)
+        return deleted
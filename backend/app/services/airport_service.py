@@ -1,11 +1,13 @@
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from app.core.airport_cache import airport_codes
 from app.models.airport import Airport
 from app.repositories import aiport_repository
 from app.schemas.airport_schema import AirportCreate, AirportUpdate
 
 
 class AirportService:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session | AsyncSession):
         self.db = db
 
     def get_airport(self, airport_id: int):
@@ -37,6 +39,35 @@ class AirportService:
         """Get airports filtered by country"""
         return aiport_repository.get_airports_by_country(self.db, country)
 
+    async def get_airport_async(self, airport_id: int):
+        """Get an airport by ID (async session)"""
+        airport = await aiport_repository.get_airport_by_id_async(self.db, airport_id)
+        if not airport:
+            raise ValueError("Airport not found")
+        return airport
+
+    async def get_airport_by_iata_async(self, iata_code: str):
+        """Get an airport by IATA code (async session)"""
+        if len(iata_code) != 3:
+            raise ValueError("IATA code must be exactly 3 characters")
+        
+        airport = await aiport_repository.get_airport_by_iata_code_async(self.db, iata_code)
+        if not airport:
+            raise ValueError(f"Airport with IATA code '{iata_code.upper()}' not found")
+        return airport
+
+    async def get_all_airports_async(self, skip: int = 0, limit: int = 100):
+        """Get all airports (async session)"""
+        return await aiport_repository.get_all_airports_async(self.db, skip, limit)
+
+    async def get_airports_by_city_async(self, city: str):
+        """Get airports filtered by city (async session)"""
+        return await aiport_repository.get_airports_by_city_async(self.db, city)
+
+    async def get_airports_by_country_async(self, country: str):
+        """Get airports filtered by country (async session)"""
+        return await aiport_repository.get_airports_by_country_async(self.db, country)
+
     def create_airport(self, airport_data: AirportCreate):
         """Create a new airport"""
         # Check if IATA code already exists
@@ -49,7 +80,9 @@ class AirportService:
         airport_dict['iata_code'] = airport_dict['iata_code'].upper()
         
         airport = Airport(**airport_dict)
-        return aiport_repository.create_airport(self.db, airport)
+        airport = aiport_repository.create_airport(self.db, airport)
+        airport_codes.invalidate()
+        return airport
 
     def update_airport(self, airport_id: int, airport_data: AirportUpdate):
         """Update an existing airport"""
@@ -66,7 +99,9 @@ class AirportService:
             if existing_iata and existing_iata.airport_id != airport_id:
                 raise ValueError(f"Airport with IATA code '{update_dict['iata_code']}' already exists")
         
-        return aiport_repository.update_airport(self.db, airport_id, update_dict)
+        airport = aiport_repository.update_airport(self.db, airport_id, update_dict)
+        airport_codes.invalidate()
+        return airport
 
     def delete_airport(self, airport_id: int):
         """Delete an airport"""
@@ -74,4 +109,6 @@ class AirportService:
         if not existing_airport:
             raise ValueError("Airport not found")
         
-        return aiport_repository.delete_airport(self.db, airport_id)
+        deleted = aiport_repository.delete_airport(self.db, airport_id)
+        airport_codes.invalidate()
+        return deleted
@@ -0,0 +1,62 @@
+"""
+Booking references without collision checks.
+
+A reference (AAA999AAA, 26^6 * 1000 ~ 3.1e11 values) is a keyed permutation of
+a counter, so distinct counters always give distinct references and no lookup
+is needed:
+
+- counters come from the `booking_reference_seq` Postgres sequence, which
+  hands out blocks of BOOKING_REFERENCE_SEQUENCE.increment values; a process
+  calls nextval once per block, not once per booking;
+- a 4-round Feistel network over 40 bits, keyed with BOOKING_REFERENCE_KEY,
+  scrambles the counter (cycle-walking back into range), so consecutive
+  bookings get unrelated-looking references that can't be enumerated;
+- the result is written in the existing alphabet and layout.
+
+The permutation and formatting are in app/services/reference_codes.py.
+
+BOOKING_REFERENCE_KEY must be secret, so it has no default and the app does not
+start without it (the lifespan builds the generator, which checks the key):
+whoever knows the key can compute every past and future reference from the
+sequence. It must also never change once references have
+been issued: a different key is a different permutation and could repeat an
+old reference.
+References created before this scheme were random; the unique constraint on
+bookings.booking_reference still guards against the (n / 3.1e11) chance of
+meeting one of them.
+"""
+
+import threading
+from typing import Callable, Optional
+
+from app.core.config import BOOKING_REFERENCE_KEY
+from app.models.booking import BOOKING_REFERENCE_SEQUENCE
+from app.services.reference_codes import BookingReferenceGenerator
+
+
+class ConfiguredBookingReferences:
+    """The process-wide generator, keyed with BOOKING_REFERENCE_KEY when first used"""
+
+    def __init__(self):
+        self._generator: Optional[BookingReferenceGenerator] = None
+        self._lock = threading.Lock()
+
+    def generator(self) -> BookingReferenceGenerator:
+        if self._generator is None:
+            with self._lock:
+                if self._generator is None:
+                    if not BOOKING_REFERENCE_KEY:
+                        raise RuntimeError(
+                            "BOOKING_REFERENCE_KEY is not set. Generate a secret once per environment, e.g. "
+                            "python -c 'import secrets; print(secrets.token_urlsafe(32))', and keep it forever."
+                        )
+                    self._generator = BookingReferenceGenerator(
+                        BOOKING_REFERENCE_KEY.encode(), BOOKING_REFERENCE_SEQUENCE.increment
+                    )
+        return self._generator
+
+    def next_reference(self, next_block: Callable[[], int]) -> str:
+        return self.generator().next_reference(next_block)
+
+
+booking_references = ConfiguredBookingReferences()
@@ -1,12 +1,15 @@
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.models.car_rental import CarRental
 from app.repositories import car_rental_repository
 from app.schemas.car_rental_schema import CarRentalCreate, CarRentalUpdate
 from app.factories import get_service_factory
+from app.core.unit_of_work import commit_changes
+from app.core.config import DEFAULT_PAGE_SIZE
 
 
 class CarRentalService:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session | AsyncSession):
         self.db = db
 
     def get_car_rental(self, car_rental_id: int):
@@ -16,9 +19,13 @@ class CarRentalService:
             raise ValueError("Car rental not found")
         return car_rental
 
-    def get_all_car_rentals(self, skip: int = 0, limit: int = 100):
-        """Get all car rentals"""
-        return car_rental_repository.get_all_car_rentals(self.db, skip, limit)
+    def get_all_car_rentals(self, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE, skip: int = 0):
+        """Get one page of car rentals"""
+        return car_rental_repository.get_all_car_rentals(self.db, cursor, limit, skip)
+
+    async def get_all_car_rentals_async(self, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE, skip: int = 0):
+        """Get one page of car rentals (async session)"""
+        return await car_rental_repository.get_all_car_rentals_async(self.db, cursor, limit, skip)
 
     def get_available_car_rentals(self):
         """Get all available car rentals"""
@@ -63,9 +70,7 @@ class CarRentalService:
                     "available": available
                 }
             )
-            self.db.commit()
-            self.db.refresh(service)
-            self.db.refresh(car_rental)
+            commit_changes(self.db, service, car_rental)
             return service, car_rental
         except Exception as e:
             self.db.rollback()
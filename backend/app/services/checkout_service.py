@@ -0,0 +1,121 @@
+import hashlib
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy.orm import Session
+
+from app.core.unit_of_work import commit_changes, unit_of_work
+from app.models.booking import Booking, Payment
+from app.models.passenger import EmergencyContact, Passenger
+from app.repositories import booking_repository, flight_repository, flight_seat_repository
+from app.repositories.flight_repository import BOOKABLE_STATUSES
+from app.schemas.booking_schema import CheckoutRequest
+from app.services.booking_reference import booking_references
+from app.services.group_seating import FreeSeat, choose_group_seats, parse_seat_number
+
+
+class CheckoutConflict(ValueError):
+    """The request can't be completed as sent: seats taken, or an idempotency key reused"""
+
+
+class CheckoutService:
+    """
+    Booking, passengers, emergency contacts, seats and payment in one
+    transaction: either the traveler ends up with a confirmed, paid booking
+    or nothing is written at all.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def checkout(self, request: CheckoutRequest, user_id: str, caller_id: str, idempotency_key: str = None):
+        """
+        Book for `user_id` on behalf of `caller_id` (the same person unless an
+        agent is booking); seats the caller holds can be used.
+
+        Returns (booking, replayed). With an idempotency key, a repeated request
+        from the same caller returns the booking of the first one (replayed=True)
+        instead of booking again.
+        """
+        with unit_of_work(self.db):
+            if idempotency_key:
+                request_hash = hashlib.sha256(request.model_dump_json().encode()).hexdigest()
+                previous = booking_repository.reserve_idempotency_key(self.db, caller_id, idempotency_key, request_hash)
+                if previous is not None:
+                    if previous.request_hash != request_hash:
+                        raise CheckoutConflict("Idempotency-Key was already used for a different checkout")
+                    if previous.booking_id is None:
+                        raise CheckoutConflict("A checkout with this Idempotency-Key did not complete")
+                    return booking_repository.get_booking_by_id(self.db, previous.booking_id), True
+
+            flight = flight_repository.get_flight_by_id(self.db, request.flight_id)
+            if not flight:
+                raise ValueError("Flight not found")
+            if flight.status not in BOOKABLE_STATUSES:
+                raise ValueError(f"Flight is {flight.status} and can't be booked")
+
+            seat_ids = self._choose_seats(request)
+            claimed = flight_seat_repository.claim_flight_seats(self.db, request.flight_id, seat_ids, caller_id)
+            if len(claimed) < len(seat_ids):
+                taken = sorted(set(seat_ids) - {row.flight_seat_id for row in claimed})
+                raise CheckoutConflict(f"Seats no longer available: {', '.join(map(str, taken))}")
+
+            fare = Decimal(flight.base_price) * (1 + Decimal(flight.tax_rate or 0))
+            total_amount = sum((fare * row.price_multiplier for row in claimed), Decimal("0")).quantize(Decimal("0.01"))
+
+            booking = Booking(
+                user_id=user_id,
+                booking_reference=booking_references.next_reference(
+                    lambda: booking_repository.next_booking_reference_block(self.db)
+                ),
+                booking_date=datetime.now(),
+                status="confirmed",
+                total_amount=total_amount,
+                notes=request.notes,
+            )
+            for passenger_data, flight_seat_id in zip(request.passengers, seat_ids):
+                passenger = Passenger(
+                    **passenger_data.model_dump(exclude={"flight_seat_id", "emergency_contacts"}),
+                    flight_seat_id=flight_seat_id,
+                )
+                passenger.emergency_contacts = [
+                    EmergencyContact(**contact.model_dump()) for contact in passenger_data.emergency_contacts
+                ]
+                booking.passengers.append(passenger)
+            booking.payments.append(Payment(
+                amount=total_amount,
+                payment_date=datetime.now(),
+                method=request.payment_method,
+                status="success",
+            ))
+            # One flush: the booking, then every passenger and every contact as
+            # multi-row INSERT ... RETURNING statements, then the payment
+            self.db.add(booking)
+            commit_changes(self.db, booking)
+
+            if idempotency_key:
+                booking_repository.complete_idempotency_key(self.db, caller_id, idempotency_key, booking.booking_id)
+            return booking, False
+
+    def _choose_seats(self, request: CheckoutRequest) -> list[int]:
+        """One flight_seat_id per passenger: the requested ones, the rest seated together"""
+        requested = [p.flight_seat_id for p in request.passengers if p.flight_seat_id]
+        if len(set(requested)) < len(requested):
+            raise ValueError("The same seat was requested for two passengers")
+
+        unseated = len(request.passengers) - len(requested)
+        chosen = iter([])
+        if unseated:
+            free_seats = []
+            for flight_seat_id, seat_number in flight_seat_repository.get_free_seat_numbers(
+                self.db, request.flight_id, request.seat_class
+            ):
+                parsed = parse_seat_number(seat_number)
+                if parsed is not None and flight_seat_id not in requested:
+                    free_seats.append(FreeSeat(flight_seat_id, *parsed))
+            group = choose_group_seats(free_seats, unseated)
+            if group is None:
+                raise CheckoutConflict(f"Not enough free seats for {unseated} passengers")
+            chosen = iter(group)
+
+        return [p.flight_seat_id or next(chosen) for p in request.passengers]
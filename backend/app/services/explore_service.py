@@ -1,21 +1,31 @@
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.models.place import Explore, Place
 from app.repositories import explore_repository, place_repository
 from app.schemas.explore_schema import ExploreCreate, ExploreUpdate
+from app.core.config import DEFAULT_PAGE_SIZE
 
 
 class ExploreService:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session | AsyncSession):
         self.db = db
 
-    def get_all_explores(self):
-        """Get all explores"""
-        return explore_repository.get_explores(self.db)
+    def get_all_explores(self, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE):
+        """Get one page of explores"""
+        return explore_repository.get_explores(self.db, cursor, limit)
 
     def get_random_explores(self, limit: int = 10):
         """Get random explores"""
         return explore_repository.get_random_explores(self.db, limit)
 
+    async def get_all_explores_async(self, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE):
+        """Get one page of explores (async session)"""
+        return await explore_repository.get_explores_async(self.db, cursor, limit)
+
+    async def get_random_explores_async(self, limit: int = 10):
+        """Get random explores (async session)"""
+        return await explore_repository.get_random_explores_async(self.db, limit)
+
     def get_explores_by_place(self, place_id: int):
         """Get explores filtered by place"""
         return explore_repository.get_explores_by_place(self.db, place_id)
@@ -37,12 +47,16 @@ class ExploreService:
 
 
 class PlaceService:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session | AsyncSession):
         self.db = db
 
-    def get_all_places(self):
-        """Get all places"""
-        return place_repository.get_places(self.db)
+    def get_all_places(self, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE):
+        """Get one page of places"""
+        return place_repository.get_places(self.db, cursor, limit)
+
+    async def get_all_places_async(self, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE):
+        """Get one page of places (async session)"""
+        return await place_repository.get_places_async(self.db, cursor, limit)
 
     def get_place(self, place_id: int):
         """Get a place by ID"""
@@ -0,0 +1,82 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Iterator
+
+from sqlalchemy.orm import Session
+
+from app.core.config import EXPORT_BATCH_SIZE
+from app.models.booking import Booking, Payment
+from app.models.passenger import Passenger
+from app.repositories import booking_repository, passenger_repository, payment_repository
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+# dataset -> (table whose columns are exported, repository streaming function)
+EXPORT_DATASETS = {
+    "bookings": (Booking.__table__, booking_repository.stream_bookings),
+    "passengers": (Passenger.__table__, passenger_repository.stream_passengers),
+    "payments": (Payment.__table__, payment_repository.stream_payments),
+}
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _csv_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+class ExportService:
+    """Row-by-row exports that never hold more than one batch in memory"""
+
+    def __init__(self, db: Session, batch_size: int = EXPORT_BATCH_SIZE):
+        self.db = db
+        self.batch_size = batch_size
+
+    def export(self, dataset: str, fmt: str) -> Iterator[str]:
+        """Yield the dataset as NDJSON or CSV text chunks, one chunk per batch"""
+        if dataset not in EXPORT_DATASETS:
+            raise ValueError(f"Unknown export dataset '{dataset}'")
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format '{fmt}'")
+
+        table, stream = EXPORT_DATASETS[dataset]
+        columns = table.columns.keys()
+        batches = stream(self.db, self.batch_size)
+        if fmt == "csv":
+            return self._csv(columns, batches)
+        return self._ndjson(columns, batches)
+
+    @staticmethod
+    def _ndjson(columns, batches) -> Iterator[str]:
+        for rows in batches:
+            yield "".join(
+                json.dumps(dict(zip(columns, row)), default=_json_default) + "\n"
+                for row in rows
+            )
+
+    @staticmethod
+    def _csv(columns, batches) -> Iterator[str]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        # The header goes out before the first batch is fetched
+        yield buffer.getvalue()
+        for rows in batches:
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows([_csv_value(value) for value in row] for row in rows)
+            yield buffer.getvalue()
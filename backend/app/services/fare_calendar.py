@@ -0,0 +1,133 @@
+"""
+Cache of per-route, per-month lowest-fare calendars.
+
+A calendar is computed by one GROUP BY (flight_repository.get_fare_calendar_async)
+and kept for CALENDAR_CACHE_TTL seconds. Each entry remembers the flights it
+was computed from, so a seat or price change on one flight drops only the
+calendars that flight contributes to:
+
+- ORM changes to FlightSeat / Flight rows are picked up by a Session
+  `after_flush` listener (covers sync and async sessions) and applied when
+  the transaction commits;
+- UPDATE statements that bypass the ORM must call `invalidate_flights_on_commit`.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import CALENDAR_CACHE_TTL, CALENDAR_CACHE_SIZE
+from app.models.flight import Flight, FlightSeat
+
+# (origin_airport_id, destination_airport_id, year, month)
+RouteMonth = Tuple[int, int, int, int]
+
+
+def route_month(origin_id: int, destination_id: int, departure_time: datetime) -> RouteMonth:
+    return (origin_id, destination_id, departure_time.year, departure_time.month)
+
+
+class FareCalendarCache:
+    def __init__(self, ttl: int, max_size: int):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: "OrderedDict[RouteMonth, Tuple[float, List[dict], Set[int]]]" = OrderedDict()
+        self._keys_by_flight: Dict[int, Set[RouteMonth]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: RouteMonth) -> Optional[List[dict]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, days, _ = entry
+            if time.monotonic() >= expires_at:
+                self._drop(key)
+                return None
+            self._entries.move_to_end(key)
+            return days
+
+    def put(self, key: RouteMonth, days: List[dict], flight_ids: Iterable[int]) -> None:
+        flight_ids = set(flight_ids)
+        with self._lock:
+            self._drop(key)
+            self._entries[key] = (time.monotonic() + self.ttl, days, flight_ids)
+            for flight_id in flight_ids:
+                self._keys_by_flight.setdefault(flight_id, set()).add(key)
+            while len(self._entries) > self.max_size:
+                self._drop(next(iter(self._entries)))
+
+    def invalidate(self, key: RouteMonth) -> None:
+        with self._lock:
+            self._drop(key)
+
+    def invalidate_flights(self, flight_ids: Iterable[int]) -> None:
+        """Drop every calendar computed from one of `flight_ids`"""
+        with self._lock:
+            for flight_id in flight_ids:
+                for key in list(self._keys_by_flight.get(flight_id, ())):
+                    self._drop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_flight.clear()
+
+    def _drop(self, key: RouteMonth) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for flight_id in entry[2]:
+            keys = self._keys_by_flight.get(flight_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_flight[flight_id]
+
+
+fare_calendar_cache = FareCalendarCache(CALENDAR_CACHE_TTL, CALENDAR_CACHE_SIZE)
+
+
+PENDING_FLIGHTS_KEY = "fare_calendar_flights"
+
+
+def invalidate_flights_on_commit(session: Session, flight_ids: Iterable[int]) -> None:
+    """Drop the calendars of `flight_ids` once `session` commits (for writes that bypass the ORM)"""
+    session.info.setdefault(PENDING_FLIGHTS_KEY, set()).update(flight_ids)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_fares(session, flush_context):
+    flight_ids = set()
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(instance, FlightSeat):
+            flight_ids.add(instance.flight_id)
+        elif isinstance(instance, Flight):
+            flight_ids.add(instance.flight_id)
+            # A new or moved flight can land in a calendar it was not part of
+            if instance.departure_time is not None:
+                fare_calendar_cache.invalidate(route_month(
+                    instance.origin_airport_id, instance.destination_airport_id, instance.departure_time
+                ))
+    flight_ids.discard(None)
+    if flight_ids:
+        invalidate_flights_on_commit(session, flight_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_fares(session):
+    # Invalidating only after COMMIT keeps a concurrent reader from caching
+    # the pre-commit fares again
+    flight_ids = session.info.pop(PENDING_FLIGHTS_KEY, None)
+    if flight_ids:
+        fare_calendar_cache.invalidate_flights(flight_ids)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_fares(session):
+    session.info.pop(PENDING_FLIGHTS_KEY, None)
@@ -0,0 +1,135 @@
+"""
+Background cascade of a flight cancellation.
+
+Once a flight is marked 'cancelled' a job walks its open bookings in batches of
+FLIGHT_DISRUPTION_BATCH, one short transaction per batch and four set-based
+statements per transaction:
+
+- UPDATE bookings to 'cancelled' (lowest ids first, RETURNING the ids);
+- UPDATE flight_seats held by those bookings' passengers back to 'available';
+- UPDATE their pending refund requests to 'rejected' (superseded);
+- INSERT ... SELECT an approved refund topping every successful payment up to
+  100% of its amount.
+
+Once no open booking is left, a final UPDATE frees whatever seats of the flight
+are still booked or held; if bookings remain the job fails instead. A
+widebody's few hundred bookings are one or two batches. Every step skips rows
+it already handled, so a job that died with the process is finished by
+starting it again.
+
+Jobs live in this process: progress is read with GET /flights/disruptions/{id}
+on the worker that accepted the cancellation.
+"""
+
+import threading
+import traceback
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional
+
+from app.core.config import FLIGHT_DISRUPTION_BATCH, FLIGHT_DISRUPTION_JOB_HISTORY
+from app.core.database import SessionLocal
+from app.repositories import booking_repository, flight_seat_repository, refund_repository
+
+REFUND_REASON = "Flight cancelled"
+SUPERSEDED_NOTE = "Superseded by the full refund for the flight cancellation"
+
+
+@dataclass
+class FlightDisruptionJob:
+    flight_id: int
+    requested_by: str
+    job_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    status: str = "queued"  # queued, running, completed, failed
+    total_bookings: Optional[int] = None
+    bookings_cancelled: int = 0
+    seats_released: int = 0
+    refunds_created: int = 0
+    batches: int = 0
+    created_at: datetime = field(default_factory=datetime.now)
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("completed", "failed")
+
+    @property
+    def progress(self) -> float:
+        """Share of the flight's open bookings handled so far, 0.0 to 1.0"""
+        if self.status == "completed":
+            return 1.0
+        if not self.total_bookings:
+            return 0.0
+        return min(self.bookings_cancelled / self.total_bookings, 1.0)
+
+
+class FlightDisruptionJobs:
+    def __init__(self, batch_size: int, history: int):
+        self.batch_size = batch_size
+        self.history = history
+        self._jobs: "OrderedDict[str, FlightDisruptionJob]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def start(self, flight_id: int, requested_by: str) -> FlightDisruptionJob:
+        """Start cascading the flight's cancellation, or return the job already doing it"""
+        with self._lock:
+            for job in self._jobs.values():
+                if job.flight_id == flight_id and not job.finished:
+                    return job
+            job = FlightDisruptionJob(flight_id=flight_id, requested_by=requested_by)
+            self._jobs[job.job_id] = job
+            self._trim()
+        threading.Thread(target=self.run, args=(job,), name=f"flight-disruption-{flight_id}", daemon=True).start()
+        return job
+
+    def get(self, job_id: str) -> Optional[FlightDisruptionJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def run(self, job: FlightDisruptionJob) -> FlightDisruptionJob:
+        """Do the whole cascade in the calling thread"""
+        job.status = "running"
+        db = SessionLocal()
+        try:
+            job.total_bookings = booking_repository.count_open_flight_bookings(db, job.flight_id)
+            db.commit()
+            while True:
+                booking_ids = booking_repository.cancel_flight_bookings(db, job.flight_id, self.batch_size)
+                if not booking_ids:
+                    break
+                seats = flight_seat_repository.release_booking_seats(db, booking_ids)
+                refund_repository.supersede_pending_refunds(db, booking_ids, job.requested_by, SUPERSEDED_NOTE)
+                refunds = refund_repository.create_full_refunds(db, booking_ids, REFUND_REASON, job.requested_by)
+                db.commit()
+                job.batches += 1
+                job.bookings_cancelled += len(booking_ids)
+                job.seats_released += seats
+                job.refunds_created += refunds
+            remaining = booking_repository.count_open_flight_bookings(db, job.flight_id)
+            if remaining:
+                raise RuntimeError(f"{remaining} bookings are still open; seats were not released")
+            job.seats_released += flight_seat_repository.release_flight_seats(db, job.flight_id)
+            db.commit()
+            job.status = "completed"
+        except Exception as e:
+            db.rollback()
+            job.status = "failed"
+            job.error = str(e)
+            print(f"Flight {job.flight_id} cancellation job failed: {e}")
+            traceback.print_exc()
+        finally:
+            db.close()
+            job.finished_at = datetime.now()
+        return job
+
+    def _trim(self) -> None:
+        """Forget the oldest finished jobs beyond the history size"""
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[:max(len(finished) - self.history, 0)]:
+            del self._jobs[job_id]
+
+
+flight_disruptions = FlightDisruptionJobs(FLIGHT_DISRUPTION_BATCH, FLIGHT_DISRUPTION_JOB_HISTORY)
@@ -0,0 +1,187 @@
+"""
+In-memory time-expanded flight graph for connection search.
+
+Every bookable flight is an edge (origin, departure) -> (destination, arrival).
+Departures are kept per airport sorted by time, so the connections reachable
+after landing at time t are one bisect away: the slice departing between
+t + min_connection and t + max_connection. A search walks at most three legs
+from the origin's departures in the requested window and never touches SQL.
+
+The graph is loaded lazily from the flights table, patched in place when
+FlightService creates, updates or deletes a flight, and fully reloaded every
+FLIGHT_GRAPH_TTL seconds so that processes pick up each other's writes.
+"""
+
+import threading
+import time
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.core.config import FLIGHT_GRAPH_TTL
+from app.repositories.flight_repository import BOOKABLE_STATUSES
+
+
+@dataclass(frozen=True)
+class FlightEdge:
+    flight_id: int
+    flight_number: str
+    origin_airport_id: int
+    destination_airport_id: int
+    departure_time: datetime
+    arrival_time: datetime
+    fare: Decimal
+
+    @classmethod
+    def from_flight(cls, flight) -> "FlightEdge":
+        tax_rate = flight.tax_rate if flight.tax_rate is not None else Decimal("0")
+        return cls(
+            flight_id=flight.flight_id,
+            flight_number=flight.flight_number,
+            origin_airport_id=flight.origin_airport_id,
+            destination_airport_id=flight.destination_airport_id,
+            departure_time=flight.departure_time,
+            arrival_time=flight.arrival_time,
+            fare=(Decimal(flight.base_price) * (1 + Decimal(tax_rate))).quantize(Decimal("0.01")),
+        )
+
+
+@dataclass
+class Itinerary:
+    legs: Tuple[FlightEdge, ...]
+
+    @property
+    def departure_time(self) -> datetime:
+        return self.legs[0].departure_time
+
+    @property
+    def arrival_time(self) -> datetime:
+        return self.legs[-1].arrival_time
+
+    @property
+    def stops(self) -> int:
+        return len(self.legs) - 1
+
+    @property
+    def total_duration_minutes(self) -> int:
+        return int((self.arrival_time - self.departure_time).total_seconds() // 60)
+
+    @property
+    def total_fare(self) -> Decimal:
+        return sum((leg.fare for leg in self.legs), Decimal("0.00"))
+
+
+class FlightGraph:
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self._edges: Dict[int, FlightEdge] = {}
+        # airport_id -> [(departure_time, flight_id)] sorted
+        self._departures: Dict[int, List[Tuple[datetime, int]]] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.RLock()
+
+    # ============ MAINTENANCE ============
+
+    def needs_reload(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at >= self.ttl
+
+    def load(self, flights: Iterable) -> None:
+        """Replace the whole graph with `flights`"""
+        edges = {}
+        departures: Dict[int, List[Tuple[datetime, int]]] = {}
+        for flight in flights:
+            edge = FlightEdge.from_flight(flight)
+            edges[edge.flight_id] = edge
+            departures.setdefault(edge.origin_airport_id, []).append((edge.departure_time, edge.flight_id))
+        for entries in departures.values():
+            entries.sort()
+        with self._lock:
+            self._edges = edges
+            self._departures = departures
+            self._loaded_at = time.monotonic()
+
+    def upsert(self, flight) -> None:
+        """Add or replace one flight; non-bookable flights are removed"""
+        with self._lock:
+            if self._loaded_at is None:
+                return
+            self._remove(flight.flight_id)
+            if flight.status in BOOKABLE_STATUSES:
+                edge = FlightEdge.from_flight(flight)
+                self._edges[edge.flight_id] = edge
+                insort(self._departures.setdefault(edge.origin_airport_id, []), (edge.departure_time, edge.flight_id))
+
+    def remove(self, flight_id: int) -> None:
+        with self._lock:
+            self._remove(flight_id)
+
+    def _remove(self, flight_id: int) -> None:
+        edge = self._edges.pop(flight_id, None)
+        if edge is None:
+            return
+        entries = self._departures.get(edge.origin_airport_id, [])
+        index = bisect_left(entries, (edge.departure_time, edge.flight_id))
+        if index < len(entries) and entries[index][1] == flight_id:
+            del entries[index]
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._loaded_at = None
+
+    # ============ SEARCH ============
+
+    def _departing(self, airport_id: int, earliest: datetime, latest: datetime) -> List[FlightEdge]:
+        entries = self._departures.get(airport_id, [])
+        start = bisect_left(entries, (earliest, -1))
+        edges = []
+        for departure_time, flight_id in entries[start:]:
+            if departure_time > latest:
+                break
+            edges.append(self._edges[flight_id])
+        return edges
+
+    def search(
+        self,
+        origin_id: int,
+        destination_id: int,
+        departure_from: datetime,
+        departure_to: datetime,
+        max_stops: int = 2,
+        min_connection: timedelta = timedelta(minutes=45),
+        max_connection: timedelta = timedelta(hours=6),
+    ) -> List[Itinerary]:
+        """All itineraries with up to `max_stops` stops whose first leg departs in the window"""
+        itineraries: List[Itinerary] = []
+
+        def extend(legs: Tuple[FlightEdge, ...], visited: frozenset):
+            last = legs[-1]
+            if last.destination_airport_id == destination_id:
+                itineraries.append(Itinerary(legs))
+                return
+            if len(legs) > max_stops:
+                return
+            earliest = last.arrival_time + min_connection
+            latest = last.arrival_time + max_connection
+            for edge in self._departing(last.destination_airport_id, earliest, latest):
+                if edge.destination_airport_id not in visited:
+                    extend(legs + (edge,), visited | {edge.destination_airport_id})
+
+        with self._lock:
+            for edge in self._departing(origin_id, departure_from, departure_to):
+                if edge.destination_airport_id != origin_id:
+                    extend((edge,), frozenset((origin_id, edge.destination_airport_id)))
+        return itineraries
+
+
+def rank_itineraries(itineraries: List[Itinerary], sort_by: str = "duration") -> List[Itinerary]:
+    """Order by total duration then fare, or by fare then duration"""
+    if sort_by == "fare":
+        key = lambda it: (it.total_fare, it.total_duration_minutes, it.stops, it.departure_time)
+    else:
+        key = lambda it: (it.total_duration_minutes, it.total_fare, it.stops, it.departure_time)
+    return sorted(itineraries, key=key)
+
+
+flight_graph = FlightGraph(FLIGHT_GRAPH_TTL)
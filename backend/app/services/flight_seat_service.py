@@ -1,11 +1,20 @@
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.models.flight import FlightSeat
+from app.core.concurrency import check_version, retry_on_conflict
+from app.core.etag import compute_etag
 from app.repositories import flight_seat_repository, flight_repository, seat_repository
 from app.schemas.flight_seat_schema import FlightSeatCreate, FlightSeatUpdate, FlightSeatBulkCreate
+from datetime import timedelta
+from app.core.config import DEFAULT_PAGE_SIZE, SEAT_HOLD_MINUTES
+from app.core.unit_of_work import unit_of_work
+from app.services.seat_map import SeatLayout, diff_statuses, pack_statuses, seat_layouts, seat_map_history
+
+AVAILABILITY_BATCH_LIMIT = 100
 
 
 class FlightSeatService:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session | AsyncSession):
         self.db = db
 
     def get_flight_seat(self, flight_seat_id: int):
@@ -15,9 +24,9 @@ class FlightSeatService:
             raise ValueError("Flight seat not found")
         return flight_seat
 
-    def get_all_flight_seats(self, skip: int = 0, limit: int = 100):
-        """Get all flight seats"""
-        return flight_seat_repository.get_all_flight_seats(self.db, skip, limit)
+    def get_all_flight_seats(self, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE, skip: int = 0):
+        """Get one page of flight seats"""
+        return flight_seat_repository.get_all_flight_seats(self.db, cursor, limit, skip)
 
     def get_flight_seats_by_flight(self, flight_id: int):
         """Get all seats for a specific flight"""
@@ -37,6 +46,118 @@ class FlightSeatService:
         
         return flight_seat_repository.get_available_flight_seats(self.db, flight_id)
 
+    async def get_available_seats_async(self, flight_id: int):
+        """Get all available seats for a specific flight (async session)"""
+        # Verify flight exists
+        flight = await flight_repository.get_flight_by_id_async(self.db, flight_id)
+        if not flight:
+            raise ValueError("Flight not found")
+        
+        return await flight_seat_repository.get_available_flight_seats_async(self.db, flight_id)
+
+    async def get_availability_async(self, flight_id: int):
+        """Seat counts by class and status for one flight"""
+        # Verify flight exists
+        flight = await flight_repository.get_flight_by_id_async(self.db, flight_id)
+        if not flight:
+            raise ValueError("Flight not found")
+
+        return (await self.get_availability_batch_async([flight_id]))[0]
+
+    async def get_availability_batch_async(self, flight_ids: list[int]):
+        """
+        Seat counts by class and status for many flights in one query.
+        Unknown flight ids, like flights without seats, come back with no classes.
+        """
+        flight_ids = list(dict.fromkeys(flight_ids))
+        if len(flight_ids) > AVAILABILITY_BATCH_LIMIT:
+            raise ValueError(f"At most {AVAILABILITY_BATCH_LIMIT} flights per request")
+
+        summaries = {
+            flight_id: {"flight_id": flight_id, "total_seats": 0, "available_seats": 0, "classes": []}
+            for flight_id in flight_ids
+        }
+        if flight_ids:
+            rows = await flight_seat_repository.get_availability_summary_async(self.db, flight_ids)
+            for row in rows:
+                summary = summaries[row.flight_id]
+                summary["total_seats"] += row.total
+                summary["available_seats"] += row.available
+                summary["classes"].append(dict(row._mapping))
+        return list(summaries.values())
+
+    async def get_seat_layout_async(self, airplane_id: int) -> SeatLayout:
+        """Seat layout of an airplane, cached per airplane"""
+        layout = seat_layouts.get(airplane_id)
+        if layout is None:
+            rows = await seat_repository.get_seat_layout_async(self.db, airplane_id)
+            layout = SeatLayout.from_rows(airplane_id, rows)
+            seat_layouts.put(layout)
+        return layout
+
+    async def get_seat_map_async(self, flight_id: int, since: str = None):
+        """
+        Status bitmap of a flight aligned with its airplane's layout, or only the
+        changed positions when `since` is a version this worker still remembers.
+        """
+        rows = await flight_seat_repository.get_seat_statuses_async(self.db, flight_id)
+        if not rows:
+            raise ValueError("Flight not found")
+
+        airplane_id = rows[0].airplane_id
+        if airplane_id is None:
+            raise ValueError("Flight has no airplane assigned")
+        layout = await self.get_seat_layout_async(airplane_id)
+        codes = layout.status_codes((row.seat_id, row.status) for row in rows if row.seat_id is not None)
+        version = compute_etag(layout.etag.encode(), codes)
+        seat_map_history.record(flight_id, version, layout.etag, codes)
+
+        seat_map = {
+            "flight_id": flight_id,
+            "airplane_id": airplane_id,
+            "layout_etag": layout.etag,
+            "version": version,
+        }
+        previous = seat_map_history.get(flight_id, since) if since else None
+        if previous is not None and previous[0] == layout.etag:
+            seat_map["since"] = since
+            seat_map["changes"] = diff_statuses(previous[1], codes)
+        else:
+            seat_map["statuses"] = pack_statuses(codes)
+        return seat_map
+
+    def hold_seats(self, flight_id: int, user_id: str, flight_seat_ids: list[int] = None,
+                   seat_class: str = None, count: int = 1, minutes: int = SEAT_HOLD_MINUTES):
+        """
+        Reserve seats for `user_id` for `minutes` during checkout: the given
+        seats (all or none; holds the user already has are extended), or else
+        `count` free seats of the flight, optionally in one class.
+        """
+        hold_for = timedelta(minutes=minutes)
+        with unit_of_work(self.db):
+            if flight_seat_ids:
+                requested = set(flight_seat_ids)
+                held = flight_seat_repository.hold_flight_seats(self.db, flight_id, list(requested), user_id, hold_for)
+                if len(held) < len(requested):
+                    missing = sorted(requested - {row.flight_seat_id for row in held})
+                    raise ValueError(f"Seats not available on this flight: {', '.join(map(str, missing))}")
+            else:
+                held = flight_seat_repository.claim_any_flight_seats(
+                    self.db, flight_id, seat_class, count, user_id=user_id, hold_for=hold_for
+                )
+                if len(held) < count:
+                    raise ValueError(f"Only {len(held)} seat(s) available on this flight")
+            return {
+                "flight_id": flight_id,
+                "flight_seat_ids": [row.flight_seat_id for row in held],
+                "expires_at": min(row.hold_expires_at for row in held),
+            }
+
+    def release_holds(self, user_id: str, flight_seat_ids: list[int]):
+        """Give back seats `user_id` holds; returns the released flight_seat_ids"""
+        with unit_of_work(self.db):
+            return flight_seat_repository.release_held_flight_seats(self.db, flight_seat_ids, user_id)
+
     def get_seats_by_status(self, flight_id: int, status: str):
         """Get flight seats filtered by status"""
         # Verify flight exists
@@ -119,11 +240,13 @@ class FlightSeatService:
         
         return flight_seat_repository.create_flight_seats_bulk(self.db, flight_seats)
 
-    def update_flight_seat(self, flight_seat_id: int, flight_seat_data: FlightSeatUpdate):
-        """Update a flight seat"""
+    @retry_on_conflict
+    def update_flight_seat(self, flight_seat_id: int, flight_seat_data: FlightSeatUpdate, expected_version: int = None):
+        """Update a flight seat (only while at `expected_version`, when given)"""
         existing_flight_seat = flight_seat_repository.get_flight_seat_by_id(self.db, flight_seat_id)
         if not existing_flight_seat:
             raise ValueError("Flight seat not found")
+        check_version(existing_flight_seat, expected_version)
         
         # Check if seat is already booked and trying to change status
         if existing_flight_seat.status == "booked" and flight_seat_data.status and flight_seat_data.status != "booked":
@@ -134,6 +257,7 @@ class FlightSeatService:
         update_dict = flight_seat_data.model_dump(exclude_unset=True)
         return flight_seat_repository.update_flight_seat(self.db, flight_seat_id, update_dict)
 
+    @retry_on_conflict
     def update_status(self, flight_seat_id: int, status: str):
         """Update only the status of a flight seat"""
         existing_flight_seat = flight_seat_repository.get_flight_seat_by_id(self.db, flight_seat_id)
@@ -1,11 +1,23 @@
-from typing import List
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from app.core.airport_cache import airport_codes
+from app.core.config import CONNECTION_MIN_MINUTES, CONNECTION_MAX_MINUTES, DEFAULT_PAGE_SIZE
 from app.models.flight import Flight
-from app.repositories import flight_repository
+from app.repositories import aiport_repository, flight_repository
 from app.schemas.flight_schema import FlightCreate
+from app.services.fare_calendar import fare_calendar_cache
+from app.services.flight_disruption import flight_disruptions
+from app.services.flight_graph import flight_graph, rank_itineraries
+
+# Search window when no dates are given, and the widest window allowed
+SEARCH_DEFAULT_WINDOW_DAYS = 30
+SEARCH_MAX_WINDOW_DAYS = 90
 
 class FlightService:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session | AsyncSession):
         self.db = db
     
     def get_flight(self, flight_id: int):
@@ -15,9 +27,20 @@ class FlightService:
             raise ValueError("Flight not found")
         return flight
     
-    def get_all_flights(self):
-        """Get all flights"""
-        return flight_repository.get_all_flights(self.db)
+    def get_all_flights(self, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE):
+        """Get one page of flights in departure order"""
+        return flight_repository.get_all_flights(self.db, cursor, limit)
+    
+    async def get_flight_async(self, flight_id: int):
+        """Get a flight by ID (async session)"""
+        flight = await flight_repository.get_flight_by_id_async(self.db, flight_id)
+        if not flight:
+            raise ValueError("Flight not found")
+        return flight
+    
+    async def get_all_flights_async(self, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE):
+        """Get one page of flights in departure order (async session)"""
+        return await flight_repository.get_all_flights_async(self.db, cursor, limit)
     
     def create_flight(self, flight_data: FlightCreate):
         """Create a new flight"""
@@ -27,7 +50,9 @@ class FlightService:
         # Create Flight model instance
         flight = Flight(**flight_dict)
         
-        return flight_repository.create_flight(self.db, flight)
+        flight = flight_repository.create_flight(self.db, flight)
+        flight_graph.upsert(flight)
+        return flight
     
     def update_flight(self, flight_id: int, flight_data: dict):
         """Update an existing flight"""
@@ -35,7 +60,32 @@ class FlightService:
         if not existing_flight:
             raise ValueError("Flight not found")
         
-        return flight_repository.update_flight(self.db, flight_id, flight_data)
+        flight = flight_repository.update_flight(self.db, flight_id, flight_data)
+        flight_graph.upsert(flight)
+        return flight
+    
+    def cancel_flight(self, flight_id: int, requested_by: str):
+        """
+        Mark the flight cancelled, then cancel its bookings, free its seats and
+        refund its payments in a background job; returns the job
+        """
+        existing_flight = flight_repository.get_flight_by_id(self.db, flight_id)
+        if not existing_flight:
+            raise ValueError("Flight not found")
+        if existing_flight.status == "completed":
+            raise ValueError("A completed flight can't be cancelled")
+        
+        if existing_flight.status != "cancelled":
+            flight = flight_repository.update_flight(self.db, flight_id, {"status": "cancelled"})
+            flight_graph.upsert(flight)
+        return flight_disruptions.start(flight_id, requested_by)
+    
+    def get_cancellation_job(self, job_id: str):
+        """Progress of a flight cancellation job started on this worker"""
+        job = flight_disruptions.get(job_id)
+        if not job:
+            raise ValueError("Cancellation job not found")
+        return job
     
     def delete_flight(self, flight_id: int):
         """Delete a flight"""
@@ -43,12 +93,124 @@ class FlightService:
         if not existing_flight:
             raise ValueError("Flight not found")
         
-        return flight_repository.delete_flight(self.db, flight_id)
-    
-    def search_flights(self, origin: str, destination: str) -> List[Flight]:
-        """Search for flights between an origin and destination"""
-        flights = self.db.query(Flight).filter(
-            Flight.origin == origin,
-            Flight.destination == destination
-        ).all()
-        return flights
\ No newline at end of file
+        deleted = flight_repository.delete_flight(self.db, flight_id)
+        flight_graph.remove(flight_id)
+        return deleted
+    
+    async def resolve_airport_ids_async(self, *iata_codes: str):
+        """Resolve IATA codes through the cached airport map (None for unknown codes)"""
+        if airport_codes.needs_refresh(*iata_codes):
+            airport_codes.replace(await aiport_repository.get_airport_codes_async(self.db))
+        return [airport_codes.get(code) for code in iata_codes]
+
+    async def search_flights_async(
+        self,
+        origin: str,
+        destination: str,
+        departure_date: Optional[date] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        passengers: int = 1,
+    ):
+        """
+        Search bookable flights between two IATA codes on a date or within a date
+        range that still have `passengers` available seats.
+        Returns (Flight, available_seats) rows in departure order.
+        """
+        if passengers < 1:
+            raise ValueError("Passenger count must be at least 1")
+        departure_from, departure_to = self._search_window(departure_date, date_from, date_to)
+
+        origin_id, destination_id = await self.resolve_airport_ids_async(origin, destination)
+        if origin_id is None or destination_id is None:
+            return []
+
+        return await flight_repository.search_flights_async(
+            self.db, origin_id, destination_id, departure_from, departure_to, passengers
+        )
+
+    async def search_connections_async(
+        self,
+        origin: str,
+        destination: str,
+        departure_date: Optional[date] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        max_stops: int = 2,
+        min_connection_minutes: int = CONNECTION_MIN_MINUTES,
+        max_connection_minutes: int = CONNECTION_MAX_MINUTES,
+        sort_by: str = "duration",
+        limit: int = 20,
+    ):
+        """
+        Itineraries of up to `max_stops` stops whose first leg departs in the window,
+        answered from the in-memory flight graph and ranked by duration or fare.
+        """
+        if not 0 <= max_stops <= 2:
+            raise ValueError("max_stops must be between 0 and 2")
+        if not 0 <= min_connection_minutes <= max_connection_minutes:
+            raise ValueError("min_connection_minutes must be between 0 and max_connection_minutes")
+        departure_from, departure_to = self._search_window(departure_date, date_from, date_to)
+
+        origin_id, destination_id = await self.resolve_airport_ids_async(origin, destination)
+        if origin_id is None or destination_id is None:
+            return []
+
+        if flight_graph.needs_reload():
+            flight_graph.load(await flight_repository.get_bookable_flights_async(self.db, datetime.now()))
+
+        itineraries = flight_graph.search(
+            origin_id,
+            destination_id,
+            departure_from,
+            departure_to - timedelta(microseconds=1),
+            max_stops=max_stops,
+            min_connection=timedelta(minutes=min_connection_minutes),
+            max_connection=timedelta(minutes=max_connection_minutes),
+        )
+        return rank_itineraries(itineraries, sort_by)[:limit]
+
+    async def get_fare_calendar_async(self, origin: str, destination: str, year: int, month: int):
+        """
+        Lowest available fare per day of a month on a route, as
+        [{"date", "lowest_fare", "flight_count"}]; cached per route-month.
+        """
+        if not 1 <= month <= 12:
+            raise ValueError("month must be between 1 and 12")
+        origin_id, destination_id = await self.resolve_airport_ids_async(origin, destination)
+        if origin_id is None or destination_id is None:
+            return []
+
+        key = (origin_id, destination_id, year, month)
+        days = fare_calendar_cache.get(key)
+        if days is not None:
+            return days
+
+        month_start = datetime(year, month, 1)
+        month_end = datetime(year + month // 12, month % 12 + 1, 1)
+        rows = await flight_repository.get_fare_calendar_async(
+            self.db, origin_id, destination_id, month_start, month_end
+        )
+        days = [
+            {
+                "date": row.day,
+                "lowest_fare": row.lowest_fare.quantize(Decimal("0.01")) if row.lowest_fare is not None else None,
+                "flight_count": row.flight_count,
+            }
+            for row in rows
+        ]
+        fare_calendar_cache.put(key, days, (flight_id for row in rows for flight_id in row.flight_ids))
+        return days
+
+    @staticmethod
+    def _search_window(departure_date: Optional[date], date_from: Optional[date], date_to: Optional[date]):
+        """[start, end) datetimes for a departure date or a date range"""
+        if departure_date:
+            date_from = date_to = departure_date
+        date_from = date_from or date.today()
+        date_to = date_to or date_from + timedelta(days=SEARCH_DEFAULT_WINDOW_DAYS)
+        if date_to < date_from:
+            raise ValueError("date_to must not be before date_from")
+        if (date_to - date_from).days > SEARCH_MAX_WINDOW_DAYS:
+            raise ValueError(f"Search window cannot exceed {SEARCH_MAX_WINDOW_DAYS} days")
+        return datetime.combine(date_from, time.min), datetime.combine(date_to + timedelta(days=1), time.min)
@@ -0,0 +1,114 @@
+"""
+Seat selection for parties travelling together.
+
+Seat numbers are parsed into (row, letter). Seats are adjacent when they are in
+the same row and their letters are consecutive; aisles are not modelled, so
+C and D count as neighbours. The choice, in order of preference:
+
+1. one run of adjacent seats in a single row: the tightest run that fits
+   (keeps larger runs free for larger parties), then the frontmost row;
+2. otherwise the fewest consecutive rows that together hold the party, split
+   into as few runs as possible (longest runs first) so sub-groups still sit
+   side by side.
+
+Everything runs on the seat list loaded once; nothing here touches SQL.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+_SEAT_NUMBER = re.compile(r"^\s*(\d+)\s*([A-Za-z]+)\s*$")
+
+
+@dataclass(frozen=True)
+class FreeSeat:
+    flight_seat_id: int
+    row: int
+    letter: str
+
+
+def parse_seat_number(seat_number: str) -> Optional[Tuple[int, str]]:
+    """'12C' -> (12, 'C'); None when the number has no row/letter form"""
+    match = _SEAT_NUMBER.match(seat_number or "")
+    if match is None:
+        return None
+    return int(match.group(1)), match.group(2).upper()
+
+
+def _letter_index(letter: str) -> int:
+    index = 0
+    for char in letter:
+        index = index * 26 + ord(char) - ord("A") + 1
+    return index
+
+
+def _runs(seats: List[FreeSeat]) -> List[List[FreeSeat]]:
+    """Split one row's seats (sorted by letter) into runs of adjacent seats"""
+    runs: List[List[FreeSeat]] = []
+    for seat in seats:
+        if runs and _letter_index(seat.letter) == _letter_index(runs[-1][-1].letter) + 1:
+            runs[-1].append(seat)
+        else:
+            runs.append([seat])
+    return runs
+
+
+def choose_group_seats(seats: Iterable[FreeSeat], party_size: int) -> Optional[List[int]]:
+    """flight_seat_ids for the party, or None when there are fewer free seats than people"""
+    rows: Dict[int, List[FreeSeat]] = {}
+    for seat in seats:
+        rows.setdefault(seat.row, []).append(seat)
+    if party_size <= 0:
+        return []
+    if sum(len(row_seats) for row_seats in rows.values()) < party_size:
+        return None
+
+    runs_by_row = {
+        row: _runs(sorted(row_seats, key=lambda seat: _letter_index(seat.letter)))
+        for row, row_seats in rows.items()
+    }
+
+    # 1. A single row run
+    best = None
+    for row, runs in runs_by_row.items():
+        for run in runs:
+            if len(run) >= party_size:
+                key = (len(run), row, _letter_index(run[0].letter))
+                if best is None or key < best[0]:
+                    best = (key, run)
+    if best is not None:
+        return [seat.flight_seat_id for seat in best[1][:party_size]]
+
+    # 2. The shortest span of rows holding everyone (rows without free seats are
+    # skipped over), then the one needing the fewest separate runs
+    ordered_rows = sorted(rows)
+    best_window = None
+    start, seated = 0, 0
+    for end, row in enumerate(ordered_rows):
+        seated += len(rows[row])
+        while seated - len(rows[ordered_rows[start]]) >= party_size:
+            seated -= len(rows[ordered_rows[start]])
+            start += 1
+        if seated >= party_size:
+            runs = _largest_runs_first(runs_by_row, ordered_rows[start:end + 1])
+            key = (row - ordered_rows[start], _runs_needed(runs, party_size), ordered_rows[start])
+            if best_window is None or key < best_window[0]:
+                best_window = (key, runs)
+
+    chosen = [seat.flight_seat_id for run in best_window[1] for seat in run]
+    return chosen[:party_size]
+
+
+def _largest_runs_first(runs_by_row: Dict[int, List[List[FreeSeat]]], rows: List[int]) -> List[List[FreeSeat]]:
+    runs = [run for row in rows for run in runs_by_row[row]]
+    return sorted(runs, key=lambda run: (-len(run), run[0].row, _letter_index(run[0].letter)))
+
+
+def _runs_needed(runs: List[List[FreeSeat]], party_size: int) -> int:
+    seated = 0
+    for count, run in enumerate(runs, 1):
+        seated += len(run)
+        if seated >= party_size:
+            return count
+    return len(runs)
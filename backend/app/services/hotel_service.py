@@ -1,12 +1,14 @@
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.models.hotel import Hotel
 from app.repositories import hotel_repository
 from app.schemas.hotel_schema import HotelCreate, HotelUpdate
 from app.factories import get_service_factory
+from app.core.unit_of_work import commit_changes
 
 
 class HotelService:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session | AsyncSession):
         self.db = db
 
     def get_hotel(self, hotel_id: int):
@@ -20,6 +22,10 @@ class HotelService:
         """Get all hotels"""
         return hotel_repository.get_all_hotels(self.db, skip, limit)
 
+    async def get_all_hotels_async(self, skip: int = 0, limit: int = 100):
+        """Get all hotels (async session)"""
+        return await hotel_repository.get_all_hotels_async(self.db, skip, limit)
+
     def get_hotels_by_stars(self, stars: int):
         """Get hotels filtered by star rating"""
         if stars < 1 or stars > 5:
@@ -54,9 +60,7 @@ class HotelService:
                 service_data={"name": name, "price": price},
                 details_data={"location": location, "stars": stars, "description": description}
             )
-            self.db.commit()
-            self.db.refresh(service)
-            self.db.refresh(hotel)
+            commit_changes(self.db, service, hotel)
             return service, hotel
         except Exception as e:
             self.db.rollback()
@@ -1,13 +1,15 @@
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.models.package import BookingPackage, PackagePlace
 from app.repositories import package_repository
+from app.core.unit_of_work import commit_changes, unit_of_work
 from app.schemas.package_schema import PackageCreate, PackageUpdate, PackagePlaceCreate
 from app.factories import get_service_factory
 from typing import Optional
 
 
 class PackageService:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session | AsyncSession):
         self.db = db
 
     def get_package(self, package_id: int):
@@ -21,29 +23,34 @@ class PackageService:
         """Get all packages"""
         return package_repository.get_all_packages(self.db, skip, limit)
 
+    async def get_all_packages_async(self, skip: int = 0, limit: int = 100):
+        """Get all packages (async session)"""
+        return await package_repository.get_all_packages_async(self.db, skip, limit)
+
     def create_package(self, package_data: PackageCreate):
         """Create a new package with places (traditional way - kept for backward compatibility)"""
-        # Extract places data
-        places_data = package_data.places if package_data.places else []
-        package_dict = package_data.model_dump(exclude={'places'})
+        with unit_of_work(self.db):
+            # Extract places data
+            places_data = package_data.places if package_data.places else []
+            package_dict = package_data.model_dump(exclude={'places'})
         
-        # Create package
-        package = BookingPackage(**package_dict)
-        created_package = package_repository.create_package(self.db, package)
+            # Create package
+            package = BookingPackage(**package_dict)
+            created_package = package_repository.create_package(self.db, package)
         
-        # Add places to package
-        if places_data:
-            for place_data in places_data:
-                package_place = PackagePlace(
-                    package_id=created_package.package_id,
-                    place_id=place_data.place_id,
-                    day_number=place_data.day_number
-                )
-                package_repository.add_place_to_package(self.db, package_place)
+            # Add places to package
+            if places_data:
+                for place_data in places_data:
+                    package_place = PackagePlace(
+                        package_id=created_package.package_id,
+                        place_id=place_data.place_id,
+                        day_number=place_data.day_number
+                    )
+                    package_repository.add_place_to_package(self.db, package_place)
         
-        # Refresh to get updated relationships
-        self.db.refresh(created_package)
-        return created_package
+            # Refresh to get updated relationships
+            self.db.refresh(created_package)
+            return created_package
     
     def create_package_with_service(self, service_name: str, service_price: float, package_name: str,
                                     total_price: float, hotel_id: Optional[int] = None, 
@@ -75,9 +82,7 @@ class PackageService:
                     "car_rental_id": car_rental_id
                 }
             )
-            self.db.commit()
-            self.db.refresh(service)
-            self.db.refresh(package)
+            commit_changes(self.db, service, package)
             return service, package
         except Exception as e:
             self.db.rollback()
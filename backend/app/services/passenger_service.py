@@ -1,6 +1,22 @@
 from sqlalchemy.orm import Session
-from app.repositories import passenger_repository, flight_seat_repository
-from app.schemas.passenger_schema import PassengerCreate, PassengerUpdate
+from app.repositories import booking_repository, passenger_repository, flight_seat_repository
+from app.schemas.passenger_schema import PassengerBulkCreate, PassengerCreate, PassengerUpdate
+from app.core.unit_of_work import unit_of_work
+from app.services.group_seating import FreeSeat, choose_group_seats, parse_seat_number
+
+# Attempts at seating a party when a chosen seat is taken between picking and claiming
+AUTO_SEAT_ATTEMPTS = 3
+
+# Largest manifest accepted by create_passengers_bulk
+PASSENGER_BULK_LIMIT = 500
+
+
+class _SeatsTaken(Exception):
+    pass
+
+
+class SeatsUnavailable(ValueError):
+    """A requested seat is missing or already taken"""
 
 
 class PassengerService:
@@ -26,116 +42,164 @@ class PassengerService:
         """Get passengers filtered by type"""
         return passenger_repository.get_passengers_by_type(self.db, booking_id, passenger_type)
     
-    def create_passenger(self, passenger_data: PassengerCreate):
-        """Create a new passenger"""
-        # Validate flight seat if provided
-        if passenger_data.flight_seat_id:
-            flight_seat = flight_seat_repository.get_flight_seat_by_id(
-                self.db, 
-                passenger_data.flight_seat_id
-            )
-            if not flight_seat:
-                raise ValueError("Flight seat not found")
-            if flight_seat.status != "available":
-                raise ValueError("Flight seat is not available")
-        
-        # Create passenger
-        passenger_dict = passenger_data.model_dump()
-        passenger = passenger_repository.create_passenger(self.db, passenger_dict)
-        
-        # Update flight seat status if seat was assigned
-        if passenger_data.flight_seat_id:
-            flight_seat_repository.update_flight_seat_status(
-                self.db,
-                passenger_data.flight_seat_id,
-                "booked"
-            )
+    def create_passenger(self, passenger_data: PassengerCreate, user_id: str = None):
+        """Create a new passenger; a seat held by `user_id` can be booked"""
+        with unit_of_work(self.db):
+            # Claim the flight seat first, if provided
+            if passenger_data.flight_seat_id:
+                self._claim_seat(passenger_data.flight_seat_id, user_id)
         
-        return passenger
+            # Create passenger
+            passenger_dict = passenger_data.model_dump()
+            return passenger_repository.create_passenger(self.db, passenger_dict)
     
-    def create_passengers_bulk(self, passengers_data: list[PassengerCreate]):
-        """Create multiple passengers at once"""
-        passengers_dict = [p.model_dump() for p in passengers_data]
-        return passenger_repository.create_passengers_bulk(self.db, passengers_dict)
+    def create_passengers_bulk(self, passengers_data: list[PassengerBulkCreate], user_id: str = None):
+        """
+        Create a manifest of passengers with their emergency contacts, all or
+        nothing. Every requested seat is checked and booked by one UPDATE; if
+        any is missing or taken nothing is written.
+        """
+        if not passengers_data:
+            return []
+        if len(passengers_data) > PASSENGER_BULK_LIMIT:
+            raise ValueError(f"At most {PASSENGER_BULK_LIMIT} passengers per request")
+        seat_ids = [p.flight_seat_id for p in passengers_data if p.flight_seat_id]
+        if len(set(seat_ids)) < len(seat_ids):
+            raise ValueError("The same seat was requested for two passengers")
+        
+        with unit_of_work(self.db):
+            booking_ids = {p.booking_id for p in passengers_data}
+            missing = booking_ids - booking_repository.get_existing_booking_ids(self.db, list(booking_ids))
+            if missing:
+                raise ValueError(f"Bookings not found: {', '.join(map(str, sorted(missing)))}")
+            
+            if seat_ids:
+                booked = flight_seat_repository.book_flight_seats(self.db, seat_ids, user_id)
+                if len(booked) < len(seat_ids):
+                    taken = sorted(set(seat_ids) - set(booked))
+                    raise SeatsUnavailable(f"Flight seats not available: {', '.join(map(str, taken))}")
+            
+            passengers_dict = [p.model_dump() for p in passengers_data]
+            return passenger_repository.create_passengers_bulk(self.db, passengers_dict)
     
-    def update_passenger(self, passenger_id: int, passenger_data: PassengerUpdate):
+    def update_passenger(self, passenger_id: int, passenger_data: PassengerUpdate, user_id: str = None):
         """Update a passenger"""
-        passenger = passenger_repository.get_passenger_by_id(self.db, passenger_id)
-        if not passenger:
-            raise ValueError("Passenger not found")
+        with unit_of_work(self.db):
+            passenger = passenger_repository.get_passenger_by_id(self.db, passenger_id)
+            if not passenger:
+                raise ValueError("Passenger not found")
         
-        # Handle flight seat changes
-        if passenger_data.flight_seat_id is not None:
-            # Free up old seat if exists
-            if passenger.flight_seat_id:
-                flight_seat_repository.update_flight_seat_status(
-                    self.db,
-                    passenger.flight_seat_id,
-                    "available"
-                )
+            # Handle flight seat changes
+            if passenger_data.flight_seat_id is not None and passenger_data.flight_seat_id != passenger.flight_seat_id:
+                # Claim the new seat before freeing the old one
+                if passenger_data.flight_seat_id:
+                    self._claim_seat(passenger_data.flight_seat_id, user_id)
             
-            # Validate and book new seat
-            if passenger_data.flight_seat_id:
-                flight_seat = flight_seat_repository.get_flight_seat_by_id(
-                    self.db,
-                    passenger_data.flight_seat_id
-                )
-                if not flight_seat:
-                    raise ValueError("Flight seat not found")
-                if flight_seat.status != "available":
-                    raise ValueError("Flight seat is not available")
-                
-                flight_seat_repository.update_flight_seat_status(
-                    self.db,
-                    passenger_data.flight_seat_id,
-                    "booked"
-                )
+                # Free up old seat if exists
+                if passenger.flight_seat_id:
+                    flight_seat_repository.update_flight_seat_status(
+                        self.db,
+                        passenger.flight_seat_id,
+                        "available"
+                    )
         
-        update_dict = passenger_data.model_dump(exclude_unset=True)
-        return passenger_repository.update_passenger(self.db, passenger_id, update_dict)
+            update_dict = passenger_data.model_dump(exclude_unset=True)
+            return passenger_repository.update_passenger(self.db, passenger_id, update_dict)
     
-    def assign_seat(self, passenger_id: int, flight_seat_id: int):
+    def assign_seat(self, passenger_id: int, flight_seat_id: int, user_id: str = None):
         """Assign a flight seat to a passenger"""
-        passenger = passenger_repository.get_passenger_by_id(self.db, passenger_id)
-        if not passenger:
-            raise ValueError("Passenger not found")
+        with unit_of_work(self.db):
+            passenger = passenger_repository.get_passenger_by_id(self.db, passenger_id)
+            if not passenger:
+                raise ValueError("Passenger not found")
         
-        # Validate flight seat
-        flight_seat = flight_seat_repository.get_flight_seat_by_id(self.db, flight_seat_id)
-        if not flight_seat:
-            raise ValueError("Flight seat not found")
-        if flight_seat.status != "available":
-            raise ValueError("Flight seat is not available")
+            if passenger.flight_seat_id == flight_seat_id:
+                return passenger
+        
+            # Claim the new seat
+            self._claim_seat(flight_seat_id, user_id)
+            return self._move_to_seat(passenger, flight_seat_id)
+    
+    def assign_any_seat(self, passenger_id: int, flight_id: int, seat_class: str = None):
+        """Assign the first free seat of a flight (optionally of one class) to a passenger"""
+        with unit_of_work(self.db):
+            passenger = passenger_repository.get_passenger_by_id(self.db, passenger_id)
+            if not passenger:
+                raise ValueError("Passenger not found")
         
-        # Free up old seat if exists
+            claimed = flight_seat_repository.claim_any_flight_seats(self.db, flight_id, seat_class)
+            if not claimed:
+                raise ValueError("No available seat on this flight" + (f" in {seat_class}" if seat_class else ""))
+            return self._move_to_seat(passenger, claimed[0].flight_seat_id)
+    
+    def auto_assign_seats(self, booking_id: int, flight_id: int, seat_class: str = None, user_id: str = None):
+        """
+        Seat every passenger of a booking that has no seat yet, keeping the party
+        together (see group_seating). The free seats are read once and all chosen
+        seats are claimed in one UPDATE; if another checkout takes one of them in
+        between, the whole choice is rolled back and made again.
+        """
+        for _ in range(AUTO_SEAT_ATTEMPTS):
+            try:
+                with unit_of_work(self.db):
+                    passengers = passenger_repository.get_unseated_passengers(self.db, booking_id)
+                    if not passengers:
+                        raise ValueError("Every passenger of this booking already has a seat")
+
+                    free_seats = []
+                    for flight_seat_id, seat_number in flight_seat_repository.get_free_seat_numbers(
+                        self.db, flight_id, seat_class
+                    ):
+                        parsed = parse_seat_number(seat_number)
+                        if parsed is not None:
+                            free_seats.append(FreeSeat(flight_seat_id, *parsed))
+                    chosen = choose_group_seats(free_seats, len(passengers))
+                    if chosen is None:
+                        raise ValueError(f"Not enough free seats for {len(passengers)} passengers")
+
+                    claimed = flight_seat_repository.claim_flight_seats(self.db, flight_id, chosen, user_id)
+                    if len(claimed) < len(chosen):
+                        raise _SeatsTaken()
+                    return passenger_repository.assign_seats(self.db, list(zip(passengers, chosen)))
+            except _SeatsTaken:
+                continue
+        raise ValueError("Seats were taken by concurrent bookings, please try again")
+
+    def _claim_seat(self, flight_seat_id: int, user_id: str = None):
+        """Book `flight_seat_id` or fail; safe against concurrent claims of the same seat"""
+        if flight_seat_repository.claim_flight_seat(self.db, flight_seat_id, user_id) is None:
+            # Only the losing path pays for telling the two failures apart
+            if not flight_seat_repository.get_flight_seat_by_id(self.db, flight_seat_id):
+                raise ValueError("Flight seat not found")
+            raise ValueError("Flight seat is not available")
+    
+    def _move_to_seat(self, passenger, flight_seat_id: int):
+        """Free the passenger's current seat, if any, and point them at an already claimed one"""
         if passenger.flight_seat_id:
             flight_seat_repository.update_flight_seat_status(
                 self.db,
                 passenger.flight_seat_id,
                 "available"
             )
-        
-        # Assign new seat
-        passenger_repository.assign_seat_to_passenger(self.db, passenger_id, flight_seat_id)
-        flight_seat_repository.update_flight_seat_status(self.db, flight_seat_id, "booked")
-        
-        return passenger_repository.get_passenger_by_id(self.db, passenger_id)
+        passenger_repository.assign_seat_to_passenger(self.db, passenger.passenger_id, flight_seat_id)
+        return passenger_repository.get_passenger_by_id(self.db, passenger.passenger_id)
     
     def delete_passenger(self, passenger_id: int):
         """Delete a passenger"""
-        passenger = passenger_repository.get_passenger_by_id(self.db, passenger_id)
-        if not passenger:
-            raise ValueError("Passenger not found")
+        with unit_of_work(self.db):
+            passenger = passenger_repository.get_passenger_by_id(self.db, passenger_id)
+            if not passenger:
+                raise ValueError("Passenger not found")
         
-        # Free up flight seat if assigned
-        if passenger.flight_seat_id:
-            flight_seat_repository.update_flight_seat_status(
-                self.db,
-                passenger.flight_seat_id,
-                "available"
-            )
+            # Free up flight seat if assigned
+            if passenger.flight_seat_id:
+                flight_seat_repository.update_flight_seat_status(
+                    self.db,
+                    passenger.flight_seat_id,
+                    "available"
+                )
         
-        success = passenger_repository.delete_passenger(self.db, passenger_id)
-        if not success:
-            raise ValueError("Failed to delete passenger")
-        return {"message": "Passenger deleted successfully"}
+            success = passenger_repository.delete_passenger(self.db, passenger_id)
+            if not success:
+                raise ValueError("Failed to delete passenger")
+            return {"message": "Passenger deleted successfully"}
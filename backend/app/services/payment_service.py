@@ -1,5 +1,6 @@
 from sqlalchemy.orm import Session
 from app.models.booking import Payment
+from app.core.concurrency import check_version, retry_on_conflict
 from app.repositories import payment_repository
 from app.schemas.payment_schema import PaymentCreate
 from datetime import datetime
@@ -34,9 +35,11 @@ class PaymentService:
         except Exception as e:
             print(f"Error creating payment: {e}")
             raise ValueError(f"Failed to create payment: {str(e)}")
-    def update_payment_status(self, payment_id: int, status: str):
-        """Update payment status"""
-        payment = payment_repository.update_payment_status(self.db, payment_id, status)
+    @retry_on_conflict
+    def update_payment_status(self, payment_id: int, status: str, expected_version: int = None):
+        """Update payment status (only while at `expected_version`, when given)"""
+        payment = payment_repository.get_payment_by_id(self.db, payment_id)
         if not payment:
             raise ValueError("Payment not found")
-        return payment
\ No newline at end of file
+        check_version(payment, expected_version)
+        return payment_repository.update_payment_status(self.db, payment_id, status)
\ No newline at end of file
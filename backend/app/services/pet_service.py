@@ -3,6 +3,7 @@ from app import models
 from typing import List, Optional
 from app.models.pet_model import Pet
 from sqlalchemy.orm import Session
+from app.core.unit_of_work import commit_changes
 
 
 def get_all(db: Session, skip: int = 0, limit: int = 100) -> List[Pet]:
@@ -14,8 +15,7 @@ def create(db: Session, pet: dict) -> Pet:
     """Create a new pet"""
     db_pet = models.Pet(**pet)
     db.add(db_pet)
-    db.commit()
-    db.refresh(db_pet)
+    commit_changes(db, db_pet)
     return db_pet
 
 
@@ -1,5 +1,7 @@
 from sqlalchemy.orm import Session
 from app.repositories import refund_repository, booking_repository, payment_repository, passenger_repository, flight_seat_repository, flight_repository
+from app.core.concurrency import check_version, retry_on_conflict
+from app.core.unit_of_work import commit_changes, unit_of_work
 from app.schemas.refund_schema import RefundCreate, RefundCalculation, CancellationPolicyCreate, CancellationPolicyUpdate
 from datetime import datetime, timezone
 from decimal import Decimal
@@ -89,44 +91,45 @@ class RefundService:
 
     def create_refund_request(self, refund_data: RefundCreate, user_id: str):
         """Create a refund request and cancel the booking"""
-        # Calculate refund amount
-        refund_calculation = self.calculate_refund_amount(refund_data.booking_id)
+        with unit_of_work(self.db):
+            # Calculate refund amount
+            refund_calculation = self.calculate_refund_amount(refund_data.booking_id)
         
-        if not refund_calculation.can_cancel:
-            raise ValueError(refund_calculation.message)
-
-        # Get booking
-        booking = booking_repository.get_booking_by_id(self.db, refund_data.booking_id)
-        if not booking:
-            raise ValueError("Booking not found")
-
-        # Check if user owns this booking
-        if booking.user_id != user_id:
-            raise ValueError("You can only cancel your own bookings")
-
-        # Get payment for this booking
-        payment = payment_repository.get_payment_by_booking(self.db, refund_data.booking_id)
-
-        # Create refund record
-        refund_dict = {
-            "booking_id": refund_data.booking_id,
-            "payment_id": payment.payment_id if payment else None,
-            "refund_amount": refund_calculation.refund_amount,
-            "refund_percentage": refund_calculation.refund_percentage,
-            "cancellation_fee": refund_calculation.cancellation_fee,
-            "refund_reason": refund_data.refund_reason,
-            "status": "pending",
-            "requested_by": user_id,
-            "requested_at": datetime.now(),
-            "notes": refund_data.notes
-        }
+            if not refund_calculation.can_cancel:
+                raise ValueError(refund_calculation.message)
+
+            # Get booking
+            booking = booking_repository.get_booking_by_id(self.db, refund_data.booking_id)
+            if not booking:
+                raise ValueError("Booking not found")
+
+            # Check if user owns this booking
+            if booking.user_id != user_id:
+                raise ValueError("You can only cancel your own bookings")
+
+            # Get payment for this booking
+            payment = payment_repository.get_payment_by_booking(self.db, refund_data.booking_id)
+
+            # Create refund record
+            refund_dict = {
+                "booking_id": refund_data.booking_id,
+                "payment_id": payment.payment_id if payment else None,
+                "refund_amount": refund_calculation.refund_amount,
+                "refund_percentage": refund_calculation.refund_percentage,
+                "cancellation_fee": refund_calculation.cancellation_fee,
+                "refund_reason": refund_data.refund_reason,
+                "status": "pending",
+                "requested_by": user_id,
+                "requested_at": datetime.now(),
+                "notes": refund_data.notes
+            }
         
-        refund = refund_repository.create_refund(self.db, refund_dict)
+            refund = refund_repository.create_refund(self.db, refund_dict)
 
-        # Cancel the booking
-        self._cancel_booking_internal(refund_data.booking_id)
+            # Cancel the booking
+            self._cancel_booking_internal(refund_data.booking_id)
 
-        return refund
+            return refund
 
     def _cancel_booking_internal(self, booking_id: int):
         """Internal method to cancel a booking and free up seats"""
@@ -162,30 +165,33 @@ class RefundService:
         """Get all refunds for a booking"""
         return refund_repository.get_refunds_by_booking(self.db, booking_id)
 
-    def process_refund(self, refund_id: int, status: str, processed_by: str, notes: Optional[str] = None):
+    @retry_on_conflict
+    def process_refund(self, refund_id: int, status: str, processed_by: str, notes: Optional[str] = None,
+                       expected_version: Optional[int] = None):
         """Process a refund (approve/reject) - Admin/Agent only"""
-        if status not in ["approved", "rejected", "completed"]:
-            raise ValueError("Invalid status. Must be 'approved', 'rejected', or 'completed'")
+        with unit_of_work(self.db):
+            if status not in ["approved", "rejected", "completed"]:
+                raise ValueError("Invalid status. Must be 'approved', 'rejected', or 'completed'")
 
-        refund = refund_repository.get_refund_by_id(self.db, refund_id)
-        if not refund:
-            raise ValueError("Refund not found")
+            refund = refund_repository.get_refund_by_id(self.db, refund_id)
+            if not refund:
+                raise ValueError("Refund not found")
+            check_version(refund, expected_version)
 
-        if refund.status != "pending":
-            raise ValueError(f"Cannot process refund with status: {refund.status}")
+            if refund.status != "pending":
+                raise ValueError(f"Cannot process refund with status: {refund.status}")
 
-        # Update refund status
-        updated_refund = refund_repository.update_refund_status(self.db, refund_id, status, processed_by)
+            # Update refund status
+            updated_refund = refund_repository.update_refund_status(self.db, refund_id, status, processed_by)
         
-        if notes:
-            updated_refund.notes = (updated_refund.notes or "") + f"\n{notes}"
-            self.db.commit()
-            self.db.refresh(updated_refund)
+            if notes:
+                updated_refund.notes = (updated_refund.notes or "") + f"\n{notes}"
+                commit_changes(self.db, updated_refund)
 
-        # If approved, you would integrate with payment gateway here
-        # For now, we just mark it as approved
+            # If approved, you would integrate with payment gateway here
+            # For now, we just mark it as approved
         
-        return updated_refund
+            return updated_refund
 
     # Cancellation Policy Management
     def create_cancellation_policy(self, policy_data: CancellationPolicyCreate):
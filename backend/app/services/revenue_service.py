@@ -6,6 +6,8 @@ from app.models.passenger import Passenger
 from app.models.flight import Flight
 from app.models.refund import Refund
 from app.repositories import revenue_forecast_repository
+from app.core.unit_of_work import unit_of_work
+from app.core.config import DEFAULT_PAGE_SIZE
 from app.schemas.revenue_schema import (
     RevenueForecastCreate, 
     RevenueMetricsCreate, 
@@ -45,9 +47,16 @@ class RevenueService:
         return revenue_forecast_repository.create_forecast(self.db, forecast)
     
     # ============ METRICS CRUD ============
-    def get_all_metrics(self):
-        """Get all revenue metrics"""
-        return revenue_forecast_repository.get_all_metrics(self.db)
+    def get_all_metrics(self, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE):
+        """Get one page of revenue metrics, newest first"""
+        return revenue_forecast_repository.get_all_metrics(self.db, cursor, limit)
+    
+    def get_metrics_page_by_date_range(self, start_date: date, end_date: date,
+                                       cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE):
+        """Get one page of metrics within a date range, oldest first"""
+        return revenue_forecast_repository.get_metrics_page_by_date_range(
+            self.db, start_date, end_date, cursor, limit
+        )
     
     def get_metrics_by_date_range(self, start_date: date, end_date: date):
         """Get metrics within a date range"""
@@ -169,37 +178,39 @@ class RevenueService:
         forecasts = []
         base_x = len(x_values)
         
-        for day in range(1, days_ahead + 1):
-            forecast_date = date.today() + timedelta(days=day)
-            x = base_x + day
-            predicted_value = m * x + b
+        # One transaction for the whole horizon instead of a commit per day
+        with unit_of_work(self.db):
+            for day in range(1, days_ahead + 1):
+                forecast_date = date.today() + timedelta(days=day)
+                x = base_x + day
+                predicted_value = m * x + b
             
-            # Ensure non-negative
-            predicted_value = max(0, predicted_value)
+                # Ensure non-negative
+                predicted_value = max(0, predicted_value)
             
-            # Add some randomness based on historical variance
-            std_dev = math.sqrt(ss_res / n) if n > 0 else 0
-            confidence = min(100, r_squared * 100)
+                # Add some randomness based on historical variance
+                std_dev = math.sqrt(ss_res / n) if n > 0 else 0
+                confidence = min(100, r_squared * 100)
             
-            forecast = RevenueForecast(
-                forecast_date=forecast_date,
-                predicted_revenue=Decimal(str(round(predicted_value, 2))),
-                confidence_score=round(confidence, 2),
-                model_used="linear_regression",
-                model_version="1.0",
-                prediction_type="daily",
-                features_used=json.dumps({
-                    "historical_days": len(historical_metrics),
-                    "r_squared": round(r_squared, 4),
-                    "slope": round(m, 4),
-                    "intercept": round(b, 2)
-                }),
-                created_at=datetime.now()
-            )
+                forecast = RevenueForecast(
+                    forecast_date=forecast_date,
+                    predicted_revenue=Decimal(str(round(predicted_value, 2))),
+                    confidence_score=round(confidence, 2),
+                    model_used="linear_regression",
+                    model_version="1.0",
+                    prediction_type="daily",
+                    features_used=json.dumps({
+                        "historical_days": len(historical_metrics),
+                        "r_squared": round(r_squared, 4),
+                        "slope": round(m, 4),
+                        "intercept": round(b, 2)
+                    }),
+                    created_at=datetime.now()
+                )
             
-            forecasts.append(
-                revenue_forecast_repository.create_forecast(self.db, forecast)
-            )
+                forecasts.append(
+                    revenue_forecast_repository.create_forecast(self.db, forecast)
+                )
         
         return forecasts
     
@@ -227,28 +238,30 @@ class RevenueService:
         
         # Generate predictions
         forecasts = []
-        for day in range(1, days_ahead + 1):
-            forecast_date = date.today() + timedelta(days=day)
+        # One transaction for the whole horizon instead of a commit per day
+        with unit_of_work(self.db):
+            for day in range(1, days_ahead + 1):
+                forecast_date = date.today() + timedelta(days=day)
             
-            forecast = RevenueForecast(
-                forecast_date=forecast_date,
-                predicted_revenue=Decimal(str(round(avg_revenue, 2))),
-                confidence_score=round(confidence, 2),
-                model_used="moving_average",
-                model_version="1.0",
-                prediction_type="daily",
-                features_used=json.dumps({
-                    "window_size": window,
-                    "historical_count": len(historical_metrics),
-                    "avg_revenue": round(avg_revenue, 2),
-                    "std_dev": round(std_dev, 2)
-                }),
-                created_at=datetime.now()
-            )
+                forecast = RevenueForecast(
+                    forecast_date=forecast_date,
+                    predicted_revenue=Decimal(str(round(avg_revenue, 2))),
+                    confidence_score=round(confidence, 2),
+                    model_used="moving_average",
+                    model_version="1.0",
+                    prediction_type="daily",
+                    features_used=json.dumps({
+                        "window_size": window,
+                        "historical_count": len(historical_metrics),
+                        "avg_revenue": round(avg_revenue, 2),
+                        "std_dev": round(std_dev, 2)
+                    }),
+                    created_at=datetime.now()
+                )
             
-            forecasts.append(
-                revenue_forecast_repository.create_forecast(self.db, forecast)
-            )
+                forecasts.append(
+                    revenue_forecast_repository.create_forecast(self.db, forecast)
+                )
         
         return forecasts
     
@@ -278,32 +291,34 @@ class RevenueService:
         
         # Generate predictions with growth
         forecasts = []
-        for day in range(1, days_ahead + 1):
-            forecast_date = date.today() + timedelta(days=day)
+        # One transaction for the whole horizon instead of a commit per day
+        with unit_of_work(self.db):
+            for day in range(1, days_ahead + 1):
+                forecast_date = date.today() + timedelta(days=day)
             
-            # Apply growth rate exponentially
-            predicted_value = recent_avg * (1 + growth_rate) ** (day / 7)
+                # Apply growth rate exponentially
+                predicted_value = recent_avg * (1 + growth_rate) ** (day / 7)
             
-            confidence = max(40, 80 - abs(growth_rate * 1000))
+                confidence = max(40, 80 - abs(growth_rate * 1000))
             
-            forecast = RevenueForecast(
-                forecast_date=forecast_date,
-                predicted_revenue=Decimal(str(round(predicted_value, 2))),
-                confidence_score=round(confidence, 2),
-                model_used="growth_based",
-                model_version="1.0",
-                prediction_type="daily",
-                features_used=json.dumps({
-                    "growth_rate": round(growth_rate * 100, 2),
-                    "base_revenue": round(recent_avg, 2),
-                    "historical_count": len(historical_metrics)
-                }),
-                created_at=datetime.now()
-            )
+                forecast = RevenueForecast(
+                    forecast_date=forecast_date,
+                    predicted_revenue=Decimal(str(round(predicted_value, 2))),
+                    confidence_score=round(confidence, 2),
+                    model_used="growth_based",
+                    model_version="1.0",
+                    prediction_type="daily",
+                    features_used=json.dumps({
+                        "growth_rate": round(growth_rate * 100, 2),
+                        "base_revenue": round(recent_avg, 2),
+                        "historical_count": len(historical_metrics)
+                    }),
+                    created_at=datetime.now()
+                )
             
-            forecasts.append(
-                revenue_forecast_repository.create_forecast(self.db, forecast)
-            )
+                forecasts.append(
+                    revenue_forecast_repository.create_forecast(self.db, forecast)
+                )
         
         return forecasts
     
@@ -399,22 +414,24 @@ class RevenueService:
         forecasts = []
         default_revenue = 5000.0  # Default daily revenue estimate
         
-        for day in range(1, days_ahead + 1):
-            forecast_date = date.today() + timedelta(days=day)
+        # One transaction for the whole horizon instead of a commit per day
+        with unit_of_work(self.db):
+            for day in range(1, days_ahead + 1):
+                forecast_date = date.today() + timedelta(days=day)
             
-            forecast = RevenueForecast(
-                forecast_date=forecast_date,
-                predicted_revenue=Decimal(str(default_revenue)),
-                confidence_score=30.0,
-                model_used="default",
-                model_version="1.0",
-                prediction_type="daily",
-                features_used=json.dumps({"note": "Insufficient historical data"}),
-                created_at=datetime.now()
-            )
+                forecast = RevenueForecast(
+                    forecast_date=forecast_date,
+                    predicted_revenue=Decimal(str(default_revenue)),
+                    confidence_score=30.0,
+                    model_used="default",
+                    model_version="1.0",
+                    prediction_type="daily",
+                    features_used=json.dumps({"note": "Insufficient historical data"}),
+                    created_at=datetime.now()
+                )
             
-            forecasts.append(
-                revenue_forecast_repository.create_forecast(self.db, forecast)
-            )
+                forecasts.append(
+                    revenue_forecast_repository.create_forecast(self.db, forecast)
+                )
         
         return forecasts
@@ -0,0 +1,62 @@
+"""
+Background release of expired seat holds.
+
+Queries already treat a lapsed hold as a free seat, so the sweeper is not
+needed for correctness; it keeps `flight_seats.status` honest for reports and
+the partial hold-expiry index small. Every SEAT_HOLD_SWEEP_INTERVAL seconds it
+flips expired holds back to 'available', SEAT_HOLD_SWEEP_BATCH rows per UPDATE
+and one short transaction per batch.
+"""
+
+import threading
+
+from app.core.config import SEAT_HOLD_SWEEP_BATCH, SEAT_HOLD_SWEEP_INTERVAL
+from app.core.database import SessionLocal
+from app.repositories import flight_seat_repository
+
+
+class SeatHoldSweeper:
+    def __init__(self, interval: int, batch_size: int):
+        self.interval = interval
+        self.batch_size = batch_size
+        self._stop = threading.Event()
+        self._thread = None
+
+    def sweep_once(self) -> int:
+        """Release every expired hold now; returns the number of seats released"""
+        total = 0
+        while True:
+            db = SessionLocal()
+            try:
+                released = flight_seat_repository.release_expired_holds(db, self.batch_size)
+                db.commit()
+            finally:
+                db.close()
+            total += released
+            if released < self.batch_size:
+                return total
+
+    def start(self) -> None:
+        if self.interval <= 0 or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="seat-hold-sweeper", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                released = self.sweep_once()
+                if released:
+                    print(f"Released {released} expired seat holds")
+            except Exception as e:
+                print(f"Seat hold sweep failed: {e}")
+
+
+seat_hold_sweeper = SeatHoldSweeper(SEAT_HOLD_SWEEP_INTERVAL, SEAT_HOLD_SWEEP_BATCH)
@@ -0,0 +1,127 @@
+"""
+Compact seat maps.
+
+A seat map is split in two:
+
+- the layout of an airplane (seat ids, numbers and classes, ordered by
+  seat_id), which only changes when seats are edited and is cached per
+  airplane for SEAT_LAYOUT_CACHE_TTL seconds;
+- the status of each layout position on one flight, packed 2 bits per seat
+  (4 seats per byte, lowest bits first) and base64-encoded. A 400-seat
+  widebody fits in 136 characters.
+
+Status versions are content hashes, so every worker hands out the same version
+for the same seats. The last few bitmaps of each flight are remembered so that
+a client passing `since=<version>` gets only the positions that changed; when
+that version is unknown to this worker, the full bitmap is returned instead.
+"""
+
+import base64
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import SEAT_LAYOUT_CACHE_TTL, SEAT_MAP_HISTORY_SIZE
+from app.core.etag import compute_etag
+
+# 0 means the airplane seat is not sold on this flight
+STATUS_CODES = {"available": 1, "reserved": 2, "booked": 3}
+
+
+@dataclass
+class SeatLayout:
+    airplane_id: int
+    seat_ids: List[int]
+    seat_numbers: List[str]
+    seat_classes: List[Optional[str]]
+    etag: str = ""
+    index: Dict[int, int] = field(default_factory=dict)
+
+    @classmethod
+    def from_rows(cls, airplane_id: int, rows) -> "SeatLayout":
+        """Build from (seat_id, seat_number, seat_class) rows ordered by seat_id"""
+        seat_ids = [row.seat_id for row in rows]
+        seat_numbers = [row.seat_number for row in rows]
+        seat_classes = [row.seat_class for row in rows]
+        etag = compute_etag(repr((seat_ids, seat_numbers, seat_classes)).encode())
+        index = {seat_id: position for position, seat_id in enumerate(seat_ids)}
+        return cls(airplane_id, seat_ids, seat_numbers, seat_classes, etag, index)
+
+    def status_codes(self, seat_statuses) -> bytes:
+        """One status code per layout position from (seat_id, status) pairs"""
+        codes = bytearray(len(self.seat_ids))
+        for seat_id, status in seat_statuses:
+            position = self.index.get(seat_id)
+            if position is not None:
+                codes[position] = STATUS_CODES.get(status, 0)
+        return bytes(codes)
+
+
+def pack_statuses(codes: bytes) -> str:
+    packed = bytearray((len(codes) + 3) // 4)
+    for position, code in enumerate(codes):
+        packed[position >> 2] |= code << ((position & 3) * 2)
+    return base64.b64encode(bytes(packed)).decode()
+
+
+def diff_statuses(old: bytes, new: bytes) -> List[Tuple[int, int]]:
+    """[(position, new code)] for every position whose status changed"""
+    return [(position, code) for position, (before, code) in enumerate(zip(old, new)) if before != code]
+
+
+class SeatLayoutCache:
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self._layouts: Dict[int, Tuple[float, SeatLayout]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, airplane_id: int) -> Optional[SeatLayout]:
+        entry = self._layouts.get(airplane_id)
+        if entry is None or time.monotonic() - entry[0] >= self.ttl:
+            return None
+        return entry[1]
+
+    def put(self, layout: SeatLayout) -> None:
+        with self._lock:
+            self._layouts[layout.airplane_id] = (time.monotonic(), layout)
+
+    def invalidate(self, airplane_id: Optional[int] = None) -> None:
+        """Drop one airplane's layout, or all of them"""
+        with self._lock:
+            if airplane_id is None:
+                self._layouts.clear()
+            else:
+                self._layouts.pop(airplane_id, None)
+
+
+class SeatMapHistory:
+    """The last `depth` status bitmaps of up to `max_flights` flights, by version"""
+
+    def __init__(self, depth: int, max_flights: int = 10000):
+        self.depth = depth
+        self.max_flights = max_flights
+        self._flights: "OrderedDict[int, OrderedDict[str, Tuple[str, bytes]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def record(self, flight_id: int, version: str, layout_etag: str, codes: bytes) -> None:
+        if self.depth <= 0:
+            return
+        with self._lock:
+            versions = self._flights.setdefault(flight_id, OrderedDict())
+            self._flights.move_to_end(flight_id)
+            versions[version] = (layout_etag, codes)
+            versions.move_to_end(version)
+            while len(versions) > self.depth:
+                versions.popitem(last=False)
+            while len(self._flights) > self.max_flights:
+                self._flights.popitem(last=False)
+
+    def get(self, flight_id: int, version: str) -> Optional[Tuple[str, bytes]]:
+        with self._lock:
+            return self._flights.get(flight_id, {}).get(version)
+
+
+seat_layouts = SeatLayoutCache(SEAT_LAYOUT_CACHE_TTL)
+seat_map_history = SeatMapHistory(SEAT_MAP_HISTORY_SIZE)
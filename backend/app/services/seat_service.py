@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 from app.models.airplane import Seat
 from app.repositories import seat_repository
 from app.schemas.seat_schema import SeatCreate
+from app.services.seat_map import seat_layouts
 
 class SeatService:
     def __init__(self, db: Session):
@@ -39,7 +40,9 @@ class SeatService:
         # Create Seat model instance
         seat = Seat(**seat_dict)
         
-        return seat_repository.create_seat(self.db, seat)
+        created = seat_repository.create_seat(self.db, seat)
+        seat_layouts.invalidate(created.airplane_id)
+        return created
     
     def update_seat(self, seat_id: int, seat_data: dict):
         """Update an existing seat"""
@@ -47,7 +50,10 @@ class SeatService:
         if not existing_seat:
             raise ValueError("Seat not found")
         
-        return seat_repository.update_seat(self.db, seat_id, seat_data)
+        updated = seat_repository.update_seat(self.db, seat_id, seat_data)
+        # The seat may have moved to another airplane
+        seat_layouts.invalidate()
+        return updated
     
     def delete_seat(self, seat_id: int):
         """Delete a seat"""
@@ -55,7 +61,10 @@ class SeatService:
         if not existing_seat:
             raise ValueError("Seat not found")
         
-        return seat_repository.delete_seat(self.db, seat_id)
+        airplane_id = existing_seat.airplane_id
+        deleted = seat_repository.delete_seat(self.db, seat_id)
+        seat_layouts.invalidate(airplane_id)
+        return deleted
     
     def update_seat_availability(self, seat_id: int, available: bool):
         """Update seat availability status"""
@@ -1,11 +1,13 @@
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.models.booking import Service
 from app.repositories import service_repository
 from app.schemas.service_schema import ServiceCreate, ServiceUpdate
+from app.core.config import DEFAULT_PAGE_SIZE
 
 
 class ServiceService:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session | AsyncSession):
         self.db = db
 
     def get_service(self, service_id: int):
@@ -15,9 +17,13 @@ class ServiceService:
             raise ValueError("Service not found")
         return service
 
-    def get_all_services(self, skip: int = 0, limit: int = 100):
-        """Get all services"""
-        return service_repository.get_all_services(self.db, skip, limit)
+    def get_all_services(self, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE, skip: int = 0):
+        """Get one page of services"""
+        return service_repository.get_all_services(self.db, cursor, limit, skip)
+
+    async def get_all_services_async(self, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE, skip: int = 0):
+        """Get one page of services (async session)"""
+        return await service_repository.get_all_services_async(self.db, cursor, limit, skip)
 
     def get_services_by_type(self, service_type: str):
         """Get services filtered by type"""
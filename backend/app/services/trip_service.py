@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
 from app.repositories import trip_plan_repository
 from app.models.trip import TripPlan, TripPlanItem
+from app.core.unit_of_work import unit_of_work
 from app.schemas.trip_schema import TripPlanCreate, TripPlanUpdate, TripPlanItemCreate, TripPlanItemUpdate
 
 
@@ -25,29 +26,30 @@ class TripPlanService:
 
     def create_trip_plan(self, trip_plan_data: TripPlanCreate):
         """Create a new trip plan with optional items"""
-        # Extract items data
-        items_data = trip_plan_data.items if trip_plan_data.items else []
-        trip_plan_dict = trip_plan_data.model_dump(exclude={'items'})
+        with unit_of_work(self.db):
+            # Extract items data
+            items_data = trip_plan_data.items if trip_plan_data.items else []
+            trip_plan_dict = trip_plan_data.model_dump(exclude={'items'})
         
-        # Create trip plan
-        trip_plan = TripPlan(**trip_plan_dict)
-        created_trip_plan = trip_plan_repository.create_trip_plan(self.db, trip_plan)
+            # Create trip plan
+            trip_plan = TripPlan(**trip_plan_dict)
+            created_trip_plan = trip_plan_repository.create_trip_plan(self.db, trip_plan)
         
-        # Add items to trip plan
-        if items_data:
-            for item_data in items_data:
-                trip_plan_item = TripPlanItem(
-                    plan_id=created_trip_plan.plan_id,
-                    flight_id=item_data.flight_id,
-                    service_id=item_data.service_id,
-                    place_id=item_data.place_id,
-                    scheduled_time=item_data.scheduled_time
-                )
-                trip_plan_repository.create_trip_plan_item(self.db, trip_plan_item)
+            # Add items to trip plan
+            if items_data:
+                for item_data in items_data:
+                    trip_plan_item = TripPlanItem(
+                        plan_id=created_trip_plan.plan_id,
+                        flight_id=item_data.flight_id,
+                        service_id=item_data.service_id,
+                        place_id=item_data.place_id,
+                        scheduled_time=item_data.scheduled_time
+                    )
+                    trip_plan_repository.create_trip_plan_item(self.db, trip_plan_item)
         
-        # Refresh to get updated relationships
-        self.db.refresh(created_trip_plan)
-        return created_trip_plan
+            # Refresh to get updated relationships
+            self.db.refresh(created_trip_plan)
+            return created_trip_plan
 
     def update_trip_plan(self, plan_id: int, trip_plan_data: TripPlanUpdate):
         """Update an existing trip plan"""
@@ -0,0 +1,80 @@
+"""
+Sync vs async engine benchmark.
+
+Runs the same read query (the /flights/all listing) N times with C concurrent
+clients, once through the sync SessionLocal on a thread pool (what a sync FastAPI
+route does) and once through AsyncSessionLocal on the event loop.
+
+Usage:
+    uv run python -m benchmarks.db_engines --requests 2000 --concurrency 100
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core.database import AsyncSessionLocal, SessionLocal, async_engine
+from app.repositories import flight_repository
+
+
+def _report(label: str, latencies: list[float], elapsed: float):
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(
+        f"{label:<6} {len(latencies) / elapsed:>9.1f} req/s   "
+        f"p50 {statistics.median(latencies) * 1000:>7.2f} ms   "
+        f"p95 {p95 * 1000:>7.2f} ms   "
+        f"total {elapsed:>6.2f} s"
+    )
+
+
+def run_sync(requests: int, concurrency: int, threads: int):
+    def one_request():
+        start = time.perf_counter()
+        db = SessionLocal()
+        try:
+            flight_repository.get_all_flights(db)
+        finally:
+            db.close()
+        return time.perf_counter() - start
+
+    # FastAPI runs sync routes on a 40-thread pool by default
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=min(concurrency, threads)) as pool:
+        latencies = list(pool.map(lambda _: one_request(), range(requests)))
+    _report("sync", latencies, time.perf_counter() - start)
+
+
+async def run_async(requests: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one_request():
+        async with semaphore:
+            start = time.perf_counter()
+            async with AsyncSessionLocal() as db:
+                await flight_repository.get_all_flights_async(db)
+            return time.perf_counter() - start
+
+    start = time.perf_counter()
+    latencies = await asyncio.gather(*(one_request() for _ in range(requests)))
+    elapsed = time.perf_counter() - start
+    await async_engine.dispose()
+    _report("async", list(latencies), elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--threads", type=int, default=40, help="thread pool size for the sync run")
+    args = parser.parse_args()
+
+    print(f"{args.requests} requests, {args.concurrency} concurrent clients")
+    run_sync(args.requests, args.concurrency, args.threads)
+    asyncio.run(run_async(args.requests, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Seat claim contention benchmark.
+
+Many concurrent clients try to book seats on one flight, each in its own
+session and transaction, exactly like concurrent POST /passengers requests:
+
+- `specific`: every client picks a random seat among the flight's available
+  ones, so most attempts collide (conditional UPDATE ... RETURNING);
+- `any`: every client asks for "any seat" (FOR UPDATE SKIP LOCKED).
+
+The run fails if one seat was handed to two clients or if the flight ends up
+with a different number of booked seats than successful claims. Claimed seats
+are put back to 'available' afterwards unless --keep is given.
+
+Usage:
+    uv run python -m benchmarks.seat_contention --flight-id 1 --clients 200 --concurrency 50 --mode any
+"""
+
+import argparse
+import random
+import statistics
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import select, update
+
+from app.core.database import SessionLocal
+from app.models.flight import FlightSeat
+from app.repositories import flight_seat_repository
+
+
+def _available_seat_ids(flight_id: int) -> list[int]:
+    with SessionLocal() as db:
+        return list(db.execute(
+            select(FlightSeat.flight_seat_id)
+            .where(FlightSeat.flight_id == flight_id, FlightSeat.status == "available")
+        ).scalars())
+
+
+def _booked_count(flight_id: int, seat_ids: list[int]) -> int:
+    with SessionLocal() as db:
+        return len(db.execute(
+            select(FlightSeat.flight_seat_id)
+            .where(FlightSeat.flight_id == flight_id, FlightSeat.flight_seat_id.in_(seat_ids),
+                   FlightSeat.status == "booked")
+        ).all())
+
+
+def _release(seat_ids: list[int]):
+    with SessionLocal() as db:
+        db.execute(update(FlightSeat).where(FlightSeat.flight_seat_id.in_(seat_ids)).values(status="available"))
+        db.commit()
+
+
+def run(flight_id: int, clients: int, concurrency: int, mode: str, seat_class: str):
+    candidates = _available_seat_ids(flight_id)
+    if not candidates:
+        raise SystemExit(f"Flight {flight_id} has no available seats")
+
+    def one_client(_):
+        start = time.perf_counter()
+        with SessionLocal() as db:
+            if mode == "specific":
+                claimed = flight_seat_repository.claim_flight_seat(db, random.choice(candidates))
+            else:
+                seats = flight_seat_repository.claim_any_flight_seats(db, flight_id, seat_class)
+                claimed = seats[0].flight_seat_id if seats else None
+            db.commit()
+        return claimed, time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one_client, range(clients)))
+    elapsed = time.perf_counter() - start
+
+    claims = [seat_id for seat_id, _ in results if seat_id is not None]
+    latencies = sorted(latency for _, latency in results)
+    p95 = latencies[max(int(len(latencies) * 0.95) - 1, 0)]
+    print(
+        f"{mode:<8} {clients / elapsed:>9.1f} claims/s   "
+        f"p50 {statistics.median(latencies) * 1000:>7.2f} ms   "
+        f"p95 {p95 * 1000:>7.2f} ms   "
+        f"won {len(claims)}/{clients} (of {len(candidates)} free seats)"
+    )
+    return claims
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--flight-id", type=int, required=True)
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--mode", choices=("specific", "any"), default="any")
+    parser.add_argument("--seat-class", choices=("economy", "business", "first"), default=None)
+    parser.add_argument("--keep", action="store_true", help="leave the claimed seats booked")
+    args = parser.parse_args()
+
+    print(f"{args.clients} clients, {args.concurrency} concurrent, flight {args.flight_id}")
+    claims = run(args.flight_id, args.clients, args.concurrency, args.mode, args.seat_class)
+    try:
+        doubles = [seat_id for seat_id, times in Counter(claims).items() if times > 1]
+        assert not doubles, f"double-booked seats: {doubles}"
+        booked = _booked_count(args.flight_id, claims)
+        assert booked == len(claims), f"{len(claims)} successful claims but {booked} seats booked"
+        print("no double booking")
+    finally:
+        if claims and not args.keep:
+            _release(claims)
+
+
+if __name__ == "__main__":
+    main()
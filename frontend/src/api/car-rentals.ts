@@ -1,4 +1,5 @@
 import appAxios from "@/services/AxiosClient";
+import { getAllPages } from "./pagination";
 
 // Define CarRental types based on backend schema
 export interface CarRental {
@@ -30,8 +31,7 @@ export interface UpdateCarRentalDto {
 export const carRentalsApi = {
   // GET request - fetch all car rentals
   getCarRentals: async (): Promise<CarRental[]> => {
-    const response = await appAxios.get<CarRental[]>("/car-rentals/");
-    return response.data;
+    return getAllPages<CarRental>("/car-rentals/");
   },
 
   // GET request - fetch available car rentals
@@ -1,4 +1,5 @@
 import appAxios from "@/services/AxiosClient";
+import { getAllPages } from "./pagination";
 
 // Define Explore types based on backend schema
 export interface Explore {
@@ -27,8 +28,7 @@ export interface UpdateExploreDto {
 export const exploreApi = {
   // GET request - fetch all explores
   getAllExplores: async (): Promise<Explore[]> => {
-    const response = await appAxios.get<Explore[]>("/explores");
-    return response.data;
+    return getAllPages<Explore>("/explores");
   },
 
   // GET request - fetch random explores
@@ -1,21 +1,18 @@
 import appAxios from "@/services/AxiosClient";
+import { getAllPages } from "./pagination";
 import { type Flight } from "@/types/flight";
 import { getAirports } from "./airport";
 
 export const getFlights = async (): Promise<Flight[]> => {
   const [flightResponse, airportsResponse] = await Promise.all([
-    appAxios.get<Flight[]>('/flights/all'),
+    getAllPages<Flight>('/flights/all'),
     getAirports(),
   ]);
 
-  if (!flightResponse.data) {
-    throw new Error("Failed to fetch flights");
-  }
-
   const airports = airportsResponse;
   const airportMap = new Map(airports.map(airport => [airport.airport_id, airport.name]));
 
-  const flights = flightResponse.data.map(flight => ({
+  const flights = flightResponse.map(flight => ({
     ...flight,
     origin: airportMap.get(flight.origin_airport_id) || `Airport ${flight.origin_airport_id}`,
     destination: airportMap.get(flight.destination_airport_id) || `Airport ${flight.destination_airport_id}`,
@@ -0,0 +1,26 @@
+import appAxios from "@/services/AxiosClient";
+
+// Largest page the backend serves (MAX_PAGE_SIZE)
+const PAGE_SIZE = 1000;
+
+// GET every page of a cursor-paginated list endpoint. The backend returns one
+// page per request and puts the next cursor in the X-Next-Cursor header
+// (absent on the last page).
+export const getAllPages = async <T>(
+  url: string,
+  params: Record<string, unknown> = {}
+): Promise<T[]> => {
+  const items: T[] = [];
+  let cursor: string | undefined;
+  do {
+    const response = await appAxios.get<T[]>(url, {
+      params: { ...params, limit: PAGE_SIZE, ...(cursor ? { cursor } : {}) },
+    });
+    if (!response.data) {
+      return items;
+    }
+    items.push(...response.data);
+    cursor = response.headers?.["x-next-cursor"] || undefined;
+  } while (cursor);
+  return items;
+};
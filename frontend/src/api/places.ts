@@ -1,4 +1,5 @@
 import appAxios from "@/services/AxiosClient";
+import { getAllPages } from "./pagination";
 
 // Define Place types based on backend schema
 export interface Place {
@@ -27,8 +28,7 @@ export interface UpdatePlaceDto {
 export const placesApi = {
   // GET request - fetch all places
   getPlaces: async (): Promise<Place[]> => {
-    const response = await appAxios.get<Place[]>("/places");
-    return response.data;
+    return getAllPages<Place>("/places");
   },
 
   // GET request - fetch single place
@@ -1,4 +1,5 @@
 import appAxios from "@/services/AxiosClient";
+import { getAllPages } from "./pagination";
 import type { 
   RevenueForecast, 
   RevenueMetrics, 
@@ -73,24 +74,17 @@ export const quickPrediction = async (
 
 // ============ METRICS APIs ============
 export const getAllMetrics = async (): Promise<RevenueMetrics[]> => {
-  const response = await appAxios.get<RevenueMetrics[]>('/revenue/metrics');
-  if (!response.data) {
-    throw new Error("Failed to fetch metrics");
-  }
-  return response.data;
+  return getAllPages<RevenueMetrics>('/revenue/metrics');
 };
 
 export const getMetricsByDateRange = async (
   startDate: string,
   endDate: string
 ): Promise<RevenueMetrics[]> => {
-  const response = await appAxios.get<RevenueMetrics[]>('/revenue/metrics', {
-    params: { start_date: startDate, end_date: endDate }
+  return getAllPages<RevenueMetrics>('/revenue/metrics', {
+    start_date: startDate,
+    end_date: endDate,
   });
-  if (!response.data) {
-    throw new Error("Failed to fetch metrics");
-  }
-  return response.data;
 };
 
 export const createMetric = async (metric: Partial<RevenueMetrics>): Promise<RevenueMetrics> => {
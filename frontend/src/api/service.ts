@@ -1,4 +1,5 @@
 import appAxios from "@/services/AxiosClient";
+import { getAllPages } from "./pagination";
 
 // Define Service types based on backend schema
 export interface Service {
@@ -24,8 +25,7 @@ export interface ServiceUpdate {
 export const serviceApi = {
   // GET request - get all services
   getAllServices: async (): Promise<Service[]> => {
-    const response = await appAxios.get<Service[]>("/services/");
-    return response.data;
+    return getAllPages<Service>("/services/");
   },
 
   // GET request - get service by ID